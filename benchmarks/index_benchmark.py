@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# benchmarks/index_benchmark.py - Ingestion rate and query latency of the resume index
+#
+# Fills a fresh resume index (utils/resume_index.py) with synthetic parse
+# results in batches, then times a set of typical searches and reports the
+# median and 95th percentile latency of each.
+#
+# Usage: python benchmarks/index_benchmark.py [--rows 1000000] [--batch 5000]
+#            [--path index.sqlite3] [--repeat 50] [--json results.json]
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.resume_index import ResumeIndex
+
+FIELDS_OF_WORK = [
+    "Software Engineer", "Data Scientist", "DevOps Engineer", "Frontend Developer",
+    "Backend Developer", "Product Manager", "UX Designer", "QA Engineer",
+]
+LEVELS = ["Entry-Level", "Junior", "Mid-Level", "Senior", "Lead"]
+SKILLS = [
+    "Python", "JavaScript", "Java", "SQL", "AWS", "Azure", "Docker", "Kubernetes",
+    "React", "Node.js", "Go", "Rust", "Terraform", "Machine Learning", "Agile",
+    "Scrum", "TypeScript", "PostgreSQL", "Kafka", "Spark", "Figma", "Selenium",
+]
+CITIES = ["Houston", "Austin", "Seattle", "New York", "Chicago", "Denver", "Boston", "London", "Berlin", "Toronto"]
+TITLES = ["Engineer", "Architect", "Developer", "Analyst", "Manager", "Consultant", "Designer"]
+WORDS = (
+    "designed built led delivered migrated optimized scalable platform services team "
+    "customers pipeline latency reliability cloud data infrastructure product roadmap "
+    "stakeholders automated monitoring deployment reduced costs improved throughput "
+    "mentored engineers architecture microservices analytics dashboards security "
+    "compliance integration testing release frontend backend mobile payments search"
+).split()
+
+QUERIES = {
+    "recent (no filters)": {},
+    "field_of_work": {"field_of_work": "Data Scientist"},
+    "field + min years": {"field_of_work": "DevOps Engineer", "min_years": 8},
+    "one skill": {"skills": ["Kubernetes"]},
+    "two skills + level": {"skills": ["Python", "Spark"], "experience_level": "Senior"},
+    "free text": {"text": "migrated payments platform"},
+    "free text, recent": {"text": "migrated payments platform", "sort": "recent"},
+    "prefix": {"text": "micro*"},
+    "title + location": {"title": "Architect", "location": "Seattle"},
+    "text + filters": {"text": "latency", "field_of_work": "Backend Developer", "min_years": 5},
+    "rare term": {"text": "Rust Figma", "skills": ["Selenium"]},
+    "deep page": {"skills": ["SQL"], "page": 200},
+}
+
+def synthetic_resume(rng, number):
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+    years = rng.randint(0, 25)
+    city = rng.choice(CITIES)
+    experience = " | ".join(
+        f"Company {rng.randint(1, 5000)}, {rng.choice(SKILLS)} {rng.choice(TITLES)}, "
+        + " ".join(rng.choices(WORDS, k=12))
+        for _ in range(rng.randint(1, 3))
+    )
+    fields = {
+        "full_name": f"Candidate {number}",
+        "email": f"candidate{number}@example.com",
+        "location": f"{city}, {rng.choice(['TX', 'WA', 'NY', 'UK', 'DE'])}",
+        "summary": " ".join(rng.choices(WORDS, k=20)),
+        "skills": ", ".join(skills),
+        "experience": experience,
+        "field_of_work": rng.choice(FIELDS_OF_WORK),
+        "experience_level": LEVELS[min(years // 4, len(LEVELS) - 1)],
+        "years_of_experience": str(years),
+    }
+    text = "\n".join([fields["full_name"], fields["location"], fields["summary"], fields["skills"], experience])
+    return fields, text, f"resume_{number}.pdf"
+
+def ingest(index, rows, batch_size, seed=0):
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    batch = []
+    for number in range(rows):
+        batch.append(synthetic_resume(rng, number))
+        if len(batch) == batch_size:
+            index.add_many(batch)
+            batch = []
+        if number and number % 100000 == 0:
+            print(f"  {number} rows, {number / (time.perf_counter() - start):.0f} rows/s")
+    if batch:
+        index.add_many(batch)
+    return time.perf_counter() - start
+
+def time_queries(index, repeat):
+    results = {}
+    for name, query in QUERIES.items():
+        index.search(**query)  # warm the page cache
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = index.search(**query)
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        results[name] = {
+            "total": response["total"],
+            "p50_ms": round(statistics.median(samples), 2),
+            "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=5000, help="Rows per insert transaction")
+    parser.add_argument("--path", help="Database file (default: a temporary file, removed afterwards)")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per query")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(prefix="resume_index_"), "index.sqlite3")
+    index = ResumeIndex(path)
+    print(f"Ingesting {args.rows} rows into {path} in batches of {args.batch}")
+    seconds = ingest(index, args.rows, args.batch)
+    print(f"Ingested in {seconds:.1f}s ({args.rows / seconds:.0f} rows/s), "
+          f"{os.path.getsize(path) / 1024 / 1024:.0f} MB")
+
+    results = time_queries(index, args.repeat)
+    print(f"\n{'query':<22} {'matches':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, result in results.items():
+        print(f"{name:<22} {result['total']:>9} {result['p50_ms']:>9} {result['p95_ms']:>9}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"rows": args.rows, "ingest_seconds": seconds, "queries": results}, f, indent=2)
+    if not args.path:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+if __name__ == "__main__":
+    main()
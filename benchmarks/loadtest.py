@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# benchmarks/loadtest.py - Replay a mix of requests against a running instance
+#
+# Sends /form loads, /parse-resume uploads (drawn from a corpus of DOCX/PDF
+# files), /generate submissions and /download fetches, then reports
+# throughput, error rate and a latency histogram per route. Results are saved
+# as JSON so runs of different versions can be compared.
+#
+# Usage:
+#   uvicorn main:app --port 8000 &
+#   python benchmarks/loadtest.py --duration 60 --concurrency 16 --output run.json
+#   python benchmarks/loadtest.py --rate 20 --output new.json --compare run.json
+#
+# Without --rate, `concurrency` clients send requests back to back (closed
+# loop). With --rate, requests arrive as a Poisson process at that many per
+# second (open loop) and latency is measured from the scheduled arrival, so
+# time spent waiting for a free client slot is included.
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import glob
+import random
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from utils.warmup import SAMPLE_RESUME_DATA
+
+ROUTES = ("form", "parse", "generate", "download", "preview")
+
+# Relative weight of each route in the request mix
+DEFAULT_MIX = "form=40,parse=20,generate=20,download=20"
+
+# Upper bounds of the latency histogram buckets in milliseconds
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000]
+
+CONTENT_TYPES = {
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".pdf": "application/pdf",
+}
+
+DOWNLOAD_URL = re.compile(r'href="(/download/[^"]+)"')
+
+def parse_mix(spec):
+    """Parse 'form=40,parse=20' into {'form': 40.0, 'parse': 20.0}"""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route '{name}' in mix; expected one of {', '.join(ROUTES)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def load_corpus(paths):
+    """Read every DOCX/PDF file under the given files or directories"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = sorted(glob.glob(os.path.join(path, "**", "*"), recursive=True))
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            extension = os.path.splitext(candidate)[1].lower()
+            if extension in CONTENT_TYPES and os.path.isfile(candidate):
+                with open(candidate, "rb") as f:
+                    files.append((os.path.basename(candidate), f.read(), CONTENT_TYPES[extension]))
+    return files
+
+class Recorder:
+    """Latencies and status codes per route"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.errors = {}
+
+    def record(self, route, latency, status=None, error=None):
+        self.latencies.setdefault(route, []).append(latency)
+        counts = self.statuses.setdefault(route, {})
+        key = str(status) if status is not None else "error"
+        counts[key] = counts.get(key, 0) + 1
+        if error:
+            self.errors.setdefault(route, {})
+            self.errors[route][error] = self.errors[route].get(error, 0) + 1
+
+    def summary(self, elapsed):
+        routes = {}
+        for route, latencies in sorted(self.latencies.items()):
+            statuses = self.statuses[route]
+            failed = sum(count for status, count in statuses.items() if status == "error" or int(status) >= 500)
+            ordered = sorted(latencies)
+            ms = [latency * 1000 for latency in ordered]
+
+            histogram = {}
+            for bound in HISTOGRAM_BUCKETS_MS:
+                histogram[f"le_{bound}"] = sum(1 for value in ms if value <= bound)
+            histogram["le_inf"] = len(ms)
+
+            routes[route] = {
+                "requests": len(ms),
+                "throughput_rps": round(len(ms) / elapsed, 3),
+                "error_rate": round(failed / len(ms), 4),
+                "rejected_503": statuses.get("503", 0),
+                "statuses": statuses,
+                "errors": self.errors.get(route, {}),
+                "latency_ms": {
+                    "mean": round(statistics.mean(ms), 2),
+                    "p50": round(percentile(ms, 50), 2),
+                    "p90": round(percentile(ms, 90), 2),
+                    "p95": round(percentile(ms, 95), 2),
+                    "p99": round(percentile(ms, 99), 2),
+                    "max": round(ms[-1], 2),
+                },
+                "histogram_ms": histogram,
+            }
+        return routes
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    # pct * n / 100 rather than pct / 100 * n, which can land just above an
+    # integer (7 / 100 * 100 == 7.000000000000001) and pick the next rank
+    return ordered[max(0, math.ceil(pct * len(ordered) / 100) - 1)]
+
+class LoadTest:
+    def __init__(self, client, corpus, rng):
+        self.client = client
+        self.corpus = corpus
+        self.rng = rng
+        self.recorder = Recorder()
+        self.download_urls = []
+
+    async def form(self):
+        return await self.client.get("/form")
+
+    async def parse(self):
+        if not self.corpus:
+            raise RuntimeError("no corpus files")
+        name, content, content_type = self.rng.choice(self.corpus)
+        return await self.client.post("/parse-resume", files={"resume": (name, content, content_type)})
+
+    async def generate(self, unique=True):
+        data = dict(SAMPLE_RESUME_DATA, output_format="docx")
+        if unique:
+            # Vary the name so each submission misses the content-addressed cache
+            data["full_name"] = f"Load Test {self.rng.randrange(10 ** 9)}"
+        response = await self.client.post("/generate", data=data, headers={"accept": "text/html"})
+        match = DOWNLOAD_URL.search(response.text) if response.status_code == 200 else None
+        if match:
+            self.download_urls.append(match.group(1))
+            if len(self.download_urls) > 1000:
+                del self.download_urls[:500]
+        return response
+
+    async def preview(self):
+        # One keystroke's update: only the summary changes between requests
+        data = {k: v for k, v in SAMPLE_RESUME_DATA.items() if isinstance(v, str)}
+        data["summary"] += " " + "x" * self.rng.randrange(200)
+        return await self.client.post("/preview", data=data)
+
+    async def download(self):
+        return await self.client.get(self.rng.choice(self.download_urls))
+
+    async def send(self, route, scheduled=None):
+        if route == "download" and not self.download_urls:
+            # Nothing to download until a generation succeeds; make one and
+            # time it as the generation it is
+            route = "generate"
+        start = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            response = await getattr(self, route)()
+            await response.aread()
+            self.recorder.record(route, time.perf_counter() - start, response.status_code)
+        except Exception as e:
+            self.recorder.record(route, time.perf_counter() - start, error=type(e).__name__)
+
+async def closed_loop(test, mix, concurrency, deadline):
+    routes, weights = list(mix), list(mix.values())
+
+    async def client():
+        while time.perf_counter() < deadline:
+            await test.send(test.rng.choices(routes, weights)[0])
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+
+async def open_loop(test, mix, concurrency, rate, deadline):
+    routes, weights = list(mix), list(mix.values())
+    slots = asyncio.Semaphore(concurrency)
+    pending = set()
+
+    async def arrival(route, scheduled):
+        async with slots:
+            await test.send(route, scheduled)
+
+    next_arrival = time.perf_counter()
+    while next_arrival < deadline:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(arrival(test.rng.choices(routes, weights)[0], next_arrival))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        next_arrival += test.rng.expovariate(rate)
+    await asyncio.gather(*pending)
+
+async def run_load_test(url, corpus, mix, concurrency, rate, duration, warmup, seed, timeout):
+    rng = random.Random(seed)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        test = LoadTest(client, corpus, rng)
+        # Seed the download pool and let the server finish its own warmup
+        await test.generate(unique=False)
+        if warmup > 0:
+            await closed_loop(test, mix, concurrency, time.perf_counter() + warmup)
+            test.recorder = Recorder()
+
+        start = time.perf_counter()
+        deadline = start + duration
+        if rate:
+            await open_loop(test, mix, concurrency, rate, deadline)
+        else:
+            await closed_loop(test, mix, concurrency, deadline)
+        elapsed = time.perf_counter() - start
+    return test.recorder.summary(elapsed), elapsed
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+def print_summary(routes, elapsed):
+    print(f"\n===== LOAD TEST ({elapsed:.1f}s) =====\n")
+    print(f"{'route':<10}{'reqs':>7}{'rps':>9}{'errors':>8}{'503s':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for route, stats in routes.items():
+        latency = stats["latency_ms"]
+        print(
+            f"{route:<10}{stats['requests']:>7}{stats['throughput_rps']:>9.2f}{stats['error_rate']:>8.2%}"
+            f"{stats['rejected_503']:>6}{latency['p50']:>10.1f}{latency['p95']:>10.1f}{latency['p99']:>10.1f}{latency['max']:>10.1f}"
+        )
+
+def compare(current, baseline, threshold):
+    """Print per-route changes against a baseline run and return the regressions"""
+    regressions = []
+    print(f"\n===== COMPARED WITH {baseline.get('revision') or 'baseline'} =====\n")
+    for route, stats in current["routes"].items():
+        base = baseline["routes"].get(route)
+        if not base:
+            continue
+        changes = [("throughput_rps", stats["throughput_rps"], base["throughput_rps"], False)]
+        for key in ("p50", "p95", "p99"):
+            changes.append((key, stats["latency_ms"][key], base["latency_ms"][key], True))
+        changes.append(("error_rate", stats["error_rate"], base["error_rate"], True))
+
+        parts = []
+        for name, now, before, lower_is_better in changes:
+            delta = (now - before) / before if before else 0.0
+            parts.append(f"{name} {before:g} -> {now:g} ({delta:+.1%})")
+            worse = delta > threshold if lower_is_better else delta < -threshold
+            if name == "error_rate":
+                worse = now - before > 0.01
+            if worse:
+                regressions.append(f"{route} {name}: {before:g} -> {now:g}")
+        print(f"{route}: " + ", ".join(parts))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP endpoints of a running instance")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="base URL of the instance")
+    parser.add_argument("--corpus", nargs="*", default=[os.path.join(ROOT, "Johndoedocx.docx")],
+                        help="DOCX/PDF files or directories to upload to /parse-resume")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"route weights (default {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=8, help="maximum requests in flight")
+    parser.add_argument("--rate", type=float, help="open-loop arrival rate in requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the request mix")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change counted as a regression when comparing (default 0.10)")
+    args = parser.parse_args()
+
+    if not HTTPX_AVAILABLE:
+        print("The load test requires httpx. Install it with: pip install httpx")
+        sys.exit(2)
+
+    mix = parse_mix(args.mix)
+    corpus = load_corpus(args.corpus)
+    if mix.get("parse") and not corpus:
+        print("No DOCX or PDF files found in the corpus; /parse-resume is left out of the mix")
+        mix.pop("parse")
+
+    routes, elapsed = asyncio.run(run_load_test(
+        args.url, corpus, mix, args.concurrency, args.rate, args.duration, args.warmup, args.seed, args.timeout
+    ))
+    print_summary(routes, elapsed)
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "settings": {
+            "url": args.url,
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "duration": args.duration,
+            "seed": args.seed,
+            "corpus": [name for name, _, _ in corpus],
+        },
+        "elapsed": round(elapsed, 3),
+        "routes": routes,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\nNo regressions beyond the threshold.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# benchmarks/ranking_benchmark.py - Query latency and memory of the ranking engine
+#
+# Builds a RankingEngine (utils/resume_ranking.py) over synthetic resumes at
+# each size, then reports how long adding the resumes took, the median and
+# 95th percentile latency of ranking a set of job descriptions against all of
+# them, the latency of a ranking right after adding one more resume, and the
+# memory the matrix (or the fallback's postings) holds. Runs
+# the NumPy/SciPy backend and the pure Python fallback unless --backend
+# selects one.
+#
+# Usage: python benchmarks/ranking_benchmark.py [--sizes 10000 100000]
+#            [--backend numpy|python] [--repeat 50] [--json results.json]
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.resume_parser import COMMON_SKILLS, FIELD_SKILLS
+from utils.resume_ranking import RankingEngine, NUMPY_AVAILABLE
+
+SKILLS = sorted(set(COMMON_SKILLS) | {skill for skills in FIELD_SKILLS.values() for skill in skills})
+FILLER = (
+    "led delivered team customers platform services reliability stakeholders "
+    "reduced costs improved throughput mentored engineers release integration "
+    "dashboards infrastructure cloud design testing deployment automation"
+).split()
+
+JOB_DESCRIPTIONS = [
+    "Senior DevOps engineer: Kubernetes, Docker, Terraform, AWS and CI/CD pipelines with Jenkins",
+    "Data scientist with Python, Pandas, NumPy, machine learning, statistics and SQL",
+    "Frontend developer building React and TypeScript UIs with responsive web design",
+    "Product manager owning the roadmap, user stories and backlog in an agile scrum team",
+    "QA engineer for test automation with Selenium and Cypress, regression testing",
+]
+
+def synthetic_text(rng):
+    words = rng.sample(SKILLS, rng.randint(4, 12)) + rng.choices(FILLER, k=rng.randint(60, 120))
+    rng.shuffle(words)
+    return " ".join(words)
+
+def measure(backend, size, repeat, seed=0):
+    rng = random.Random(seed)
+    texts = [synthetic_text(rng) for _ in range(size)]
+
+    engine = RankingEngine(use_numpy=backend == "numpy")
+    start = time.perf_counter()
+    for resume_id, text in enumerate(texts, 1):
+        engine.add(resume_id, text)
+    add_seconds = time.perf_counter() - start
+    # The first ranking appends the pending rows
+    start = time.perf_counter()
+    engine.rank(JOB_DESCRIPTIONS[0])
+    first_seconds = time.perf_counter() - start
+
+    samples = []
+    for _ in range(repeat):
+        for description in JOB_DESCRIPTIONS:
+            start = time.perf_counter()
+            engine.rank(description, 20)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+
+    # A ranking right after an add takes in the new row first
+    after_add = []
+    for number in range(repeat):
+        engine.add(size + number + 1, synthetic_text(rng))
+        start = time.perf_counter()
+        engine.rank(JOB_DESCRIPTIONS[number % len(JOB_DESCRIPTIONS)], 20)
+        after_add.append((time.perf_counter() - start) * 1000)
+    return {
+        "backend": backend,
+        "resumes": size,
+        "add_per_resume_ms": round(add_seconds / size * 1000, 3),
+        "first_rank_ms": round(first_seconds * 1000, 1),
+        "p50_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "after_add_p50_ms": round(statistics.median(after_add), 2),
+        "memory_mb": round(engine.memory_bytes() / 1024 / 1024, 1),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--backend", choices=["numpy", "python"], help="Only run this backend")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per job description")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    backends = [args.backend] if args.backend else (["numpy", "python"] if NUMPY_AVAILABLE else ["python"])
+    if "numpy" in backends and not NUMPY_AVAILABLE:
+        parser.error("NumPy/SciPy are not installed")
+
+    results = []
+    print(f"{'backend':<8} {'resumes':>8} {'add ms/doc':>11} {'first ms':>9} {'p50 ms':>8} {'p95 ms':>8} {'add+rank':>9} {'memory MB':>10}")
+    for size in args.sizes:
+        for backend in backends:
+            result = measure(backend, size, args.repeat)
+            results.append(result)
+            print(f"{backend:<8} {size:>8} {result['add_per_resume_ms']:>11} {result['first_rank_ms']:>9} "
+                  f"{result['p50_ms']:>8} {result['p95_ms']:>8} {result['after_add_p50_ms']:>9} {result['memory_mb']:>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# benchmarks/skill_bitmap_benchmark.py - Boolean skill query latency on the bitmap file
+#
+# Writes a skill bitmap file (utils/skill_bitmap.py) for synthetic resumes,
+# with skill popularity falling off along the vocabulary, then times a set of
+# boolean queries on each backend: evaluating the bitmaps, counting the
+# matches and reading out the newest page of ids. For comparison it also
+# times answering the same queries by matching each resume's skills text.
+#
+# Usage: python benchmarks/skill_bitmap_benchmark.py [--rows 1000000]
+#            [--backend numpy|python] [--repeat 50] [--json results.json]
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.skill_bitmap import (
+    SKILLS, NUMPY_AVAILABLE, SkillBitmapFile, parse_query, skill_terms, write_skill_bitmaps,
+)
+
+QUERIES = [
+    "Python",
+    "Problem Solving",
+    "Python AND (AWS OR Azure) AND NOT PHP",
+    "C++ AND C#",
+    "NOT Python",
+    "Machine Learning OR Data Science OR TensorFlow OR PyTorch",
+    "(React OR Angular OR Vue) AND TypeScript AND NOT CSS",
+]
+
+# Baseline rows matched per query; the scan is timed on this many and scaled
+SCAN_ROWS = 100000
+
+def synthetic_rows(count, seed=0):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(SKILLS))]
+    for resume_id in range(1, count + 1):
+        skills = set(rng.choices(SKILLS, weights=weights, k=rng.randint(0, 8)))
+        yield resume_id, ", ".join(skills)
+
+def scan(rows, node):
+    """Match a query tree against every row's skills text"""
+    def matches(terms, node):
+        kind = node[0]
+        if kind == "skill":
+            return node[1] in terms
+        if kind == "not":
+            return not matches(terms, node[1])
+        if kind == "and":
+            return matches(terms, node[1]) and matches(terms, node[2])
+        return matches(terms, node[1]) or matches(terms, node[2])
+    return sum(1 for _, skills in rows if matches(skill_terms(skills), node))
+
+def time_queries(bitmap_file, repeat):
+    results = {}
+    for query in QUERIES:
+        node = parse_query(query)
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = bitmap_file.evaluate(node)
+            total = bitmap_file.count(result)
+            bitmap_file.page(result, 0, 20)
+            samples.append((time.perf_counter() - start) * 1e6)
+        samples.sort()
+        results[query] = {
+            "matches": total,
+            "p50_us": round(statistics.median(samples)),
+            "p95_us": round(samples[int(len(samples) * 0.95) - 1]),
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--backend", choices=["numpy", "python"], help="Only run this backend")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per query")
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    backends = [args.backend] if args.backend else (["numpy", "python"] if NUMPY_AVAILABLE else ["python"])
+    if "numpy" in backends and not NUMPY_AVAILABLE:
+        parser.error("NumPy is not installed")
+
+    path = os.path.join(tempfile.mkdtemp(prefix="skill_bitmap_"), "skills.bin")
+    start = time.perf_counter()
+    write_skill_bitmaps(path, synthetic_rows(args.rows))
+    build_seconds = time.perf_counter() - start
+    size = os.path.getsize(path)
+    print(f"Wrote {args.rows} resumes in {build_seconds:.1f}s, {size / 1024 / 1024:.1f} MB")
+
+    report = {"rows": args.rows, "build_seconds": build_seconds, "file_bytes": size, "backends": {}}
+    for backend in backends:
+        start = time.perf_counter()
+        bitmap_file = SkillBitmapFile(path, use_numpy=backend == "numpy")
+        open_ms = (time.perf_counter() - start) * 1000
+        report["backends"][backend] = {"open_ms": round(open_ms, 1), "queries": time_queries(bitmap_file, args.repeat)}
+        print(f"\n{backend} (opened in {open_ms:.1f} ms)")
+        print(f"{'query':<58} {'matches':>8} {'p50 us':>8} {'p95 us':>8}")
+        for query, result in report["backends"][backend]["queries"].items():
+            print(f"{query:<58} {result['matches']:>8} {result['p50_us']:>8} {result['p95_us']:>8}")
+
+    rows = list(synthetic_rows(min(args.rows, SCAN_ROWS)))
+    scale = args.rows / len(rows)
+    print(f"\nskills text scan (timed on {len(rows)} rows, scaled to {args.rows})")
+    report["scan_ms"] = {}
+    for query in QUERIES:
+        start = time.perf_counter()
+        scan(rows, parse_query(query))
+        report["scan_ms"][query] = round((time.perf_counter() - start) * 1000 * scale, 1)
+        print(f"{query:<58} {report['scan_ms'][query]:>10} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# benchmarks/startup_benchmark.py - Measure import time of the app and enforce a budget
+#
+# Runs `python -X importtime -c "import main"` in fresh interpreters, reports
+# the cumulative import time of each tracked module (median across runs) and
+# exits non-zero when a budget is exceeded or a heavy dependency is imported
+# at startup instead of on first use.
+#
+# Usage: python benchmarks/startup_benchmark.py [--runs 5] [--json results.json]
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budgets in milliseconds
+BUDGETS_MS = {
+    "main": 800,
+    "config": 50,
+    "utils.storage": 20,
+    "utils.storage_manager": 20,
+    "utils.http_cache": 20,
+    "utils.warmup": 20,
+}
+
+# Dependencies that must load on first use, never while importing the app
+LAZY_MODULES = ["docx", "lxml", "pdfminer", "docx2pdf", "boto3", "reportlab"]
+
+def measure_once(target):
+    """Return {module: cumulative_ms} for one fresh interpreter importing `target`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {target} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        timings[name.strip()] = int(cumulative) / 1000
+    return timings
+
+def run_benchmark(target="main", runs=5):
+    samples = [measure_once(target) for _ in range(runs)]
+    modules = set().union(*samples)
+    return {
+        module: statistics.median(sample.get(module, 0.0) for sample in samples)
+        for module in modules
+    }
+
+def check_budgets(timings, budgets):
+    """Return a list of human-readable budget violations"""
+    failures = []
+    for module, budget in budgets.items():
+        if module in timings and timings[module] > budget:
+            failures.append(f"{module} took {timings[module]:.1f} ms (budget {budget} ms)")
+    for module in LAZY_MODULES:
+        if module in timings:
+            failures.append(f"{module} is imported at startup ({timings[module]:.1f} ms); it should load on first use")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure and budget the app's startup import time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to sample (median is reported)")
+    parser.add_argument("--target", default="main", help="module to import")
+    parser.add_argument("--budget-ms", type=float, help="override the budget of the target module")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest modules to list")
+    parser.add_argument("--json", help="write the timings and violations to this file")
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS_MS)
+    if args.budget_ms is not None:
+        budgets[args.target] = args.budget_ms
+
+    timings = run_benchmark(args.target, args.runs)
+    failures = check_budgets(timings, budgets)
+
+    slowest = [module for module, _ in sorted(timings.items(), key=lambda item: -item[1])[:args.top]]
+    budgeted = [module for module in budgets if module in timings and module not in slowest]
+
+    print(f"\n===== STARTUP IMPORT TIME ({args.runs} runs, median) =====\n")
+    for module in slowest + budgeted:
+        suffix = f"  (budget {budgets[module]} ms)" if module in budgets else ""
+        print(f"{timings[module]:9.1f} ms  {module}{suffix}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"runs": args.runs, "timings_ms": timings, "budgets_ms": budgets, "failures": failures}, f, indent=2)
+
+    if failures:
+        print("\nBUDGET EXCEEDED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nAll startup budgets met.")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,25 @@ HOST = os.getenv("HOST", "0.0.0.0")
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
+# Production server settings (used by gunicorn.conf.py)
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+WORKER_TIMEOUT = int(os.getenv("WORKER_TIMEOUT", 60))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", 30))
+KEEPALIVE = int(os.getenv("KEEPALIVE", 5))
+# Recycle each worker after this many requests to contain memory leaks (0 disables)
+MAX_REQUESTS = int(os.getenv("MAX_REQUESTS", 1000))
+MAX_REQUESTS_JITTER = int(os.getenv("MAX_REQUESTS_JITTER", 100))
+# Resume parsed during warmup so the first real upload does not pay cold-start costs
+WARMUP_SAMPLE_PATH = os.getenv("WARMUP_SAMPLE_PATH", "Johndoedocx.docx")
+
+# Admission control for the CPU-heavy endpoints (per worker). Requests beyond
+# the concurrency limit wait in a short queue; beyond that they get a 503
+PARSE_MAX_CONCURRENCY = int(os.getenv("PARSE_MAX_CONCURRENCY", 2))
+PARSE_MAX_QUEUE = int(os.getenv("PARSE_MAX_QUEUE", 8))
+GENERATE_MAX_CONCURRENCY = int(os.getenv("GENERATE_MAX_CONCURRENCY", 4))
+GENERATE_MAX_QUEUE = int(os.getenv("GENERATE_MAX_QUEUE", 16))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", 5))
+
 # Security settings
 SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
 
@@ -17,6 +36,77 @@ SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
 STORAGE_PATH = os.getenv("STORAGE_PATH", "storage")
 UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "uploads")
 RESUME_FOLDER = os.getenv("RESUME_FOLDER", "resumes")
+TEMPLATE_FOLDER = os.getenv("TEMPLATE_FOLDER", os.path.join(STORAGE_PATH, "templates"))
+# Largest DOCX template accepted by /api/v1/templates
+TEMPLATE_MAX_BYTES = int(os.getenv("TEMPLATE_MAX_BYTES", 2 * 1024 * 1024))
+
+# Artifact storage backend: "local" (this node's disk) or "s3" (any
+# S3-compatible object store shared by every node)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+S3_BUCKET = os.getenv("S3_BUCKET", "resume-kraft")
+S3_PREFIX = os.getenv("S3_PREFIX", "")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL", "")
+S3_REGION = os.getenv("S3_REGION", "")
+S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID", "")
+S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY", "")
+DOWNLOAD_URL_EXPIRES_SECONDS = int(os.getenv("DOWNLOAD_URL_EXPIRES_SECONDS", 3600))
+
+# Storage lifecycle settings
+RESUME_MAX_AGE_SECONDS = int(os.getenv("RESUME_MAX_AGE_SECONDS", 7 * 24 * 3600))
+UPLOAD_MAX_AGE_SECONDS = int(os.getenv("UPLOAD_MAX_AGE_SECONDS", 24 * 3600))
+STORAGE_QUOTA_BYTES = int(os.getenv("STORAGE_QUOTA_BYTES", 1024 * 1024 * 1024))
+STORAGE_CLEANUP_INTERVAL_SECONDS = int(os.getenv("STORAGE_CLEANUP_INTERVAL_SECONDS", 600))
+# Only the worker holding this lock runs the cleanup
+STORAGE_CLEANUP_LOCK = os.getenv("STORAGE_CLEANUP_LOCK", os.path.join(STORAGE_PATH, "storage_cleanup.lock"))
+# How long /generate accepts the session token returned by /parse-resume
+# (keep it below UPLOAD_MAX_AGE_SECONDS)
+PARSE_SESSION_MAX_AGE_SECONDS = int(os.getenv("PARSE_SESSION_MAX_AGE_SECONDS", 3600))
+
+# Directory where each worker writes its metric samples so /metrics can
+# aggregate them; gunicorn.conf.py clears it and exports
+# PROMETHEUS_MULTIPROC_DIR before the app is loaded
+METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", os.path.join(STORAGE_PATH, "metrics"))
+
+# Tracing: spans go to a JSON-lines file ("file"), an OTLP/HTTP collector
+# ("otlp", JSON encoding) or nowhere ("none"); trace ids are always returned
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+TRACING_FILE = os.getenv("TRACING_FILE", os.path.join(STORAGE_PATH, "traces.jsonl"))
+OTLP_ENDPOINT = os.getenv("OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "resume-kraft")
+
+# Event loop monitor (opt-in): measures the loop's lag every
+# LOOP_MONITOR_INTERVAL_SECONDS and logs the stack of callbacks blocking it
+# for longer than LOOP_BLOCK_THRESHOLD_SECONDS
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "False").lower() == "true"
+LOOP_MONITOR_INTERVAL_SECONDS = float(os.getenv("LOOP_MONITOR_INTERVAL_SECONDS", 0.1))
+LOOP_BLOCK_THRESHOLD_SECONDS = float(os.getenv("LOOP_BLOCK_THRESHOLD_SECONDS", 0.1))
+
+# Searchable index of parsed resumes (opt-in): parse results and their text
+# go to a SQLite database with an FTS5 full-text index, written in batches of
+# up to RESUME_INDEX_BATCH_SIZE rows at least every RESUME_INDEX_FLUSH_SECONDS
+RESUME_INDEX_ENABLED = os.getenv("RESUME_INDEX_ENABLED", "False").lower() == "true"
+RESUME_INDEX_PATH = os.getenv("RESUME_INDEX_PATH", os.path.join(STORAGE_PATH, "resume_index.sqlite3"))
+RESUME_INDEX_BATCH_SIZE = int(os.getenv("RESUME_INDEX_BATCH_SIZE", 500))
+RESUME_INDEX_FLUSH_SECONDS = float(os.getenv("RESUME_INDEX_FLUSH_SECONDS", 1))
+
+# Per-skill bitmaps of the indexed resumes for boolean skill queries, in a
+# memory-mapped file rebuilt once SKILL_BITMAP_REBUILD_ROWS resumes were
+# indexed after it
+SKILL_BITMAP_PATH = os.getenv("SKILL_BITMAP_PATH", os.path.join(STORAGE_PATH, "skill_bitmaps.bin"))
+SKILL_BITMAP_REBUILD_ROWS = int(os.getenv("SKILL_BITMAP_REBUILD_ROWS", 10000))
+
+# Watch-folder ingestion (python -m utils.ingest): resumes dropped into the
+# inbox folder under INGEST_FOLDER are parsed by INGEST_WORKERS processes and
+# their results appended to INGEST_OUTPUT, a JSONL file, or written to the
+# resume index if it is "index". Without watchdog installed the inbox is
+# polled every INGEST_POLL_SECONDS; files are left alone until unchanged
+# for INGEST_SETTLE_SECONDS, so partly copied ones are not picked up
+INGEST_FOLDER = os.getenv("INGEST_FOLDER", os.path.join(STORAGE_PATH, "ingest"))
+INGEST_OUTPUT = os.getenv("INGEST_OUTPUT", os.path.join(INGEST_FOLDER, "results.jsonl"))
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", os.cpu_count() or 1))
+INGEST_POLL_SECONDS = float(os.getenv("INGEST_POLL_SECONDS", 2))
+INGEST_SETTLE_SECONDS = float(os.getenv("INGEST_SETTLE_SECONDS", 1))
+INGEST_REPORT_SECONDS = float(os.getenv("INGEST_REPORT_SECONDS", 60))
 
 # PDF conversion settings
 PDF_CONVERSION_ENABLED = os.getenv("PDF_CONVERSION_ENABLED", "False").lower() == "true"
@@ -24,4 +114,5 @@ PDF_CONVERSION_ENABLED = os.getenv("PDF_CONVERSION_ENABLED", "False").lower() ==
 # Create directories if they don't exist
 os.makedirs(STORAGE_PATH, exist_ok=True)
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-os.makedirs(RESUME_FOLDER, exist_ok=True)
\ No newline at end of file
+os.makedirs(RESUME_FOLDER, exist_ok=True)
+os.makedirs(TEMPLATE_FOLDER, exist_ok=True)
\ No newline at end of file
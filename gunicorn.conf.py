@@ -0,0 +1,38 @@
+# gunicorn.conf.py - Production server settings, driven by config.py
+import os
+import shutil
+import config as app_config
+
+# Every worker writes its metrics to a shared directory that /metrics
+# aggregates. It must be set before the app (and prometheus_client) is
+# imported, and samples from a previous run are discarded
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = app_config.METRICS_MULTIPROC_DIR
+shutil.rmtree(app_config.METRICS_MULTIPROC_DIR, ignore_errors=True)
+os.makedirs(app_config.METRICS_MULTIPROC_DIR, exist_ok=True)
+
+bind = f"{app_config.HOST}:{app_config.PORT}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = app_config.WEB_CONCURRENCY
+timeout = app_config.WORKER_TIMEOUT
+graceful_timeout = app_config.GRACEFUL_TIMEOUT
+keepalive = app_config.KEEPALIVE
+max_requests = app_config.MAX_REQUESTS
+max_requests_jitter = app_config.MAX_REQUESTS_JITTER
+
+# Import the app (and with it the parser, generator and templates) once in the
+# master so workers share the loaded modules copy-on-write
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+def on_starting(server):
+    """Warm up in the master before forking so every worker starts ready"""
+    import main
+    from utils.warmup import run_warmup
+    run_warmup(main.templates, app_config.WARMUP_SAMPLE_PATH, main.page_cache, main.STATIC_PAGES)
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited"""
+    from utils.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -1,19 +1,189 @@
-from fastapi import FastAPI, Request, Form, File, UploadFile
-from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse, JSONResponse
+from fastapi import FastAPI, Request, Form, File, UploadFile, Query
+from fastapi.responses import HTMLResponse, FileResponse, RedirectResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from utils.resume_generator import generate_resume_file
-from utils.resume_parser import parse_resume
+from utils.storage_manager import run_storage_lifecycle
+from utils.storage import get_storage, storage_key, RESUMES, UPLOADS
+from utils.http_cache import cached_file_response, media_type_for, CONTENT_ADDRESSED_NAME, CHUNK_SIZE
+from utils.schemas import ResumeRequest, ResumeCreated, ResumeDocument, TemplateCreated, RankRequest
+from utils.warmup import run_warmup, is_ready, warmup_timings
+from utils.page_cache import PageCache
+from utils.assets import CachedStaticFiles, asset_url, MANIFEST_PATH
+from utils.resume_layout import RENDERED_FIELDS
+from utils.resume_renderers import html_stylesheet
+from utils.resume_preview import render_preview
+from utils.resume_index import get_resume_index
+from utils.themes import THEMES, TemplateError, get_theme, save_template
+from utils.parse_sessions import new_session_token, save_parse_session, load_parse_session
+from utils.admission import AdmissionController, AdmissionMiddleware
+from utils.loop_monitor import LoopMonitor
+from utils.metrics import MetricsMiddleware, render_metrics, record_upload, route_template
+from utils.tracing import (
+    TracingMiddleware, configure_tracing, exporter_from_config, install_log_filter,
+    span, start_span, record_span_since_last, log,
+)
+from starlette.concurrency import run_in_threadpool
+import config
 import os
 import shutil
+import tempfile
 import json
+import asyncio
 import datetime
-from typing import Optional
+import sqlite3
+from typing import Optional, Literal, List
 
 app = FastAPI()
 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Bound the CPU-heavy endpoints so a burst of uploads fails fast instead of
+# slowing every request; /form, /download and the probes are never queued
+admission = {
+    "parse": AdmissionController(
+        "parse", config.PARSE_MAX_CONCURRENCY, config.PARSE_MAX_QUEUE, config.ADMISSION_QUEUE_TIMEOUT_SECONDS
+    ),
+    "generate": AdmissionController(
+        "generate", config.GENERATE_MAX_CONCURRENCY, config.GENERATE_MAX_QUEUE, config.ADMISSION_QUEUE_TIMEOUT_SECONDS
+    ),
+}
+app.add_middleware(AdmissionMiddleware, controllers={
+    ("POST", "/parse-resume"): admission["parse"],
+    ("POST", "/generate"): admission["generate"],
+    ("POST", "/api/v1/resumes"): admission["generate"],
+})
+# Added after admission control so rejected requests are traced and timed too;
+# the metrics middleware is outermost
+configure_tracing(exporter_from_config())
+app.add_middleware(TracingMiddleware, route_of=lambda scope: route_template(app.routes, scope))
+app.add_middleware(MetricsMiddleware, route_of=lambda scope: route_template(app.routes, scope))
+
+app.mount("/static", CachedStaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
+templates.env.globals["asset_url"] = asset_url
+templates.env.globals["themes"] = THEMES
+storage = get_storage()
+# Searchable index of parsed resumes; None unless RESUME_INDEX_ENABLED
+resume_index = get_resume_index()
+# TF-IDF matrix of the indexed resumes for /api/v1/candidates/rank, built on first use
+resume_ranking = None
+
+# Pages rendered without per-request context, served prerendered and precompressed
+STATIC_PAGES = ["form.html"]
+page_cache = PageCache(templates, dependencies=lambda: [MANIFEST_PATH])
+
+# Enforce age limits and the size quota on generated resumes and uploads,
+# from one worker at a time
+@app.on_event("startup")
+async def start_storage_lifecycle():
+    retention = {
+        RESUMES: config.RESUME_MAX_AGE_SECONDS,
+        UPLOADS: config.UPLOAD_MAX_AGE_SECONDS,
+    }
+    app.state.storage_lifecycle_task = asyncio.create_task(
+        run_storage_lifecycle(
+            storage, retention, config.STORAGE_QUOTA_BYTES, config.STORAGE_CLEANUP_INTERVAL_SECONDS,
+            lock_path=config.STORAGE_CLEANUP_LOCK
+        )
+    )
+
+@app.on_event("shutdown")
+async def stop_storage_lifecycle():
+    app.state.storage_lifecycle_task.cancel()
+
+# Write out parses still queued for the resume index
+@app.on_event("shutdown")
+async def close_resume_index():
+    if resume_index is not None:
+        await run_in_threadpool(resume_index.close)
+
+# Event loop lag and blocking callbacks; None unless LOOP_MONITOR_ENABLED
+loop_monitor = LoopMonitor(
+    config.LOOP_MONITOR_INTERVAL_SECONDS, config.LOOP_BLOCK_THRESHOLD_SECONDS, app.routes
+) if config.LOOP_MONITOR_ENABLED else None
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    if loop_monitor is not None:
+        loop_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    if loop_monitor is not None:
+        loop_monitor.stop()
+
+# Build or map the skill bitmaps in the background at startup rather than
+# in the first query
+@app.on_event("startup")
+async def prepare_skill_bitmaps():
+    if resume_index is None:
+        return
+    from utils.skill_bitmap import get_skill_bitmap_index
+
+    def prepare():
+        try:
+            get_skill_bitmap_index(resume_index).prepare()
+        except Exception as e:
+            print(f"Could not prepare skill bitmaps: {e}")
+    app.state.skill_bitmap_task = asyncio.create_task(run_in_threadpool(prepare))
+
+# Tag uvicorn's access and error log lines with the request's trace id
+@app.on_event("startup")
+async def start_log_correlation():
+    install_log_filter()
+
+# Warm up in the background when gunicorn has not already done it before forking
+@app.on_event("startup")
+async def start_warmup():
+    if not is_ready():
+        app.state.warmup_task = asyncio.create_task(
+            run_in_threadpool(run_warmup, templates, config.WARMUP_SAMPLE_PATH, page_cache, STATIC_PAGES)
+        )
+
+# Readiness probe: only ready once warmup has finished
+@app.get("/ready", include_in_schema=False)
+def readiness():
+    if not is_ready():
+        return JSONResponse(content={"status": "warming up"}, status_code=503)
+    return JSONResponse(content={"status": "ready", "warmup": warmup_timings})
+
+# Health check for the load balancer: admission limits and current occupancy
+# of this worker. Reports 503 while any endpoint's wait queue is full
+@app.get("/health", include_in_schema=False)
+def health():
+    endpoints = {name: controller.snapshot() for name, controller in admission.items()}
+    saturated = any(e["waiting"] >= e["max_queue"] for e in endpoints.values())
+    content = {"status": "saturated" if saturated else "ok", "ready": is_ready(), "endpoints": endpoints}
+    if loop_monitor is not None:
+        content["event_loop"] = loop_monitor.summary()
+    return JSONResponse(content=content, status_code=503 if saturated else 200)
+
+# Prometheus metrics, aggregated across workers when PROMETHEUS_MULTIPROC_DIR is set
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics(storage, [RESUMES, UPLOADS])
+    return Response(body, media_type=content_type)
+
+# Live preview of the form: HTML fragments per resume section. Fragment keys
+# the page already shows are sent back as `known` and come back without HTML
+@app.post("/preview", include_in_schema=False)
+async def preview(request: Request):
+    form = await request.form()
+    data = {field: form.get(field) for field in RENDERED_FIELDS}
+    if data["field_of_work"] == "other" and form.get("manual_field_value"):
+        data["field_of_work"] = form.get("manual_field_value")
+    known = (form.get("known") or "").split(",")
+    return JSONResponse(content={"sections": render_preview(data, known)})
+
+@app.get("/preview.css", include_in_schema=False)
+def preview_stylesheet(theme: str = None):
+    try:
+        selected = get_theme(theme)
+    except TemplateError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=404)
+    return Response(
+        html_stylesheet(".resume-preview", selected),
+        media_type="text/css",
+        headers={"cache-control": "public, max-age=3600"}
+    )
 
 # Redirect root path to form
 @app.get("/", include_in_schema=False)
@@ -23,11 +193,148 @@ def redirect_to_form():
 # Serve the form
 @app.get("/form", response_class=HTMLResponse)
 def serve_form(request: Request):
-    return templates.TemplateResponse("form.html", {"request": request})
+    return page_cache.response(request, "form.html")
+
+def clean_parsed_data(parsed_data):
+    """Validate and clean parsed fields in place"""
+    for key, value in parsed_data.items():
+        # Ensure all values are strings
+        if value is None:
+            parsed_data[key] = ""
+        elif not isinstance(value, str):
+            parsed_data[key] = str(value)
+            
+        # Ensure values are not too long
+        if isinstance(parsed_data[key], str) and len(parsed_data[key]) > 10000:
+            parsed_data[key] = parsed_data[key][:10000] + "..."
+    return parsed_data
+
+async def finish_parse(parsed_data, temp_file_path, resume, cache):
+    """Keep the upload for /generate and complete the parse result the form receives"""
+    fill_span = start_span("fill_placeholders")
+    clean_parsed_data(parsed_data)
+    
+    # Log parsed data for debugging
+    log("\n===== PARSED RESUME DATA =====\n")
+    for key, value in parsed_data.items():
+        log(f"{key}: {value}")
+    log("\n=============================\n")
+    
+    if parsed_data and "error" not in parsed_data:
+        # Keep the upload and its parse result so /generate can refer to
+        # them by token instead of receiving the file a second time
+        session_token = new_session_token()
+        with span("parse_session.save"):
+            await run_in_threadpool(
+                save_parse_session, storage, session_token, temp_file_path,
+                resume.filename, resume.content_type, dict(parsed_data), cache.entries
+            )
+        parsed_data['session_token'] = session_token
+    else:
+        # Clean up the temporary file
+        os.remove(temp_file_path)
+    
+    # Add debug info to response
+    parsed_data['_debug_info'] = {
+        'file_name': resume.filename,
+        'file_size': resume.size,
+        'content_type': resume.content_type,
+        'timestamp': str(datetime.datetime.now())
+    }
+    
+    # Ensure all required fields are present
+    required_fields = ['full_name', 'email', 'phone', 'location', 'summary', 'skills', 
+                      'experience', 'education', 'field_of_work', 'experience_level', 
+                      'years_of_experience', 'certifications']
+    
+    for field in required_fields:
+        if field not in parsed_data or not parsed_data[field]:
+            # Add placeholder for missing fields
+            if field == 'full_name':
+                parsed_data[field] = "Your Name"
+            elif field == 'email':
+                parsed_data[field] = "your.email@example.com"
+            elif field == 'phone':
+                parsed_data[field] = "+1 (555) 123-4567"
+            elif field == 'location':
+                parsed_data[field] = "City, State, Country"
+            elif field == 'summary':
+                parsed_data[field] = "Professional summary extracted from your resume."
+            elif field == 'skills':
+                parsed_data[field] = "Skill 1, Skill 2, Skill 3"
+            elif field == 'experience':
+                parsed_data[field] = "Company, Position, Description"
+            elif field == 'education':
+                parsed_data[field] = "Degree, Institution, Year"
+            elif field == 'field_of_work':
+                parsed_data[field] = "Full-Stack Developer"
+            elif field == 'experience_level':
+                parsed_data[field] = "Mid-Level"
+            elif field == 'years_of_experience':
+                parsed_data[field] = "3"
+            elif field == 'certifications':
+                parsed_data[field] = "Certification 1, Certification 2"
+    fill_span.end()
+    return parsed_data
 
-# Parse uploaded resume
+def index_parse(resume):
+    """The parser's on_parsed hook adding an upload to the resume index, if enabled"""
+    if resume_index is None:
+        return None
+    return lambda fields, text: resume_index.add(fields, text, file_name=resume.filename)
+
+def ndjson(event):
+    return json.dumps(event) + "\n"
+
+async def previous_parse_cache(parse_session):
+    """
+    ParseCache of the parse session a re-upload revises, so only the
+    sections that changed since are parsed again; empty without a session
+    """
+    from utils.resume_parser import ParseCache
+    session = None
+    if parse_session:
+        session = await run_in_threadpool(
+            load_parse_session, storage, parse_session, config.PARSE_SESSION_MAX_AGE_SECONDS
+        )
+    return ParseCache(session.get("sections") if session else None)
+
+async def stream_parse(temp_file_path, resume, cache):
+    """
+    NDJSON events for a streaming parse: {"fields": {...}} whenever the
+    parser has new fields, then {"result": {...}} with the same complete
+    result the non-streaming response carries, or {"error": "..."}
+    """
+    from utils.resume_parser import iter_parse_resume, PARSED_FIELDS
+    updates = iter_parse_resume(temp_file_path, index_parse(resume), cache)
+    parsed_data = {}
+    try:
+        while True:
+            update = await run_in_threadpool(next, updates, None)
+            if update is None:
+                break
+            if "error" in update:
+                os.remove(temp_file_path)
+                yield ndjson(update)
+                return
+            clean_parsed_data(update)
+            parsed_data.update(update)
+            yield ndjson({"fields": update})
+        parsed_data = {field: parsed_data[field] for field in PARSED_FIELDS if field in parsed_data}
+        yield ndjson({"result": await finish_parse(parsed_data, temp_file_path, resume, cache)})
+    except Exception as e:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        yield ndjson({"error": f"Error parsing resume: {str(e)}"})
+
+# Parse uploaded resume. With ?stream=true the result is sent as NDJSON,
+# field by field as the parser gets to them (see stream_parse). A re-upload
+# can pass the parse_session token of the previous revision, so sections
+# that did not change are not parsed again
 @app.post("/parse-resume")
-async def parse_uploaded_resume(resume: UploadFile = File(...)):
+async def parse_uploaded_resume(resume: UploadFile = File(...), stream: bool = False, parse_session: str = Form(None)):
+    # The multipart body has been received and spooled by the time we run
+    record_span_since_last("multipart.receive")
     try:
         # Check if file is a supported format
         if not resume.filename.lower().endswith(('.docx', '.pdf', '.doc')):
@@ -37,87 +344,38 @@ async def parse_uploaded_resume(resume: UploadFile = File(...)):
             )
             
         # Create uploads directory if it doesn't exist
-        os.makedirs("uploads", exist_ok=True)
-        
-        # Save the uploaded file temporarily
-        temp_file_path = f"uploads/temp_{resume.filename}"
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(resume.file, buffer)
+        os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
         
-        # Parse the resume
-        parsed_data = parse_resume(temp_file_path)
-        
-        # Validate and clean parsed data
-        for key, value in parsed_data.items():
-            # Ensure all values are strings
-            if value is None:
-                parsed_data[key] = ""
-            elif not isinstance(value, str):
-                parsed_data[key] = str(value)
-                
-            # Ensure values are not too long
-            if isinstance(parsed_data[key], str) and len(parsed_data[key]) > 10000:
-                parsed_data[key] = parsed_data[key][:10000] + "..."
-        
-        # Log parsed data for debugging
-        print("\n===== PARSED RESUME DATA =====\n")
-        for key, value in parsed_data.items():
-            print(f"{key}: {value}")
-        print("\n=============================\n")
-        
-        # Clean up the temporary file
-        os.remove(temp_file_path)
-        
-        # Add debug info to response
-        parsed_data['_debug_info'] = {
-            'file_name': resume.filename,
-            'file_size': resume.size,
-            'content_type': resume.content_type,
-            'timestamp': str(datetime.datetime.now())
-        }
+        # Save the uploaded file temporarily under a unique name, since
+        # several parses can now run at once
+        fd, temp_file_path = tempfile.mkstemp(
+            prefix="temp_", suffix=os.path.splitext(resume.filename)[1], dir=config.UPLOAD_FOLDER
+        )
+        with span("upload.write") as write_span, os.fdopen(fd, "wb") as buffer:
+            await run_in_threadpool(shutil.copyfileobj, resume.file, buffer)
+            buffer.flush()
+            file_size = os.path.getsize(temp_file_path)
+            write_span.set_attribute("file_size", file_size)
+        record_upload(resume.filename, file_size)
+        cache = await previous_parse_cache(parse_session)
         
-        # Ensure all required fields are present
-        required_fields = ['full_name', 'email', 'phone', 'location', 'summary', 'skills', 
-                          'experience', 'education', 'field_of_work', 'experience_level', 
-                          'years_of_experience', 'certifications']
+        if stream:
+            return StreamingResponse(
+                stream_parse(temp_file_path, resume, cache),
+                media_type="application/x-ndjson",
+                # Ask proxies not to buffer, so each line reaches the browser as it is sent
+                headers={"cache-control": "no-cache", "x-accel-buffering": "no"}
+            )
         
-        for field in required_fields:
-            if field not in parsed_data or not parsed_data[field]:
-                # Add placeholder for missing fields
-                if field == 'full_name':
-                    parsed_data[field] = "Your Name"
-                elif field == 'email':
-                    parsed_data[field] = "your.email@example.com"
-                elif field == 'phone':
-                    parsed_data[field] = "+1 (555) 123-4567"
-                elif field == 'location':
-                    parsed_data[field] = "City, State, Country"
-                elif field == 'summary':
-                    parsed_data[field] = "Professional summary extracted from your resume."
-                elif field == 'skills':
-                    parsed_data[field] = "Skill 1, Skill 2, Skill 3"
-                elif field == 'experience':
-                    parsed_data[field] = "Company, Position, Description"
-                elif field == 'education':
-                    parsed_data[field] = "Degree, Institution, Year"
-                elif field == 'field_of_work':
-                    parsed_data[field] = "Full-Stack Developer"
-                elif field == 'experience_level':
-                    parsed_data[field] = "Mid-Level"
-                elif field == 'years_of_experience':
-                    parsed_data[field] = "3"
-                elif field == 'certifications':
-                    parsed_data[field] = "Certification 1, Certification 2"
+        # Parse the resume off the event loop (the parser and its dependencies
+        # load on first use)
+        from utils.resume_parser import parse_resume
+        parsed_data = await run_in_threadpool(parse_resume, temp_file_path, index_parse(resume), cache)
         
-        return JSONResponse(content=parsed_data)
+        return JSONResponse(content=await finish_parse(parsed_data, temp_file_path, resume, cache))
     except Exception as e:
         return JSONResponse(content={"error": f"Error parsing resume: {str(e)}"}, status_code=500)
 
-# For backward compatibility, also serve the form at root
-@app.get("/", response_class=HTMLResponse)
-async def read_form(request: Request):
-    return templates.TemplateResponse("form.html", {"request": request})
-
 @app.post("/generate")
 async def generate(
     request: Request,
@@ -140,27 +398,41 @@ async def generate(
     certifications: str = Form(None),
     languages: str = Form(None),
     output_format: str = Form(...),
+    theme: str = Form(None),
     # field_selection_type parameter is no longer needed
     manual_field_value: str = Form(None),
+    parse_session: str = Form(None),
     existing_resume: UploadFile = File(None)
 ):
+    record_span_since_last("multipart.receive")
     try:
         # Use other field value if "other" option was selected
         if field_of_work == "other" and manual_field_value:
             field_of_work = manual_field_value
         
-        # Handle uploaded resume if provided
-        uploaded_resume_path = None
-        if existing_resume and existing_resume.filename:
-            # Create uploads directory if it doesn't exist
-            os.makedirs("uploads", exist_ok=True)
-            
-            # Save the uploaded file
-            file_extension = existing_resume.filename.split('.')[-1]
-            uploaded_resume_path = f"uploads/{full_name.replace(' ', '_')}_uploaded.{file_extension}"
-            
-            with open(uploaded_resume_path, "wb") as buffer:
-                shutil.copyfileobj(existing_resume.file, buffer)
+        # Reuse the upload /parse-resume already stored, or handle a newly
+        # uploaded resume if provided
+        uploaded_resume_key = None
+        session = None
+        if parse_session:
+            session = await run_in_threadpool(
+                load_parse_session, storage, parse_session, config.PARSE_SESSION_MAX_AGE_SECONDS
+            )
+        if session:
+            uploaded_resume_key = session["upload_key"]
+        elif existing_resume and existing_resume.filename:
+            # Stream the uploaded file into storage under a random name, so
+            # applicants with the same name don't overwrite each other's upload
+            file_extension = os.path.splitext(existing_resume.filename)[1].lstrip('.').lower()
+            if not file_extension.isalnum():
+                file_extension = "bin"
+            uploaded_resume_key = storage_key(UPLOADS, f"upload_{new_session_token()}.{file_extension}")
+            with span("upload.write", key=uploaded_resume_key, file_size=existing_resume.size or 0):
+                await run_in_threadpool(
+                    storage.put, uploaded_resume_key, existing_resume.file, content_type=existing_resume.content_type
+                )
+            if existing_resume.size is not None:
+                record_upload(existing_resume.filename, existing_resume.size)
             
         data = {
             "full_name": full_name,
@@ -182,35 +454,209 @@ async def generate(
             "certifications": certifications,
             "languages": languages,
             "output_format": output_format,
-            "uploaded_resume_path": uploaded_resume_path
+            "theme": theme,
+            "uploaded_resume_key": uploaded_resume_key
         }
         
-        resume_path = generate_resume_file(data)
+        from utils.resume_generator import generate_resume_file
+        resume_key = await run_in_threadpool(generate_resume_file, data, storage)
         filename = f"resume_{full_name.replace(' ', '_')}.{output_format}"
         
         # Create a download URL
-        download_url = f"/download/{os.path.basename(resume_path)}"
+        download_url = f"/download/{resume_key.partition('/')[2]}"
         
         # Return the success template with download information
-        return templates.TemplateResponse(
-            "success.html", 
-            {
-                "request": request,
-                "full_name": full_name,
-                "field_of_work": field_of_work,
-                "output_format": output_format,
-                "download_url": download_url,
-                "uploaded_resume": True if uploaded_resume_path else False
-            }
-        )
+        with span("template.render", template="success.html"):
+            return templates.TemplateResponse(
+                "success.html", 
+                {
+                    "request": request,
+                    "full_name": full_name,
+                    "field_of_work": field_of_work,
+                    "output_format": output_format,
+                    "download_url": download_url,
+                    "uploaded_resume": True if uploaded_resume_key else False
+                }
+            )
+    except TemplateError as e:
+        # Unknown theme, or a template asked for a format it cannot produce
+        return HTMLResponse(f"Bad Request: {str(e)}", status_code=400)
     except Exception as e:
         return HTMLResponse(f"Internal Error: {str(e)}", status_code=500)
 
-@app.get("/download/{filename}")
-async def download_file(filename: str):
-    file_path = f"resumes/{filename}"
-    return FileResponse(
-        path=file_path,
-        filename=filename,
-        media_type='application/octet-stream'
-    )
\ No newline at end of file
+@app.api_route("/download/{filename}", methods=["GET", "HEAD"])
+async def download_file(request: Request, filename: str):
+    if os.path.basename(filename) != filename or filename.startswith('.'):
+        return HTMLResponse("File not found", status_code=404)
+    
+    key = storage_key(RESUMES, filename)
+    with span("storage.lookup", key=key) as lookup_span:
+        found = await run_in_threadpool(storage.exists, key)
+        lookup_span.set_attribute("found", found)
+        if found:
+            await run_in_threadpool(storage.touch, key)
+    if not found:
+        return HTMLResponse("File not found", status_code=404)
+    
+    file_path = storage.local_path(key)
+    if file_path is None:
+        # Remote backend: let the object store serve the bytes directly
+        download_url = await run_in_threadpool(
+            storage.download_url, key, filename, media_type_for(filename), config.DOWNLOAD_URL_EXPIRES_SECONDS
+        )
+        return RedirectResponse(download_url, status_code=307)
+    
+    return await cached_file_response(
+        request,
+        file_path,
+        filename,
+        immutable=bool(CONTENT_ADDRESSED_NAME.match(filename))
+    )
+
+# JSON API: generate a resume from structured sections and return the
+# document itself (delivery=document) or where to fetch it (delivery=url)
+@app.post("/api/v1/resumes", response_model=None, responses={201: {"model": ResumeCreated}})
+async def create_resume(request: Request, resume: ResumeRequest, delivery: Literal["document", "url"] = "document"):
+    from utils.resume_generator import generate_resume_files
+    from utils.resume_renderers import renderer_available
+    output_formats = list(dict.fromkeys(resume.output_formats or [resume.output_format]))
+    unavailable = [f for f in output_formats if not renderer_available(f)]
+    if unavailable:
+        return JSONResponse(content={"error": f"Output format not available: {', '.join(unavailable)}"}, status_code=400)
+    if delivery == "document" and len(output_formats) > 1:
+        return JSONResponse(content={"error": "Several output formats require delivery=url"}, status_code=400)
+    
+    try:
+        data = resume.model_dump() if hasattr(resume, "model_dump") else resume.dict()
+        resume_keys = await run_in_threadpool(generate_resume_files, data, output_formats, storage)
+    except TemplateError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+    except Exception as e:
+        return JSONResponse(content={"error": f"Error generating resume: {str(e)}"}, status_code=500)
+    
+    if delivery == "url":
+        documents = []
+        for output_format, key in resume_keys.items():
+            filename = key.partition('/')[2]
+            media_type = media_type_for(filename)
+            info = await run_in_threadpool(storage.stat, key)
+            download_url = await run_in_threadpool(
+                storage.download_url, key, filename, media_type, config.DOWNLOAD_URL_EXPIRES_SECONDS
+            )
+            if download_url.startswith("/"):
+                download_url = str(request.base_url).rstrip("/") + download_url
+            documents.append(dict(
+                id=CONTENT_ADDRESSED_NAME.match(filename).group(1),
+                output_format=output_format,
+                content_type=media_type,
+                size=info.size if info else None,
+                download_url=download_url,
+            ))
+        created = ResumeCreated(documents=[ResumeDocument(**d) for d in documents], **documents[0])
+        return JSONResponse(
+            content=created.model_dump() if hasattr(created, "model_dump") else created.dict(),
+            status_code=201,
+            headers={"etag": f'"{created.id}"', "x-resume-id": created.id}
+        )
+    
+    resume_key = resume_keys[output_formats[0]]
+    filename = resume_key.partition('/')[2]
+    resume_id = CONTENT_ADDRESSED_NAME.match(filename).group(1)
+    media_type = media_type_for(filename)
+    headers = {"etag": f'"{resume_id}"', "x-resume-id": resume_id}
+    
+    file_path = storage.local_path(resume_key)
+    if file_path is not None:
+        return FileResponse(file_path, media_type=media_type, filename=filename, headers=headers)
+    
+    body = await run_in_threadpool(storage.open, resume_key)
+    return StreamingResponse(
+        iter(lambda: body.read(CHUNK_SIZE), b""),
+        media_type=media_type,
+        headers=dict(headers, **{"content-disposition": f'attachment; filename="{filename}"'})
+    )
+
+@app.get("/api/v1/themes")
+def list_themes():
+    return {"themes": [{"name": theme.name, "label": theme.label} for theme in THEMES.values()]}
+
+# Search the resume index: free text (q), skills, location and job title
+# are full-text matches; the rest filter exact values. Free text is ranked by
+# relevance unless sort=recent
+@app.get("/api/v1/candidates")
+async def search_candidates(
+    q: str = None,
+    skill: List[str] = Query(default=[]),
+    location: str = None,
+    title: str = None,
+    field_of_work: str = None,
+    experience_level: str = None,
+    min_years: int = None,
+    max_years: int = None,
+    sort: Literal["relevance", "recent"] = None,
+    page: int = Query(default=1, ge=1),
+    per_page: int = Query(default=20, ge=1, le=100),
+):
+    if resume_index is None:
+        return JSONResponse(content={"error": "The resume index is not enabled"}, status_code=404)
+    try:
+        return await run_in_threadpool(
+            resume_index.search, text=q, skills=skill, location=location, title=title,
+            field_of_work=field_of_work, experience_level=experience_level,
+            min_years=min_years, max_years=max_years, sort=sort, page=page, per_page=per_page
+        )
+    except sqlite3.OperationalError as e:
+        return JSONResponse(content={"error": f"Invalid search: {str(e)}"}, status_code=400)
+
+# Rank indexed resumes by fit to a job description. The ranking matrix is
+# loaded on the first request and catches up with new parses on each one
+@app.post("/api/v1/candidates/rank")
+async def rank_candidates(request: RankRequest):
+    global resume_ranking
+    if resume_index is None:
+        return JSONResponse(content={"error": "The resume index is not enabled"}, status_code=404)
+    from utils.resume_ranking import RankingEngine, rank_indexed_resumes
+    if resume_ranking is None:
+        resume_ranking = RankingEngine()
+    results = await run_in_threadpool(
+        rank_indexed_resumes, resume_ranking, resume_index, request.job_description, request.limit
+    )
+    return {"results": results}
+
+# Filter indexed resumes by a boolean skill query such as
+# "Python AND (AWS OR Azure) AND NOT PHP", newest first
+@app.get("/api/v1/candidates/skills")
+async def filter_candidates_by_skills(
+    q: str,
+    page: int = Query(default=1, ge=1),
+    per_page: int = Query(default=20, ge=1, le=100),
+):
+    if resume_index is None:
+        return JSONResponse(content={"error": "The resume index is not enabled"}, status_code=404)
+    from utils.skill_bitmap import SkillQueryError, get_skill_bitmap_index
+    # The bitmap file is built or mapped at startup
+    skill_bitmaps = get_skill_bitmap_index(resume_index)
+    if not skill_bitmaps.ready:
+        return JSONResponse(
+            content={"error": "The skill index is still being built"}, status_code=503, headers={"Retry-After": "5"}
+        )
+    try:
+        return await run_in_threadpool(skill_bitmaps.search, q, page, per_page)
+    except SkillQueryError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+# Upload a .docx with {{ field }} placeholders and one {{ content }} paragraph;
+# pass the returned id as template_id to /api/v1/resumes
+@app.post("/api/v1/templates", response_model=None, responses={201: {"model": TemplateCreated}})
+async def upload_template(template: UploadFile = File(...)):
+    package = await template.read(config.TEMPLATE_MAX_BYTES + 1)
+    if len(package) > config.TEMPLATE_MAX_BYTES:
+        return JSONResponse(
+            content={"error": f"Templates are limited to {config.TEMPLATE_MAX_BYTES} bytes"},
+            status_code=413
+        )
+    try:
+        template_id, placeholders = await run_in_threadpool(save_template, storage, package)
+    except TemplateError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+    return JSONResponse(content={"id": template_id, "placeholders": placeholders}, status_code=201)
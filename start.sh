@@ -1,7 +1,8 @@
 #!/bin/bash
 
 # Get port from environment variable or use default
-PORT=${PORT:-8000}
+export PORT=${PORT:-8000}
 
-# Run the application binding to all interfaces (0.0.0.0)
-uvicorn main:app --host 0.0.0.0 --port $PORT
\ No newline at end of file
+# Run the application binding to all interfaces with the worker count,
+# timeouts and preloading configured in gunicorn.conf.py
+exec gunicorn -c gunicorn.conf.py main:app
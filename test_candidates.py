@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# test_candidates.py - Script to test candidate search over re-indexed resumes
+#
+# Resumes indexed again in place must not keep their old skills in the
+# skill bitmaps or their old rows in the ranking matrix. Results are
+# compared with a brute-force scan on every available backend.
+
+import os
+import random
+import tempfile
+from utils.resume_index import ResumeIndex
+from utils.resume_ranking import RankingEngine, NUMPY_AVAILABLE as RANKING_NUMPY
+from utils.skill_bitmap import SKILLS, NUMPY_AVAILABLE as BITMAP_NUMPY, SkillBitmapIndex, parse_query, skill_terms
+
+QUERIES = [
+    "Python",
+    "Python AND NOT Java",
+    "NOT SQL",
+    "(React OR Docker) AND AWS",
+]
+
+def _matches(terms, node):
+    kind = node[0]
+    if kind == "skill":
+        return node[1] in terms
+    if kind == "not":
+        return not _matches(terms, node[1])
+    if kind == "and":
+        return _matches(terms, node[1]) and _matches(terms, node[2])
+    return _matches(terms, node[1]) or _matches(terms, node[2])
+
+def test_skill_bitmaps():
+    """Page through skill queries after resumes are re-indexed with other skills"""
+    rng = random.Random(0)
+    pool = [skill for skill in SKILLS if skill in ("Python", "Java", "SQL", "React", "Docker", "AWS", "Go", "Git")]
+    for use_numpy in ([True, False] if BITMAP_NUMPY else [False]):
+        folder = tempfile.mkdtemp(prefix="test_candidates_")
+        resume_index = ResumeIndex(os.path.join(folder, "index.sqlite3"))
+        texts = [f"Resume {number}" for number in range(500)]
+        resume_index.add_many([({"skills": ", ".join(rng.sample(pool, 3))}, text, None) for text in texts])
+        bitmaps = SkillBitmapIndex(resume_index, os.path.join(folder, "skills.bin"), use_numpy=use_numpy)
+        bitmaps.prepare()
+
+        # Re-index some resumes in place with other skills, and add new ones,
+        # so results come from both the file and the delta
+        changed = rng.sample(texts, 60) + [f"Resume {number}" for number in range(500, 540)]
+        resume_index.add_many([({"skills": ", ".join(rng.sample(pool, 3))}, text, None) for text in changed])
+
+        rows = resume_index._connection().execute("SELECT id, skills FROM resumes").fetchall()
+        for query in QUERIES:
+            node = parse_query(query)
+            expected = sorted((resume_id for resume_id, skills in rows if _matches(skill_terms(skills), node)), reverse=True)
+            assert bitmaps.query(query) == expected[::-1], query
+            for per_page in (7, 50):
+                page_ids = []
+                for page in range(1, len(expected) // per_page + 2):
+                    result = bitmaps.search(query, page, per_page)
+                    assert result["total"] == len(expected), query
+                    page_ids += [row["id"] for row in result["results"]]
+                assert page_ids == expected, (query, per_page)
+        print(f"Skill bitmaps ({'numpy' if use_numpy else 'python'}): OK")
+
+def test_ranking():
+    """Rank after resumes are replaced with other text, against a freshly built matrix"""
+    rng = random.Random(0)
+    words = ["python", "java", "aws", "docker", "react", "kubernetes", "sql", "go", "rust", "azure"]
+
+    def text():
+        return " ".join(rng.sample(words, rng.randint(1, 5)))
+
+    for use_numpy in ([True, False] if RANKING_NUMPY else [False]):
+        texts = {resume_id: text() for resume_id in range(300)}
+        engine = RankingEngine(use_numpy=use_numpy)
+        for resume_id, resume_text in texts.items():
+            engine.add(resume_id, resume_text)
+        engine.rank("python")
+        for resume_id in rng.sample(list(texts), 40):
+            texts[resume_id] = text()
+            engine.add(resume_id, texts[resume_id])
+        # Enough new resumes for the engine to recompute its IDF weights
+        for resume_id in range(300, 320):
+            texts[resume_id] = text()
+            engine.add(resume_id, texts[resume_id])
+
+        fresh = RankingEngine(use_numpy=use_numpy)
+        for resume_id, resume_text in texts.items():
+            fresh.add(resume_id, resume_text)
+        assert len(engine) == len(fresh)
+        for query in ["python aws", "java", "rust go kubernetes sql docker"]:
+            scores = {resume_id: round(score, 4) for resume_id, score in engine.rank(query, len(texts))}
+            expected = {resume_id: round(score, 4) for resume_id, score in fresh.rank(query, len(texts))}
+            assert scores == expected, query
+        print(f"Ranking ({'numpy' if use_numpy else 'python'}): OK")
+
+if __name__ == "__main__":
+    print("\n===== TESTING CANDIDATE SEARCH =====\n")
+    test_skill_bitmaps()
+    test_ranking()
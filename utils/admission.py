@@ -0,0 +1,170 @@
+# utils/admission.py
+import math
+import time
+import json
+import asyncio
+from utils.tracing import span
+
+# Weight of the newest sample in the service-time moving average
+EWMA_ALPHA = 0.2
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; carries the suggested retry delay"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Server busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Limits how many requests of one kind run at once, with a short bounded
+    wait queue. Requests beyond the queue, or that wait too long, are
+    rejected immediately with a Retry-After estimated from observed
+    service times.
+    """
+
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout, initial_service_time=1.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.service_time = initial_service_time
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = None
+
+    def retry_after(self):
+        """Seconds until a slot is likely to free up for a new request"""
+        backlog = self.active + self.waiting + 1
+        return max(1, math.ceil(self.service_time * backlog / self.max_concurrent))
+
+    async def acquire(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        # Count queued requests as well as running ones: a request that has
+        # passed this check may not have taken its slot yet
+        if self.active + self.waiting >= self.max_concurrent + self.max_queue:
+            self.rejected += 1
+            raise Overloaded(self.retry_after())
+
+        self.waiting += 1
+        try:
+            admitted = await self._take_slot()
+        finally:
+            self.waiting -= 1
+        if not admitted:
+            self.rejected += 1
+            raise Overloaded(self.retry_after())
+        self.active += 1
+        self.admitted += 1
+
+    async def _take_slot(self):
+        """
+        Wait up to queue_timeout for a semaphore slot.
+
+        Returns:
+            bool: Whether a slot was taken
+        """
+        # Before Python 3.12, asyncio.wait_for can time out after acquire()
+        # has already taken the slot, losing it for good. Waiting on a task
+        # lets us see whether it finished; cancelling one that hasn't makes
+        # the semaphore pass its slot on if it had just been woken
+        acquiring = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            await asyncio.wait({acquiring}, timeout=self.queue_timeout)
+        except BaseException:
+            # The request was cancelled while queued
+            if acquiring.done():
+                self._semaphore.release()
+            else:
+                acquiring.cancel()
+            raise
+        if acquiring.done():
+            return True
+        acquiring.cancel()
+        return False
+
+    def release(self, duration):
+        self.active -= 1
+        self._semaphore.release()
+        self.service_time = (1 - EWMA_ALPHA) * self.service_time + EWMA_ALPHA * duration
+
+    def snapshot(self):
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.queue_timeout,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_service_time": round(self.service_time, 4),
+            "retry_after": self.retry_after(),
+        }
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an AdmissionController to specific routes.
+    Routes without a controller (e.g. /form, /download) pass straight through,
+    so they are never queued behind CPU-heavy work.
+    """
+
+    def __init__(self, app, controllers):
+        """
+        Args:
+            app: ASGI application
+            controllers: dict mapping (method, path) to AdmissionController
+        """
+        self.app = app
+        self.controllers = controllers
+
+    async def __call__(self, scope, receive, send):
+        controller = None
+        if scope["type"] == "http":
+            controller = self.controllers.get((scope["method"], scope["path"]))
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            with span("admission.wait", endpoint=controller.name) as wait:
+                try:
+                    await controller.acquire()
+                except Overloaded as e:
+                    wait.set_attributes(rejected=True, retry_after=e.retry_after)
+                    raise
+        except Overloaded as e:
+            await self._reject(scope, send, e.retry_after)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(time.perf_counter() - start)
+
+    async def _reject(self, scope, send, retry_after):
+        accept = ""
+        for key, value in scope["headers"]:
+            if key == b"accept":
+                accept = value.decode("latin-1")
+        message = f"The server is busy. Please try again in {retry_after} seconds."
+        if "text/html" in accept:
+            body = message.encode("utf-8")
+            content_type = b"text/html; charset=utf-8"
+        else:
+            body = json.dumps({"error": message}).encode("utf-8")
+            content_type = b"application/json"
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", content_type),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
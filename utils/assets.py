@@ -0,0 +1,171 @@
+# utils/assets.py - Front-end asset pipeline
+#
+# Minifies the form's script and stylesheet into content-hashed bundles under
+# static/dist and records them in a manifest that templates read through
+# asset_url(). Run it as part of the build:
+#
+#     python -m utils.assets
+
+import os
+import re
+import json
+import gzip
+import hashlib
+from starlette.staticfiles import StaticFiles
+from starlette.responses import FileResponse
+from utils.page_cache import negotiate_encoding
+
+# Import minifiers and brotli conditionally; the built-in minifiers and gzip are used otherwise
+try:
+    import rjsmin
+    RJSMIN_AVAILABLE = True
+except ImportError:
+    RJSMIN_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+STATIC_DIR = "static"
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+
+# Logical asset name -> source file, relative to STATIC_DIR
+ASSET_SOURCES = {
+    "form.js": "src/form.js",
+    "style.css": "style.css",
+}
+
+# Fingerprinted bundles never change, so browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+FINGERPRINTED_NAME = re.compile(r"^dist/.+\.[0-9a-f]{12}\.(?:js|css)$")
+
+def minify_css(source):
+    """Strip comments and insignificant whitespace from a stylesheet"""
+    css = re.sub(r"/\*.*?\*/", "", source, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};:,>])\s*", r"\1", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+def minify_js(source):
+    """
+    Minify a script with rjsmin when available. The fallback only drops
+    indentation, blank lines and whole-line comments, which cannot change
+    behaviour.
+    """
+    if RJSMIN_AVAILABLE:
+        return rjsmin.jsmin(source)
+
+    lines = []
+    in_block_comment = False
+    for line in source.splitlines():
+        stripped = line.strip()
+        if in_block_comment:
+            if "*/" in stripped:
+                in_block_comment = False
+            continue
+        if not stripped or stripped.startswith("//"):
+            continue
+        if stripped.startswith("/*"):
+            if "*/" not in stripped:
+                in_block_comment = True
+            continue
+        lines.append(stripped)
+    return "\n".join(lines) + "\n"
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+def build_assets(static_dir=STATIC_DIR):
+    """
+    Minify every asset into a fingerprinted bundle with precompressed siblings
+    and write the manifest
+
+    Returns:
+        dict: Logical name -> bundle path relative to the static directory
+    """
+    dist_dir = os.path.join(static_dir, "dist")
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifest = {}
+    for name, source in ASSET_SOURCES.items():
+        with open(os.path.join(static_dir, source), encoding="utf-8") as f:
+            content = f.read()
+        base, extension = os.path.splitext(name)
+        minified = MINIFIERS[extension](content).encode("utf-8")
+        digest = hashlib.sha256(minified).hexdigest()[:12]
+        bundle = f"{base}.{digest}{extension}"
+        bundle_path = os.path.join(dist_dir, bundle)
+
+        with open(bundle_path, "wb") as f:
+            f.write(minified)
+        with open(bundle_path + ".gz", "wb") as f:
+            f.write(gzip.compress(minified, compresslevel=9, mtime=0))
+        if BROTLI_AVAILABLE:
+            with open(bundle_path + ".br", "wb") as f:
+                f.write(brotli.compress(minified, quality=11, mode=brotli.MODE_TEXT))
+
+        manifest[name] = f"dist/{bundle}"
+        print(f"{source} -> dist/{bundle} ({len(content)} -> {len(minified)} bytes)")
+
+    # Bundles from previous builds are kept so pages rendered before the
+    # manifest changed can still load them
+    temp_path = os.path.join(dist_dir, "manifest.json.tmp")
+    with open(temp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, os.path.join(dist_dir, "manifest.json"))
+    return manifest
+
+_manifest = None
+_manifest_mtime = None
+
+def load_manifest():
+    """Read the manifest, reloading it when a new build replaces it"""
+    global _manifest, _manifest_mtime
+    try:
+        mtime = os.stat(MANIFEST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if mtime != _manifest_mtime:
+        with open(MANIFEST_PATH) as f:
+            _manifest = json.load(f)
+        _manifest_mtime = mtime
+    return _manifest
+
+def asset_url(name):
+    """URL of an asset's bundle, falling back to the unminified source before the first build"""
+    path = load_manifest().get(name) or ASSET_SOURCES[name]
+    return f"/static/{path}"
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that marks fingerprinted bundles immutable and serves their precompressed variants"""
+
+    PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+    async def get_response(self, path, scope):
+        if FINGERPRINTED_NAME.match(path):
+            accept_encoding = ""
+            for key, value in scope["headers"]:
+                if key == b"accept-encoding":
+                    accept_encoding = value.decode("latin-1")
+            encoding = negotiate_encoding(accept_encoding, self.PRECOMPRESSED_SUFFIXES)
+            if encoding != "identity":
+                full_path, stat_result = self.lookup_path(path + self.PRECOMPRESSED_SUFFIXES[encoding])
+                if stat_result is not None:
+                    media_type = "text/css" if path.endswith(".css") else "text/javascript"
+                    return FileResponse(full_path, stat_result=stat_result, media_type=media_type, headers={
+                        "content-encoding": encoding,
+                        "cache-control": IMMUTABLE_CACHE_CONTROL,
+                        "vary": "Accept-Encoding",
+                    })
+
+        response = await super().get_response(path, scope)
+        if response.status_code == 200 and FINGERPRINTED_NAME.match(path):
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+            response.headers["vary"] = "Accept-Encoding"
+        return response
+
+if __name__ == "__main__":
+    build_assets()
@@ -0,0 +1,195 @@
+# utils/http_cache.py
+import os
+import re
+import hashlib
+import email.utils
+from urllib.parse import quote
+from starlette.responses import Response
+from starlette.concurrency import run_in_threadpool
+
+MEDIA_TYPES = {
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".doc": "application/msword",
+    ".pdf": "application/pdf",
+    ".html": "text/html",
+}
+
+# Generated resumes are named after the SHA-256 of their input (see
+# resume_cache_key), so the name alone identifies the bytes
+CONTENT_ADDRESSED_NAME = re.compile(r"^resume_([0-9a-f]{64})\.[a-z]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+CHUNK_SIZE = 64 * 1024
+
+# (path, size, mtime_ns) -> strong ETag for files that are not content-addressed
+_etag_cache = {}
+_ETAG_CACHE_SIZE = 1024
+
+def media_type_for(filename):
+    """Return the MIME type for a download based on its extension"""
+    extension = os.path.splitext(filename)[1].lower()
+    return MEDIA_TYPES.get(extension, "application/octet-stream")
+
+def strong_etag(path, stat):
+    """Hash the file contents once per (size, mtime) and cache the result"""
+    filename = os.path.basename(path)
+    match = CONTENT_ADDRESSED_NAME.match(filename)
+    if match:
+        return f'"{match.group(1)}"'
+
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    etag = _etag_cache.get(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()}"'
+        if len(_etag_cache) >= _ETAG_CACHE_SIZE:
+            _etag_cache.clear()
+        _etag_cache[key] = etag
+    return etag
+
+def etag_matches(header, etag):
+    """Weak comparison used by If-None-Match"""
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in candidates)
+
+def _parse_http_date(value):
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    return parsed.timestamp() if parsed else None
+
+def _parse_range(header, size):
+    """
+    Parse a single byte range
+
+    Returns:
+        tuple: (start, end) inclusive, None to ignore the header (malformed or
+        multiple ranges, in which case the full file is sent), or "unsatisfiable"
+    """
+    units, _, ranges = header.partition("=")
+    if units.strip().lower() != "bytes" or "," in ranges:
+        return None
+    start_text, sep, end_text = ranges.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if start_text == "":
+            suffix = int(end_text)
+            if suffix <= 0:
+                return "unsatisfiable"
+            start, end = max(size - suffix, 0), size - 1
+        else:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return "unsatisfiable"
+    if start < 0 or end < start:
+        return None
+    return start, min(end, size - 1)
+
+class FileRangeResponse(Response):
+    """Stream a byte range of a file, using zero-copy send when the server supports it"""
+
+    def __init__(self, path, start, end, status_code, headers, send_body=True):
+        super().__init__(status_code=status_code, headers=headers)
+        self.path = path
+        self.start = start
+        self.end = end
+        self.send_body = send_body
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not self.send_body:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        count = self.end - self.start + 1
+        f = await run_in_threadpool(open, self.path, "rb")
+        try:
+            if "http.response.zerocopysend" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.fileno(),
+                    "offset": self.start,
+                    "count": count,
+                })
+                return
+
+            await run_in_threadpool(f.seek, self.start)
+            remaining = count
+            while remaining > 0:
+                chunk = await run_in_threadpool(f.read, min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            await run_in_threadpool(f.close)
+
+async def cached_file_response(request, path, filename, immutable=False):
+    """
+    Serve a file with strong validators, conditional GET and byte ranges
+
+    Args:
+        request: Incoming request (for conditional and Range headers)
+        path: Location of the file on disk
+        filename: Name offered to the browser in Content-Disposition
+        immutable: Whether the URL always refers to the same bytes
+
+    Returns:
+        Response: 200, 206, 304 or 416
+    """
+    stat = await run_in_threadpool(os.stat, path)
+    etag = await run_in_threadpool(strong_etag, path, stat)
+    last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+
+    headers = {
+        "etag": etag,
+        "last-modified": last_modified,
+        "cache-control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        "accept-ranges": "bytes",
+    }
+
+    # If-None-Match takes precedence over If-Modified-Since
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    else:
+        if_modified_since = _parse_http_date(request.headers.get("if-modified-since"))
+        if if_modified_since is not None and int(stat.st_mtime) <= if_modified_since:
+            return Response(status_code=304, headers=headers)
+
+    headers["content-type"] = media_type_for(filename)
+    headers["content-disposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+
+    size = stat.st_size
+    start, end, status_code = 0, size - 1, 200
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and request.method == "GET" and size > 0:
+        # A stale If-Range means the client's partial copy is outdated: send everything
+        if if_range is None or if_range.strip() in (etag, last_modified):
+            byte_range = _parse_range(range_header, size)
+            if byte_range == "unsatisfiable":
+                return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+            if byte_range is not None:
+                start, end = byte_range
+                status_code = 206
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+
+    headers["content-length"] = str(end - start + 1 if size else 0)
+    return FileRangeResponse(path, start, end, status_code, headers, send_body=request.method == "GET" and size > 0)
@@ -0,0 +1,432 @@
+# utils/ingest.py - Watch-folder ingestion of resumes
+#
+# A long-running alternative to /parse-resume for pipelines that drop resumes
+# into a shared directory. DOCX and PDF files landing in <folder>/inbox are
+# moved to <folder>/processing, parsed with parse_resume() on a pool of
+# worker processes, and their results appended to a JSONL file or written
+# to the resume index. Parsed files then move to <folder>/done, files that
+# could not be parsed to <folder>/failed.
+#
+# A ledger (SQLite, <folder>/ingest.sqlite3) records every file by content
+# hash, together with its parse result until that is written out. After a
+# restart, files left in processing are finished from the ledger instead of
+# being parsed again, and a file dropped a second time is not parsed twice.
+#
+# With watchdog installed the inbox is watched for changes (inotify, FSEvents,
+# ...); without it, it is polled. Ingest lag, backlog and parse durations go
+# to the Prometheus metrics and a periodic summary line.
+#
+#     python -m utils.ingest [--folder storage/ingest] [--output results.jsonl|index]
+
+import os
+import json
+import time
+import queue
+import signal
+import sqlite3
+import hashlib
+import statistics
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from utils.metrics import INGEST_BACKLOG, record_ingest
+
+# Import watchdog conditionally; without it the inbox is polled
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+INGEST_EXTENSIONS = (".docx", ".pdf")
+
+# Ledger states: "parsed" files have a result not yet written out
+PARSED, DONE, FAILED = "parsed", "done", "failed"
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested (
+    sha256 TEXT PRIMARY KEY,
+    file_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+# Parse results kept for the lag and latency percentiles of the summary line
+RECENT_RESULTS = 1000
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def move_to(path, folder):
+    """Move a file into folder, numbering its name if taken; returns the new path"""
+    name = os.path.basename(path)
+    stem, extension = os.path.splitext(name)
+    target = os.path.join(folder, name)
+    number = 1
+    while os.path.exists(target):
+        target = os.path.join(folder, f"{stem}.{number}{extension}")
+        number += 1
+    os.replace(path, target)
+    return target
+
+def parse_file(path):
+    """
+    Parse one resume in a worker process
+
+    Returns:
+        tuple: (parse result, extracted text or None, seconds taken)
+    """
+    from utils.resume_parser import parse_resume
+    parsed = {}
+    start = time.perf_counter()
+    fields = parse_resume(path, lambda fields, text: parsed.update(text=text))
+    return fields, parsed.get("text"), time.perf_counter() - start
+
+class IngestLedger:
+    """Content hashes of the ingested files and their state"""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(LEDGER_SCHEMA)
+
+    def get(self, sha256):
+        """(status, result) of a file, or (None, None) if it was never parsed"""
+        row = self.connection.execute("SELECT status, result FROM ingested WHERE sha256 = ?", (sha256,)).fetchone()
+        if row is None:
+            return None, None
+        return row[0], json.loads(row[1]) if row[1] is not None else None
+
+    def record(self, sha256, file_name, status, result=None):
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO ingested (sha256, file_name, status, result, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (sha256) DO UPDATE SET status = excluded.status, result = excluded.result, "
+                "updated_at = excluded.updated_at",
+                (sha256, file_name, status, json.dumps(result) if result is not None else None, time.time())
+            )
+
+    def close(self):
+        self.connection.close()
+
+class JsonlSink:
+    """Appends one JSON line per parsed resume, synced to disk before the ledger moves on"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, sha256, file_name, fields, text, seconds):
+        record = {
+            "sha256": sha256, "file_name": file_name, "ingested_at": time.time(),
+            "parse_seconds": round(seconds, 3), "parsed": fields,
+        }
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def written(self, hashes):
+        """Which of the hashes already have a line, for results interrupted by a restart"""
+        found = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    sha256 = json.loads(line).get("sha256")
+                except ValueError:
+                    continue  # A line cut short by a crash
+                if sha256 in hashes:
+                    found.add(sha256)
+        return found
+
+    def close(self):
+        self.file.close()
+
+class IndexSink:
+    """Writes parsed resumes to a ResumeIndex, one transaction per resume"""
+
+    def __init__(self, resume_index):
+        self.resume_index = resume_index
+
+    def write(self, sha256, file_name, fields, text, seconds):
+        self.resume_index.add_many([(fields, text or "", file_name)])
+
+    def written(self, hashes):
+        # The index replaces a resume added again, so results are simply rewritten
+        return set()
+
+    def close(self):
+        pass
+
+class IngestService:
+    """
+    Watches an inbox folder and parses the resumes dropped into it. run()
+    blocks until stop() is called (or, with once=True, until the inbox is
+    empty).
+    """
+
+    def __init__(self, folder, sink, workers=1, poll_interval=2.0, settle_seconds=1.0, report_interval=60.0):
+        self.folder = folder
+        self.inbox = os.path.join(folder, "inbox")
+        self.processing = os.path.join(folder, "processing")
+        self.done = os.path.join(folder, "done")
+        self.failed = os.path.join(folder, "failed")
+        for directory in (self.inbox, self.processing, self.done, self.failed):
+            os.makedirs(directory, exist_ok=True)
+        self.sink = sink
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.report_interval = report_interval
+        self.ledger = IngestLedger(os.path.join(folder, "ingest.sqlite3"))
+        self.counts = {DONE: 0, FAILED: 0, "duplicate": 0}
+        self._events = queue.Queue()
+        self._in_flight = {}
+        # Inbox path -> when a scan first saw it
+        self._arrived = {}
+        self._waiting = 0
+        self._recent = deque(maxlen=RECENT_RESULTS)
+        self._stop = threading.Event()
+
+    def stop(self):
+        """Finish the files being parsed, then return from run()"""
+        self._stop.set()
+        self._events.put(None)
+
+    def recover(self):
+        """Finish files a previous run left in processing, parsing only those it never parsed"""
+        # Their lag counts from the claim, when moving them changed their ctime
+        pending = {}
+        for name in sorted(os.listdir(self.processing)):
+            path = os.path.join(self.processing, name)
+            sha256 = file_sha256(path)
+            status, result = self.ledger.get(sha256)
+            if status == PARSED:
+                pending[sha256] = (path, result)
+            elif status == DONE:
+                move_to(path, self.done)
+            else:
+                # Failed files are claimed again when dropped again, so one
+                # failed earlier may have been retried when the run stopped
+                self._submit(path, sha256, os.stat(path).st_ctime)
+        written = self.sink.written(set(pending)) if pending else set()
+        for sha256, (path, result) in pending.items():
+            if sha256 not in written:
+                self.sink.write(sha256, os.path.basename(path), result["fields"], result["text"], result["seconds"])
+            self._finish(path, sha256, DONE, result["seconds"], os.stat(path).st_ctime)
+        if pending:
+            print(f"Ingest recovered {len(pending)} parsed resumes left in {self.processing}")
+
+    def _new_pool(self):
+        # Workers leave Ctrl-C to this process, which finishes their files
+        return ProcessPoolExecutor(self.workers, initializer=signal.signal, initargs=(signal.SIGINT, signal.SIG_IGN))
+
+    @property
+    def _in_flight_hashes(self):
+        return {sha256 for _, sha256, _, _ in self._in_flight.values()}
+
+    def _submit(self, path, sha256, arrived):
+        future = self._pool.submit(parse_file, path)
+        self._in_flight[future] = (path, sha256, arrived, self._pool)
+        future.add_done_callback(self._events.put)
+
+    def _scan(self):
+        """
+        Claim settled files from the inbox, up to two per worker in flight
+
+        Returns:
+            bool: Whether files were left for later because they are still
+                being written
+        """
+        unsettled = False
+        now = time.time()
+        entries = []
+        with os.scandir(self.inbox) as scan:
+            for entry in scan:
+                if entry.is_file() and entry.name.lower().endswith(INGEST_EXTENSIONS) and not entry.name.startswith("."):
+                    entries.append(entry)
+        self._waiting = len(entries)
+        # A file moved into the inbox keeps its mtime, so arrival is when a
+        # scan first saw it, or the rename that put it there (its ctime) if
+        # that was earlier, e.g. while the service was down
+        arrivals = {}
+        for entry in entries:
+            arrivals[entry.path] = self._arrived.get(entry.path) or min(now, entry.stat().st_ctime)
+        self._arrived = arrivals
+        for entry in sorted(entries, key=lambda entry: arrivals[entry.path]):
+            if len(self._in_flight) >= 2 * self.workers:
+                break
+            arrived = arrivals[entry.path]
+            # Writes change mtime and ctime, and a rename changes ctime
+            stat = entry.stat()
+            if now - max(stat.st_mtime, stat.st_ctime) < self.settle_seconds:
+                unsettled = True
+                continue
+            try:
+                sha256 = file_sha256(entry.path)
+                if sha256 in self._in_flight_hashes:
+                    continue  # Left in the inbox until its twin is done
+                path = move_to(entry.path, self.processing)
+            except FileNotFoundError:
+                continue  # Claimed by another ingest process
+            self._waiting -= 1
+            status, _ = self.ledger.get(sha256)
+            # Files that failed before are tried again, as the parser may
+            # have been fixed since
+            if status == DONE:
+                move_to(path, self.done)
+                self.counts["duplicate"] += 1
+                record_ingest(path, "duplicate")
+                continue
+            self._submit(path, sha256, arrived)
+        INGEST_BACKLOG.set(self._waiting + len(self._in_flight))
+        return unsettled
+
+    def _collect(self, future):
+        path, sha256, arrived, pool = self._in_flight.pop(future)
+        file_name = os.path.basename(path)
+        try:
+            fields, text, seconds = future.result()
+        except BrokenProcessPool:
+            # A worker died, taking every file it was given with it. They
+            # are failed without a ledger entry, so dropping them into the
+            # inbox again retries them
+            print(f"Could not parse {file_name}: a parser worker died")
+            if pool is self._pool:
+                pool.shutdown(wait=False)
+                self._pool = self._new_pool()
+            self._finish(path, sha256, FAILED, 0.0, arrived)
+            return
+        if not fields or "error" in fields:
+            print(f"Could not parse {file_name}: {fields.get('error') if fields else 'parser error'}")
+            self.ledger.record(sha256, file_name, FAILED)
+            self._finish(path, sha256, FAILED, seconds, arrived)
+            return
+        # The result goes to the ledger first, so a restart can write it out
+        # without parsing the file again
+        self.ledger.record(sha256, file_name, PARSED, {"fields": fields, "text": text, "seconds": seconds})
+        self.sink.write(sha256, file_name, fields, text, seconds)
+        self._finish(path, sha256, DONE, seconds, arrived)
+
+    def _finish(self, path, sha256, status, seconds, arrived):
+        if status == DONE:
+            self.ledger.record(sha256, os.path.basename(path), DONE)
+        move_to(path, self.done if status == DONE else self.failed)
+        lag = max(0.0, time.time() - arrived)
+        self.counts[status] += 1
+        self._recent.append((lag, seconds))
+        record_ingest(path, status, seconds, lag)
+
+    def report(self):
+        """Print a summary of the backlog and recent lag and parse times"""
+        line = (f"Ingest: {self._waiting} waiting, {len(self._in_flight)} parsing, "
+                f"{self.counts[DONE]} done, {self.counts[FAILED]} failed, {self.counts['duplicate']} duplicates")
+        if self._recent:
+            lags = sorted(lag for lag, _ in self._recent)
+            seconds = [parse for _, parse in self._recent]
+            line += (f"; lag p50 {statistics.median(lags):.2f}s max {lags[-1]:.2f}s, "
+                     f"parse p50 {statistics.median(seconds):.2f}s")
+        print(line)
+
+    def _watch(self):
+        """Start watching the inbox; returns the observer, or None to poll"""
+        if not WATCHDOG_AVAILABLE:
+            return None
+        events = self._events
+
+        class InboxHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                events.put("scan")
+
+        observer = Observer()
+        observer.schedule(InboxHandler(), self.inbox)
+        observer.start()
+        return observer
+
+    def run(self, once=False):
+        """
+        Ingest until stop() is called
+
+        Args:
+            once: Return as soon as the inbox is empty and every file is parsed
+        """
+        # Workers are forked before the watcher thread starts
+        self._pool = self._new_pool()
+        observer = None
+        try:
+            self.recover()
+            observer = None if once else self._watch()
+            # Rescan now and then even when watching, in case events were missed
+            interval = self.poll_interval if observer is None else max(self.poll_interval, 30.0)
+            print(f"Ingesting resumes from {self.inbox} with {self.workers} workers "
+                  f"({'watching' if observer is not None else 'polling'})")
+            next_report = time.monotonic() + self.report_interval
+            while not self._stop.is_set():
+                unsettled = self._scan()
+                if once and not self._in_flight and not self._waiting:
+                    break
+                timeout = min(interval, self.settle_seconds) if unsettled else interval
+                try:
+                    event = self._events.get(timeout=timeout)
+                except queue.Empty:
+                    event = None
+                # Take in every result that is ready before scanning again
+                while True:
+                    if event in self._in_flight:
+                        self._collect(event)
+                    try:
+                        event = self._events.get_nowait()
+                    except queue.Empty:
+                        break
+                if time.monotonic() >= next_report:
+                    self.report()
+                    next_report = time.monotonic() + self.report_interval
+            # Stopped: no new files are claimed, the ones being parsed are finished
+            for future in list(self._in_flight):
+                self._collect(future)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self._pool.shutdown(wait=True)
+            self.report()
+            self.sink.close()
+            self.ledger.close()
+
+if __name__ == "__main__":
+    import argparse
+    import config
+    parser = argparse.ArgumentParser(description="Parse resumes dropped into a watched folder")
+    parser.add_argument("--folder", default=config.INGEST_FOLDER, help="Folder holding inbox/, processing/, done/ and failed/")
+    parser.add_argument("--output", default=config.INGEST_OUTPUT, help='JSONL file to append results to, or "index" for the resume index')
+    parser.add_argument("--workers", type=int, default=config.INGEST_WORKERS)
+    parser.add_argument("--poll", type=float, default=config.INGEST_POLL_SECONDS, help="Seconds between scans when polling")
+    parser.add_argument("--once", action="store_true", help="Exit once the inbox is empty")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port")
+    args = parser.parse_args()
+
+    if args.output == "index":
+        from utils.resume_index import ResumeIndex
+        sink = IndexSink(ResumeIndex(config.RESUME_INDEX_PATH))
+    else:
+        sink = JsonlSink(args.output)
+    if args.metrics_port:
+        from prometheus_client import start_http_server
+        start_http_server(args.metrics_port)
+
+    service = IngestService(
+        args.folder, sink, args.workers, args.poll, config.INGEST_SETTLE_SECONDS, config.INGEST_REPORT_SECONDS
+    )
+    signal.signal(signal.SIGTERM, lambda *_: service.stop())
+    signal.signal(signal.SIGINT, lambda *_: service.stop())
+    service.run(once=args.once)
@@ -0,0 +1,145 @@
+# utils/loop_monitor.py - Event loop lag and blocking-callback detector
+#
+# Opt-in (LOOP_MONITOR_ENABLED). A timer on the event loop fires every
+# interval and measures how late it ran; that lag is exported as a histogram
+# and as percentiles of the recent samples. A watcher thread notices when the
+# timer is overdue by more than the threshold, meaning a callback is holding
+# the loop, and captures the loop thread's stack at that moment. Once the
+# loop is free again it logs the stack, the route whose handler was running
+# and how long the loop was blocked. A stall during which the loop thread was
+# only waiting for events is logged as GIL starvation by other threads.
+#
+# The cost is one timer callback per interval on the loop and a thread
+# waking every threshold / 2, so it can stay on in production.
+
+import sys
+import time
+import asyncio
+import linecache
+import threading
+import traceback
+from collections import deque
+from utils.metrics import LOOP_LAG, LOOP_LAG_QUANTILES, LOOP_BLOCKS
+
+# Lag samples kept for the percentile gauges
+LAG_WINDOW = 1000
+QUANTILES = (0.5, 0.9, 0.99)
+# Seconds between updates of the percentile gauges
+QUANTILE_INTERVAL = 5.0
+
+def _waiting_for_events(frame):
+    """Whether the loop thread is in the loop's own wait for I/O rather than in a callback"""
+    if frame.f_code.co_filename.endswith("selectors.py"):
+        return True
+    # A loop written in C (uvloop) waits below the Python frame that started it
+    line = linecache.getline(frame.f_code.co_filename, frame.f_lineno)
+    return "run_until_complete" in line or "run_forever" in line
+
+class LoopMonitor:
+    """
+    Measures the lag of an event loop and reports callbacks that block it.
+    Call start() from a coroutine running on the loop, and stop() to end.
+    """
+
+    def __init__(self, interval=0.1, threshold=0.1, routes=None):
+        """
+        Args:
+            interval: Seconds between timer callbacks
+            threshold: Report callbacks blocking the loop for longer than this
+            routes: The app's routes, to tell whose endpoint was blocking
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.routes = routes
+        self.lags = deque(maxlen=LAG_WINDOW)
+        self.blocks = 0
+        self._beat = None
+        self._loop_thread = None
+        self._task = None
+        self._stopped = threading.Event()
+        self._endpoints = None
+
+    def start(self):
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+        threading.Thread(target=self._watch, name="loop-monitor", daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _tick(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - due)
+            self._beat = time.monotonic()
+            self.lags.append(lag)
+            LOOP_LAG.observe(lag)
+
+    def _route(self, frame):
+        """Path of the endpoint whose code is on the stack, or "unknown" """
+        if self._endpoints is None:
+            self._endpoints = {
+                route.endpoint.__code__: route.path
+                for route in self.routes or ()
+                if hasattr(getattr(route, "endpoint", None), "__code__")
+            }
+        while frame is not None:
+            path = self._endpoints.get(frame.f_code)
+            if path is not None:
+                return path
+            frame = frame.f_back
+        return "unknown"
+
+    def _watch(self):
+        overdue_beat = culprit = None
+        next_quantiles = time.monotonic() + QUANTILE_INTERVAL
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._beat
+            now = time.monotonic()
+            if overdue_beat is not None and beat != overdue_beat:
+                self._report(beat - overdue_beat - self.interval, culprit)
+                overdue_beat = culprit = None
+            if now - beat > self.interval + self.threshold and culprit is None:
+                # Overdue: whatever the loop thread is running now is the
+                # culprit. If it is only waiting for events, the loop is
+                # starved of the GIL by other threads; keep looking, as a
+                # callback may still start blocking within the same stall
+                overdue_beat = beat
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is not None and not _waiting_for_events(frame):
+                    culprit = (self._route(frame), traceback.format_stack(frame))
+            if now >= next_quantiles and self.lags:
+                samples = sorted(self.lags)
+                for quantile in QUANTILES:
+                    LOOP_LAG_QUANTILES.labels(str(quantile)).set(samples[min(len(samples) - 1, int(quantile * len(samples)))])
+                next_quantiles = now + QUANTILE_INTERVAL
+
+    def _report(self, duration, culprit):
+        self.blocks += 1
+        if culprit is None:
+            LOOP_BLOCKS.labels("starved").inc()
+            print(f"Event loop stalled for {duration * 1000:.0f} ms without a blocking callback; "
+                  f"other threads held the GIL")
+            return
+        route, stack = culprit
+        LOOP_BLOCKS.labels(route).inc()
+        print(
+            f"Event loop blocked for {duration * 1000:.0f} ms while serving {route}; "
+            f"stack after {self.threshold * 1000:.0f} ms:\n{''.join(stack)}",
+            end=""
+        )
+
+    def summary(self):
+        """Recent lag percentiles in milliseconds and the number of blocks reported"""
+        samples = sorted(self.lags)
+        result = {"blocks": self.blocks}
+        for quantile in QUANTILES:
+            value = samples[min(len(samples) - 1, int(quantile * len(samples)))] if samples else 0.0
+            result[f"p{int(quantile * 100)}_ms"] = round(value * 1000, 2)
+        result["max_ms"] = round(samples[-1] * 1000, 2) if samples else 0.0
+        return result
@@ -0,0 +1,259 @@
+# utils/metrics.py - Prometheus metrics for requests, parsing, generation and storage
+#
+# With several workers, set PROMETHEUS_MULTIPROC_DIR before this module is
+# imported (gunicorn.conf.py does) so every worker writes its samples there
+# and /metrics aggregates them across processes.
+
+import os
+import time
+import threading
+
+# Import prometheus_client conditionally; without it every metric is a no-op
+try:
+    from prometheus_client import (
+        Counter, Gauge, Histogram, CollectorRegistry, REGISTRY,
+        generate_latest, CONTENT_TYPE_LATEST,
+    )
+    from prometheus_client.core import GaugeMetricFamily
+    from prometheus_client import multiprocess
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Seconds to reuse a storage size measurement between scrapes
+STORAGE_SCAN_INTERVAL = 30
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+TEXT_LENGTH_BUCKETS = (100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+LOOP_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+class _NullMetric:
+    """Stand-in used when prometheus_client is not installed"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def observe(self, amount):
+        pass
+
+    def set(self, value):
+        pass
+
+if not PROMETHEUS_AVAILABLE:
+    Counter = Gauge = Histogram = _NullMetric
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to serve an HTTP request",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests served",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served",
+    ["method", "route"], **({"multiprocess_mode": "livesum"} if PROMETHEUS_AVAILABLE else {})
+)
+PARSE_DURATION = Histogram(
+    "resume_parse_duration_seconds", "Time to extract and parse an uploaded resume",
+    ["file_type"], buckets=LATENCY_BUCKETS,
+)
+UPLOAD_SIZE = Histogram(
+    "resume_upload_size_bytes", "Size of uploaded resume files",
+    ["file_type"], buckets=SIZE_BUCKETS,
+)
+TEXT_LENGTH = Histogram(
+    "resume_extracted_text_length_chars", "Characters of text extracted from an uploaded resume",
+    ["file_type"], buckets=TEXT_LENGTH_BUCKETS,
+)
+GENERATE_DURATION = Histogram(
+    "resume_generate_duration_seconds", "Time to render and store a resume",
+    ["output_format"], buckets=LATENCY_BUCKETS,
+)
+DOCUMENT_SIZE = Histogram(
+    "resume_document_size_bytes", "Size of generated resume documents",
+    ["output_format"], buckets=SIZE_BUCKETS,
+)
+
+INGEST_LAG = Histogram(
+    "resume_ingest_lag_seconds", "Time from a resume landing in the ingest inbox to its result being written",
+    buckets=LATENCY_BUCKETS + (60, 300, 900),
+)
+INGEST_PARSE_DURATION = Histogram(
+    "resume_ingest_parse_duration_seconds", "Time a worker took to parse an ingested resume",
+    ["file_type"], buckets=LATENCY_BUCKETS,
+)
+INGEST_BACKLOG = Gauge(
+    "resume_ingest_backlog_files", "Resumes waiting in the ingest inbox or being parsed",
+    **({"multiprocess_mode": "livesum"} if PROMETHEUS_AVAILABLE else {})
+)
+INGEST_FILES = Counter(
+    "resume_ingest_files_total", "Resumes taken from the ingest inbox, by outcome",
+    ["status"],
+)
+
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran the loop monitor's timer",
+    buckets=LOOP_LAG_BUCKETS,
+)
+LOOP_LAG_QUANTILES = Gauge(
+    "event_loop_lag_quantile_seconds", "Event loop lag percentiles over the loop monitor's recent samples",
+    ["quantile"], **({"multiprocess_mode": "liveall"} if PROMETHEUS_AVAILABLE else {})
+)
+LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total", "Times a callback blocked the event loop for longer than the threshold",
+    ["route"],
+)
+
+def file_type_of(filename):
+    """Lower-case extension used as the file_type label ('docx', 'pdf', ...)"""
+    return os.path.splitext(filename or "")[1].lstrip(".").lower() or "unknown"
+
+def record_upload(filename, size):
+    UPLOAD_SIZE.labels(file_type_of(filename)).observe(size)
+
+def record_parse(filename, duration, text_length):
+    file_type = file_type_of(filename)
+    PARSE_DURATION.labels(file_type).observe(duration)
+    TEXT_LENGTH.labels(file_type).observe(text_length)
+
+def record_ingest(filename, status, parse_duration=None, lag=None):
+    INGEST_FILES.labels(status).inc()
+    if parse_duration is not None:
+        INGEST_PARSE_DURATION.labels(file_type_of(filename)).observe(parse_duration)
+    if lag is not None:
+        INGEST_LAG.observe(lag)
+
+def record_generate(output_format, duration, size):
+    GENERATE_DURATION.labels(output_format).observe(duration)
+    DOCUMENT_SIZE.labels(output_format).observe(size)
+
+class StorageCollector:
+    """Reports the bytes and object count held in each storage namespace"""
+
+    def __init__(self, storage, namespaces):
+        self.storage = storage
+        self.namespaces = namespaces
+        self.lock = threading.Lock()
+        self.measured_at = None
+        self.sizes = {}
+
+    def _measure(self):
+        with self.lock:
+            if self.measured_at is None or time.monotonic() - self.measured_at > STORAGE_SCAN_INTERVAL:
+                sizes = {}
+                for namespace in self.namespaces:
+                    objects = list(self.storage.list(namespace))
+                    sizes[namespace] = (sum(o.size for o in objects), len(objects))
+                self.sizes = sizes
+                self.measured_at = time.monotonic()
+            return self.sizes
+
+    def collect(self):
+        size_bytes = GaugeMetricFamily("storage_size_bytes", "Bytes stored per namespace", labels=["namespace"])
+        object_count = GaugeMetricFamily("storage_objects", "Objects stored per namespace", labels=["namespace"])
+        try:
+            sizes = self._measure()
+        except Exception as e:
+            print(f"Could not measure storage for metrics: {e}")
+            sizes = {}
+        for namespace, (total, count) in sizes.items():
+            size_bytes.add_metric([namespace], total)
+            object_count.add_metric([namespace], count)
+        yield size_bytes
+        yield object_count
+
+_storage_collector = None
+
+def render_metrics(storage=None, namespaces=()):
+    """
+    Render every metric in the Prometheus text format
+
+    Returns:
+        tuple: (body bytes, content type)
+    """
+    global _storage_collector
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client is not installed\n", CONTENT_TYPE_LATEST
+
+    if storage is not None and _storage_collector is None:
+        _storage_collector = StorageCollector(storage, namespaces)
+        if not MULTIPROC_DIR:
+            REGISTRY.register(_storage_collector)
+
+    if MULTIPROC_DIR:
+        # Aggregate the samples every worker wrote to the shared directory
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        if _storage_collector is not None:
+            registry.register(_storage_collector)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live gauges (call from gunicorn's child_exit hook)"""
+    if PROMETHEUS_AVAILABLE and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
+
+def route_template(routes, scope):
+    """Path template of the first route matching an ASGI scope, e.g. /download/{filename}"""
+    from starlette.routing import Match
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request. Requests are labelled with the
+    route's path template to keep label sets small.
+    """
+
+    def __init__(self, app, route_of):
+        """
+        Args:
+            app: ASGI application
+            route_of: Callable mapping an ASGI scope to its route template
+        """
+        self.app = app
+        self.route_of = route_of
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self.route_of(scope)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+            REQUESTS.labels(method, route, str(status)).inc()
+            in_progress.dec()
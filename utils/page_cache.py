@@ -0,0 +1,142 @@
+# utils/page_cache.py
+import os
+import gzip
+import time
+import hashlib
+import threading
+from starlette.responses import Response
+from utils.http_cache import etag_matches
+
+# Import brotli conditionally; pages are still served gzip-compressed without it
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Seconds between checks of the template files for changes
+CHECK_INTERVAL = 1.0
+
+# Pages are revalidated on every load so a deploy is picked up immediately;
+# the ETag makes that revalidation a cheap 304
+CACHE_CONTROL = "no-cache"
+
+class PrerenderedPage:
+    """A rendered template with its compressed variants and validators"""
+
+    def __init__(self, body, sources):
+        self.body = body
+        self.sources = sources
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {
+            "identity": body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if BROTLI_AVAILABLE:
+            self.variants["br"] = brotli.compress(body, quality=11, mode=brotli.MODE_TEXT)
+        self.checked_at = time.monotonic()
+
+    def variant_etag(self, encoding):
+        """Each content-coding is a different representation, so it gets its own strong ETag"""
+        if encoding == "identity":
+            return f'"{self.etag}"'
+        return f'"{self.etag}-{encoding}"'
+
+    def is_stale(self):
+        for path, mtime in self.sources:
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+def negotiate_encoding(accept_encoding, available):
+    """Pick the best encoding from an Accept-Encoding header: br, then gzip, then identity"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+class PageCache:
+    """
+    Renders context-free templates once, keeps gzip and brotli variants, and
+    re-renders only when the template file (or another listed dependency) changes
+    """
+
+    def __init__(self, templates, dependencies=None):
+        """
+        Args:
+            templates: Jinja2Templates instance
+            dependencies: Optional callable returning extra file paths a page depends on
+        """
+        self.templates = templates
+        self.dependencies = dependencies
+        self.pages = {}
+        self.lock = threading.Lock()
+
+    def _render(self, name):
+        template = self.templates.get_template(name)
+        body = template.render().encode("utf-8")
+        paths = [template.filename] + list(self.dependencies() if self.dependencies else [])
+        sources = []
+        for path in paths:
+            try:
+                sources.append((path, os.stat(path).st_mtime_ns))
+            except FileNotFoundError:
+                sources.append((path, None))
+        return PrerenderedPage(body, sources)
+
+    def get(self, name):
+        """Return the prerendered page, re-rendering it if its sources changed"""
+        page = self.pages.get(name)
+        if page is not None and time.monotonic() - page.checked_at < CHECK_INTERVAL:
+            return page
+
+        with self.lock:
+            page = self.pages.get(name)
+            if page is None or page.is_stale():
+                page = self._render(name)
+                self.pages[name] = page
+            else:
+                page.checked_at = time.monotonic()
+        return page
+
+    def prerender(self, names):
+        for name in names:
+            self.get(name)
+
+    def response(self, request, name):
+        """Serve a page with content negotiation, strong ETags and 304 handling"""
+        page = self.get(name)
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"), page.variants)
+        etag = page.variant_etag(encoding)
+
+        headers = {
+            "etag": etag,
+            "cache-control": CACHE_CONTROL,
+            "vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and any(etag_matches(if_none_match, page.variant_etag(e)) for e in page.variants):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["content-encoding"] = encoding
+        return Response(page.variants[encoding], headers=headers, media_type="text/html; charset=utf-8")
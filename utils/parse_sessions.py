@@ -0,0 +1,70 @@
+# utils/parse_sessions.py
+#
+# A parse session keeps an uploaded resume and its parse result in storage
+# under a random token, so /generate can refer to the upload /parse-resume
+# already received instead of having it sent a second time.
+
+import re
+import json
+import time
+import secrets
+from utils.storage import storage_key, UPLOADS
+
+SESSION_TOKEN = re.compile(r"^[0-9a-f]{32}$")
+
+def new_session_token():
+    return secrets.token_hex(16)
+
+def _metadata_key(token):
+    return storage_key(UPLOADS, f"session_{token}.json")
+
+def save_parse_session(storage, token, upload_path, filename, content_type, parsed_data, sections=None):
+    """
+    Move a parsed upload into storage and record its parse result
+
+    Args:
+        storage: ArtifactStorage to write to
+        token: Session token from new_session_token()
+        upload_path: Local path of the uploaded file (consumed)
+        filename: Name the client gave the upload
+        content_type: Content type the client sent
+        parsed_data: Parse result returned to the client
+        sections: Entries of the parse's ParseCache, reused when the next
+            revision of the resume is parsed
+
+    Returns:
+        str: Storage key of the stored upload
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else "bin"
+    upload_key = storage_key(UPLOADS, f"session_{token}.{extension}")
+    storage.put_file(upload_key, upload_path, content_type=content_type)
+    metadata = {
+        "upload_key": upload_key,
+        "filename": filename,
+        "content_type": content_type,
+        "created": time.time(),
+        "parsed": parsed_data,
+        "sections": sections or {},
+    }
+    storage.put_bytes(_metadata_key(token), json.dumps(metadata).encode("utf-8"), content_type="application/json")
+    return upload_key
+
+def load_parse_session(storage, token, max_age):
+    """
+    Look up a parse session
+
+    Returns:
+        dict: The session metadata (upload_key, filename, content_type,
+            created, parsed, sections), or None if the token is unknown or expired
+    """
+    if not token or not SESSION_TOKEN.match(token):
+        return None
+    try:
+        with storage.open(_metadata_key(token)) as f:
+            metadata = json.loads(f.read())
+    except FileNotFoundError:
+        return None
+    if time.time() - metadata["created"] > max_age or not storage.exists(metadata["upload_key"]):
+        return None
+    storage.touch(metadata["upload_key"])
+    return metadata
@@ -0,0 +1,235 @@
+# utils/resume_export.py - Columnar export of parse results for analytics
+#
+# Writes the structured part of parse results (skills, field of work,
+# experience level and years, certifications, languages) to Parquet or Arrow
+# IPC files. Comma-separated fields become list columns and categorical ones
+# are dictionary encoded. Rows are buffered into row groups of
+# row_group_size and written as each fills, so memory stays bounded however
+# many resumes are exported. Contact details are left out.
+#
+# Export the resume index, or parse a folder of resumes directly:
+#
+#     python -m utils.resume_export resumes.parquet
+#     python -m utils.resume_export resumes.arrow --format arrow archive/
+
+import os
+import datetime
+from utils.resume_parser import FIELD_PATTERNS
+
+# Import pyarrow conditionally; export is unavailable without it
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+FORMATS = ("parquet", "arrow")
+
+# Parse result fields holding comma-separated lists
+LIST_FIELDS = ("skills", "certifications", "languages")
+# Parse result fields with a small set of values, dictionary encoded
+CATEGORICAL_FIELDS = ("field_of_work", "experience_level")
+
+# The parser's experience levels, most junior first. Known values are
+# registered up front so their codes are the same in every export
+EXPERIENCE_LEVELS = ("Intern", "Entry Level", "Junior", "Mid-Level", "Senior", "Lead", "Manager")
+CATEGORIES = {
+    "field_of_work": tuple(FIELD_PATTERNS),
+    "experience_level": EXPERIENCE_LEVELS,
+}
+
+# Resume index columns read for an export
+INDEX_COLUMNS = ("id", "file_name", "indexed_at") + LIST_FIELDS + CATEGORICAL_FIELDS + ("years_of_experience",)
+
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+# Resume files picked up when exporting a folder
+RESUME_EXTENSIONS = (".pdf", ".docx")
+
+def export_schema():
+    """Arrow schema of exported files"""
+    return pa.schema([
+        ("id", pa.int64()),
+        ("file_name", pa.string()),
+        ("indexed_at", pa.timestamp("ms", tz="UTC")),
+        ("skills", pa.list_(pa.string())),
+        ("field_of_work", pa.dictionary(pa.int16(), pa.string())),
+        ("experience_level", pa.dictionary(pa.int8(), pa.string())),
+        ("years_of_experience", pa.int16()),
+        ("certifications", pa.list_(pa.string())),
+        ("languages", pa.list_(pa.string())),
+    ])
+
+def _split(value):
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+def _years(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+class ColumnarWriter:
+    """
+    Streams parse results into a Parquet or Arrow IPC file, one row group
+    per row_group_size rows. Use as a context manager, or call close().
+    """
+
+    def __init__(self, path, format="parquet", row_group_size=DEFAULT_ROW_GROUP_SIZE, compression="zstd"):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("Columnar export requires pyarrow (pip install pyarrow)")
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format: {format}")
+        self.path = path
+        self.format = format
+        self.row_group_size = row_group_size
+        self.schema = export_schema()
+        self.rows = 0
+        # Category values and their codes. Dictionaries only grow, so every
+        # batch's dictionary extends the previous one; Arrow IPC files then
+        # only need the new values (a dictionary delta) per batch
+        self._codes = {field: {value: code for code, value in enumerate(CATEGORIES[field])}
+                       for field in CATEGORICAL_FIELDS}
+        self._columns = {field.name: [] for field in self.schema}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if format == "parquet":
+            self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        else:
+            self._sink = pa.OSFile(path, "wb")
+            options = pa.ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(self._sink, self.schema, options=options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, fields, resume_id=None, file_name=None, indexed_at=None):
+        """
+        Add one parse result
+
+        Args:
+            fields: Parse result, as returned by parse_resume()
+            resume_id: Resume index id, if it came from the index
+            file_name: Name of the resume file
+            indexed_at: Unix time the resume was indexed or parsed
+        """
+        columns = self._columns
+        columns["id"].append(resume_id)
+        columns["file_name"].append(file_name)
+        columns["indexed_at"].append(
+            datetime.datetime.fromtimestamp(indexed_at, datetime.timezone.utc) if indexed_at is not None else None
+        )
+        for field in LIST_FIELDS:
+            columns[field].append(_split(fields.get(field)))
+        for field in CATEGORICAL_FIELDS:
+            value = fields.get(field) or None
+            if value is not None:
+                codes = self._codes[field]
+                value = codes.setdefault(value, len(codes))
+            columns[field].append(value)
+        columns["years_of_experience"].append(_years(fields.get("years_of_experience")))
+        if len(columns["id"]) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one row group (Parquet) or record batch (Arrow)"""
+        count = len(self._columns["id"])
+        if not count:
+            return
+        arrays = []
+        for field in self.schema:
+            values = self._columns[field.name]
+            if field.name in CATEGORICAL_FIELDS:
+                dictionary = pa.array(list(self._codes[field.name]), pa.string())
+                indices = pa.array(values, field.type.index_type)
+                arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary))
+            else:
+                arrays.append(pa.array(values, field.type))
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self.format == "parquet":
+            self._writer.write_batch(batch, row_group_size=count)
+        else:
+            self._writer.write_batch(batch)
+        self.rows += count
+        self._columns = {name: [] for name in self._columns}
+
+    def close(self):
+        """Write the remaining rows and finish the file"""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._writer = None
+        if self.format == "arrow":
+            self._sink.close()
+
+def export_resume_index(resume_index, path, format="parquet", row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Export every resume in a ResumeIndex, reading it in row_group_size batches
+
+    Returns:
+        int: Number of resumes exported
+    """
+    with ColumnarWriter(path, format, row_group_size) as writer:
+        after_id = 0
+        while True:
+            rows = resume_index.rows_since(after_id, INDEX_COLUMNS, row_group_size)
+            for row in rows:
+                writer.write(row, row["id"], row["file_name"], row["indexed_at"])
+            if len(rows) < row_group_size:
+                break
+            after_id = rows[-1]["id"]
+    return writer.rows
+
+def resume_files(paths):
+    """Resume files in paths, descending into folders"""
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(RESUME_EXTENSIONS):
+                        yield os.path.join(directory, name)
+        elif path.lower().endswith(RESUME_EXTENSIONS):
+            yield path
+
+def export_resume_files(paths, path, format="parquet", row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """
+    Parse resume files (and folders of them) and export the results
+
+    Returns:
+        tuple: (resumes exported, files that could not be parsed)
+    """
+    from utils.resume_parser import parse_resume
+    failed = 0
+    with ColumnarWriter(path, format, row_group_size) as writer:
+        for file_path in resume_files(paths):
+            fields = parse_resume(file_path)
+            if not fields or "error" in fields:
+                failed += 1
+                continue
+            writer.write(fields, file_name=os.path.basename(file_path), indexed_at=os.path.getmtime(file_path))
+    return writer.rows, failed
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Export parse results to Parquet or Arrow IPC")
+    parser.add_argument("output", help="File to write")
+    parser.add_argument("inputs", nargs="*", help="Resume files or folders to parse (default: the resume index)")
+    parser.add_argument("--format", choices=FORMATS, help="Default: from the output's extension, else parquet")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args()
+    format = args.format or ("arrow" if args.output.lower().endswith((".arrow", ".feather")) else "parquet")
+
+    if args.inputs:
+        exported, failed = export_resume_files(args.inputs, args.output, format, args.row_group_size)
+        print(f"Exported {exported} resumes to {args.output} ({failed} could not be parsed)")
+    else:
+        import config
+        from utils.resume_index import ResumeIndex
+        exported = export_resume_index(ResumeIndex(config.RESUME_INDEX_PATH), args.output, format, args.row_group_size)
+        print(f"Exported {exported} resumes to {args.output}")
@@ -0,0 +1,388 @@
+# utils/resume_index.py - Searchable index of parsed resumes
+#
+# Opt-in (RESUME_INDEX_ENABLED): each successful parse is written, with the
+# extracted text, to a local SQLite database. An FTS5 table indexes the text,
+# skills, location and experience for full-text search, and plain indexes
+# cover field of work, experience level and years of experience.
+#
+# Parses only enqueue their rows; a writer thread inserts them in batches, one
+# transaction per batch, so indexing never holds up a parse response. The
+# database runs in WAL mode, so searches are not blocked by the writer and
+# several workers can share one file.
+
+import os
+import re
+import time
+import queue
+import sqlite3
+import hashlib
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    text_hash TEXT NOT NULL UNIQUE,
+    file_name TEXT,
+    indexed_at REAL NOT NULL,
+    full_name TEXT, email TEXT, phone TEXT, location TEXT, linkedin TEXT,
+    summary TEXT, skills TEXT, experience TEXT, education TEXT, projects TEXT,
+    website TEXT, blog TEXT, youtube TEXT, certifications TEXT, languages TEXT,
+    field_of_work TEXT, experience_level TEXT, years_of_experience INTEGER,
+    text TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0
+);
+-- Single-column indexes keep each value's rows in id order, so newest-first
+-- pages are read straight from the index without sorting
+CREATE INDEX IF NOT EXISTS resumes_field_of_work ON resumes (field_of_work);
+CREATE INDEX IF NOT EXISTS resumes_experience_level ON resumes (experience_level);
+CREATE INDEX IF NOT EXISTS resumes_years_of_experience ON resumes (years_of_experience);
+
+-- External-content FTS5 table: the text is stored once, in resumes
+CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+    full_name, location, skills, experience, summary, text,
+    content='resumes', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS resumes_ai AFTER INSERT ON resumes BEGIN
+    INSERT INTO resumes_fts (rowid, full_name, location, skills, experience, summary, text)
+    VALUES (new.id, new.full_name, new.location, new.skills, new.experience, new.summary, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_ad AFTER DELETE ON resumes BEGIN
+    INSERT INTO resumes_fts (resumes_fts, rowid, full_name, location, skills, experience, summary, text)
+    VALUES ('delete', old.id, old.full_name, old.location, old.skills, old.experience, old.summary, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS resumes_au AFTER UPDATE ON resumes BEGIN
+    INSERT INTO resumes_fts (resumes_fts, rowid, full_name, location, skills, experience, summary, text)
+    VALUES ('delete', old.id, old.full_name, old.location, old.skills, old.experience, old.summary, old.text);
+    INSERT INTO resumes_fts (rowid, full_name, location, skills, experience, summary, text)
+    VALUES (new.id, new.full_name, new.location, new.skills, new.experience, new.summary, new.text);
+END;
+"""
+
+# Parse result fields stored in their own columns
+INDEXED_FIELDS = (
+    "full_name", "email", "phone", "location", "linkedin", "summary", "skills",
+    "experience", "education", "projects", "website", "blog", "youtube",
+    "certifications", "languages", "field_of_work", "experience_level",
+    "years_of_experience",
+)
+
+# Columns returned for each search result
+RESULT_FIELDS = (
+    "id", "file_name", "indexed_at", "full_name", "email", "phone", "location",
+    "field_of_work", "experience_level", "years_of_experience", "skills",
+)
+
+# Index of the text column in resumes_fts, for snippets
+FTS_TEXT_COLUMN = 5
+
+MAX_PER_PAGE = 100
+
+# Matches are counted up to this many; exact counts of broad searches would
+# cost more than the page itself
+COUNT_LIMIT = 10000
+
+# Search terms: words, optionally ending in * for a prefix match
+SEARCH_TERM = re.compile(r"[\w][\w+#.-]*\*?", re.UNICODE)
+
+# Every insert or update gives the row the next revision. Writers take the
+# database's write lock, so revisions grow in commit order and readers can
+# follow changes with "revision > last seen" (ids alone miss updates)
+NEXT_REVISION = "(SELECT IFNULL(MAX(revision), 0) + 1 FROM resumes)"
+
+INSERT = (
+    f"INSERT INTO resumes (text_hash, file_name, indexed_at, {', '.join(INDEXED_FIELDS)}, text, revision) "
+    f"VALUES ({', '.join('?' * (len(INDEXED_FIELDS) + 4))}, {NEXT_REVISION}) "
+    # The same resume parsed again replaces its earlier entry
+    "ON CONFLICT (text_hash) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in ("file_name", "indexed_at") + INDEXED_FIELDS)
+    + f", revision = {NEXT_REVISION}"
+)
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+def _years(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _text(value):
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+def _phrase(term):
+    """Quote a search term as an FTS5 string, keeping a trailing * as a prefix match"""
+    prefix = term.endswith("*")
+    term = term.rstrip("*")
+    return '"' + term.replace('"', '""') + '"' + (" *" if prefix else "")
+
+def match_expression(text=None, skills=(), location=None, title=None):
+    """
+    Build an FTS5 MATCH expression from search input. Every term must match;
+    user input is always quoted so it cannot inject FTS5 query syntax.
+
+    Args:
+        text: Free text, matched anywhere in the resume
+        skills: Skills that must all appear in the skills field
+        location: Matched against the location field
+        title: Job title, matched against the work experience
+
+    Returns:
+        str: The expression, or "" when there is nothing to match
+    """
+    terms = [_phrase(term) for term in SEARCH_TERM.findall(text or "")]
+    terms.extend(f"skills : {_phrase(skill.strip())}" for skill in skills if skill.strip())
+    if location and location.strip():
+        terms.append(f"location : {_phrase(location.strip())}")
+    if title and title.strip():
+        terms.append(f"experience : {_phrase(title.strip())}")
+    return " AND ".join(terms)
+
+class ResumeIndex:
+    """
+    SQLite index of parsed resumes. add() enqueues a row for the writer
+    thread; search() queries on the calling thread.
+    """
+
+    MAX_QUEUE = 10000
+
+    def __init__(self, path, batch_size=500, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _connect(path) as connection:
+            connection.executescript(SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(resumes)")}
+            if "revision" not in columns:
+                # Indexes created before rows had revisions
+                connection.execute("ALTER TABLE resumes ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+                connection.execute("UPDATE resumes SET revision = id")
+            connection.execute("CREATE INDEX IF NOT EXISTS resumes_revision ON resumes (revision)")
+        connection.close()
+        self.queue = queue.Queue(self.MAX_QUEUE)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _row(self, fields, text, file_name):
+        values = [_text(fields.get(field)) for field in INDEXED_FIELDS]
+        values[INDEXED_FIELDS.index("years_of_experience")] = _years(fields.get("years_of_experience"))
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return (text_hash, file_name, time.time(), *values, text)
+
+    def add(self, fields, text, file_name=None):
+        """
+        Queue a parse result and its extracted text for indexing. Blocks
+        only while the queue is full, so ingestion cannot outrun the writer.
+        """
+        # Start the writer lazily, and again after a fork
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self.queue = queue.Queue(self.MAX_QUEUE)
+                    self._thread = threading.Thread(target=self._run, name="resume-index-writer", daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+        self.queue.put(self._row(fields, text, file_name))
+
+    def add_many(self, rows):
+        """Insert (fields, text, file_name) tuples directly in one transaction"""
+        connection = self._connection()
+        with connection:
+            connection.executemany(INSERT, (self._row(*row) for row in rows))
+
+    def _run(self):
+        connection = _connect(self.path)
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            rows = [row for row in batch if row is not None]
+            if rows:
+                try:
+                    with connection:
+                        connection.executemany(INSERT, rows)
+                except sqlite3.Error as e:
+                    print(f"Could not index {len(rows)} resumes: {e}")
+            if stop:
+                connection.close()
+                return
+
+    def close(self, timeout=10):
+        """Flush queued rows and stop the writer"""
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join(timeout)
+        self._pid = None
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = _connect(self.path)
+            self._local.connection = connection
+        return connection
+
+    def texts_since(self, after_id, limit=1000):
+        """(id, text) of up to `limit` resumes with ids above after_id, in id order"""
+        return self._connection().execute(
+            "SELECT id, text FROM resumes WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        ).fetchall()
+
+    def skills_since(self, after_id, limit=1000):
+        """(id, skills) of up to `limit` resumes with ids above after_id, in id order"""
+        return self._connection().execute(
+            "SELECT id, skills FROM resumes WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        ).fetchall()
+
+    def texts_changed_since(self, after_revision, limit=1000):
+        """(revision, id, text) of up to `limit` resumes added or updated after a revision, in revision order"""
+        return self._connection().execute(
+            "SELECT revision, id, text FROM resumes WHERE revision > ? ORDER BY revision LIMIT ?",
+            (after_revision, limit)
+        ).fetchall()
+
+    def skills_changed_since(self, after_revision, limit=1000):
+        """(revision, id, skills) of up to `limit` resumes added or updated after a revision, in revision order"""
+        return self._connection().execute(
+            "SELECT revision, id, skills FROM resumes WHERE revision > ? ORDER BY revision LIMIT ?",
+            (after_revision, limit)
+        ).fetchall()
+
+    def last_revision(self):
+        """The revision of the latest change to the index, 0 when empty"""
+        return self._connection().execute("SELECT IFNULL(MAX(revision), 0) FROM resumes").fetchone()[0]
+
+    def rows_since(self, after_id, columns, limit=1000):
+        """Dicts of `columns` for up to `limit` resumes with ids above after_id, in id order"""
+        unknown = set(columns) - set(INDEXED_FIELDS) - {"id", "file_name", "indexed_at", "text"}
+        if unknown:
+            raise ValueError(f"Unknown resume index columns: {', '.join(sorted(unknown))}")
+        rows = self._connection().execute(
+            f"SELECT {', '.join(columns)} FROM resumes WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+        ).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def get(self, ids):
+        """RESULT_FIELDS of the resumes with these ids, in no particular order"""
+        ids = list(ids)
+        if not ids:
+            return []
+        columns = ", ".join(RESULT_FIELDS)
+        rows = self._connection().execute(
+            f"SELECT {columns} FROM resumes WHERE id IN ({', '.join('?' * len(ids))})", ids
+        ).fetchall()
+        return [dict(zip(RESULT_FIELDS, row)) for row in rows]
+
+    def search(self, text=None, skills=(), location=None, title=None, field_of_work=None,
+               experience_level=None, min_years=None, max_years=None, sort=None, page=1, per_page=20):
+        """
+        Search indexed resumes
+
+        Args:
+            text, skills, location, title: Full-text terms (see match_expression)
+            field_of_work, experience_level: Exact values
+            min_years, max_years: Bounds on years of experience
+            sort: "relevance" (BM25, the default with free text) or "recent"
+                (newest first, the default otherwise). Relevance scores every
+                match, so its cost grows with the number of matches
+            page, per_page: 1-based page and its size (at most MAX_PER_PAGE)
+
+        Returns:
+            dict: {"total", "total_capped", "page", "per_page", "results"}.
+                "total" stops at COUNT_LIMIT, with "total_capped" set. Each
+                result holds RESULT_FIELDS, plus a "snippet" of the matching
+                text for free text searches
+        """
+        page = max(int(page), 1)
+        per_page = min(max(int(per_page), 1), MAX_PER_PAGE)
+        match = match_expression(text, skills, location, title)
+        relevance = bool(match) and (sort == "relevance" or (sort is None and bool(text and text.strip())))
+
+        filters, filter_parameters = [], []
+        if field_of_work:
+            filters.append("r.field_of_work = ?")
+            filter_parameters.append(field_of_work)
+        if experience_level:
+            filters.append("r.experience_level = ?")
+            filter_parameters.append(experience_level)
+        if min_years is not None:
+            filters.append("r.years_of_experience >= ?")
+            filter_parameters.append(int(min_years))
+        if max_years is not None:
+            filters.append("r.years_of_experience <= ?")
+            filter_parameters.append(int(max_years))
+
+        if match:
+            # CROSS JOIN keeps the FTS table as the outer loop; otherwise SQLite
+            # may scan a column index and evaluate the MATCH once per row. In
+            # rowid order FTS5 needs no sort and stops once the page is full
+            source = "resumes_fts CROSS JOIN resumes r ON r.id = resumes_fts.rowid"
+            conditions, parameters = ["resumes_fts MATCH ?"] + filters, [match] + filter_parameters
+            order = "resumes_fts.rank" if relevance else "resumes_fts.rowid DESC"
+        else:
+            source, conditions, parameters = "resumes r", filters, filter_parameters
+            order = "r.id DESC"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        columns = ", ".join(f"r.{field}" for field in RESULT_FIELDS)
+
+        connection = self._connection()
+        # Count no further than COUNT_LIMIT; without filters the FTS table
+        # alone can count matches without reading the rows
+        if match and not filters:
+            count_query = "SELECT 1 FROM resumes_fts WHERE resumes_fts MATCH ?"
+            count_parameters = [match]
+        else:
+            count_query, count_parameters = f"SELECT 1 FROM {source} {where}", parameters
+        total = connection.execute(
+            f"SELECT count(*) FROM ({count_query} LIMIT ?)", count_parameters + [COUNT_LIMIT + 1]
+        ).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT {columns} FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            parameters + [per_page, (page - 1) * per_page]
+        ).fetchall()
+        results = [dict(zip(RESULT_FIELDS, row)) for row in rows]
+
+        if text and text.strip() and results:
+            # Snippets for this page only
+            snippets = dict(connection.execute(
+                f"SELECT rowid, snippet(resumes_fts, {FTS_TEXT_COLUMN}, '[', ']', '...', 16) FROM resumes_fts "
+                f"WHERE resumes_fts MATCH ? AND rowid IN ({', '.join('?' * len(results))})",
+                [match] + [result["id"] for result in results]
+            ).fetchall())
+            for result in results:
+                result["snippet"] = snippets.get(result["id"], "")
+        return {
+            "total": min(total, COUNT_LIMIT), "total_capped": total > COUNT_LIMIT,
+            "page": page, "per_page": per_page, "results": results,
+        }
+
+_index = None
+
+def get_resume_index():
+    """The configured ResumeIndex, or None when indexing is disabled"""
+    global _index
+    import config
+    if not config.RESUME_INDEX_ENABLED:
+        return None
+    if _index is None:
+        _index = ResumeIndex(
+            config.RESUME_INDEX_PATH, config.RESUME_INDEX_BATCH_SIZE, config.RESUME_INDEX_FLUSH_SECONDS
+        )
+    return _index
@@ -0,0 +1,302 @@
+# utils/resume_layout.py - Renderer-agnostic resume layout
+#
+# Interpreting the input (splitting delimited form fields, building the
+# contact line and link lists, choosing bullets over paragraphs) happens once
+# here and produces a ResumeLayout: a flat list of typed blocks. Renderers in
+# utils/resume_renderers.py turn the same layout into DOCX, PDF or HTML.
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+# Fields that affect the rendered document. Anything else in the request
+# (e.g. the storage key of an uploaded resume) must not change the cache key.
+TEXT_FIELDS = (
+    "full_name", "email", "phone", "location", "linkedin", "github", "twitter",
+    "summary", "field_of_work", "experience_level", "years_of_experience",
+    "website", "blog", "youtube",
+)
+LIST_FIELDS = ("skills", "certifications", "languages")
+RENDERED_FIELDS = TEXT_FIELDS + LIST_FIELDS + ("experience", "education", "projects")
+
+# Keys of the structured section entries
+EXPERIENCE_KEYS = ("company", "title", "description", "highlights")
+EDUCATION_KEYS = ("degree", "institution", "year")
+PROJECT_KEYS = ("name", "description", "highlights")
+
+def _clean_text(value):
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        value = str(value)
+    return value.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+def split_list(text):
+    """Split a comma-separated form value into its non-empty items"""
+    return [item.strip() for item in _clean_text(text).split(',') if item.strip()]
+
+def _split_description(desc):
+    """A description containing semicolons becomes bullet points"""
+    if ';' in desc:
+        return "", [bullet.strip() for bullet in desc.split(';') if bullet.strip()]
+    return desc, []
+
+def parse_experience(text):
+    """Parse 'Company, Title, Point; Point | ...' into experience entries"""
+    entries = []
+    for exp in _clean_text(text).split("|"):
+        if not exp.strip():
+            continue
+        parts = exp.split(",", 2)
+        if len(parts) >= 2:
+            description, highlights = _split_description(parts[2].strip() if len(parts) > 2 else "")
+            entries.append({"company": parts[0].strip(), "title": parts[1].strip(),
+                            "description": description, "highlights": highlights})
+        else:
+            entries.append({"company": "", "title": "", "description": exp.strip(), "highlights": []})
+    return entries
+
+def parse_education(text):
+    """Parse 'Degree, Institution, Year | ...' into education entries"""
+    entries = []
+    for edu in _clean_text(text).split("|"):
+        if not edu.strip():
+            continue
+        parts = edu.split(",")
+        if len(parts) >= 2:
+            entries.append({"degree": parts[0].strip(), "institution": parts[1].strip(),
+                            "year": parts[2].strip() if len(parts) > 2 else ""})
+        else:
+            entries.append({"degree": edu.strip(), "institution": "", "year": ""})
+    return entries
+
+def parse_projects(text):
+    """Parse 'Name, Point; Point | ...' into project entries"""
+    entries = []
+    for project in _clean_text(text).split("|"):
+        if not project.strip():
+            continue
+        parts = project.split(",", 1)
+        description, highlights = _split_description(parts[1].strip() if len(parts) > 1 else "")
+        entries.append({"name": parts[0].strip(), "description": description, "highlights": highlights})
+    return entries
+
+SECTION_PARSERS = {
+    "experience": (parse_experience, EXPERIENCE_KEYS),
+    "education": (parse_education, EDUCATION_KEYS),
+    "projects": (parse_projects, PROJECT_KEYS),
+}
+
+def _normalize_entries(value, parser, keys):
+    if value is None or isinstance(value, str):
+        return parser(value)
+    entries = []
+    for entry in value:
+        if hasattr(entry, "dict"):
+            entry = entry.dict()
+        normalized = {}
+        for key in keys:
+            if key == "highlights":
+                normalized[key] = [_clean_text(h) for h in entry.get(key) or [] if _clean_text(h)]
+            else:
+                normalized[key] = _clean_text(entry.get(key))
+        entries.append(normalized)
+    return entries
+
+
+def normalize_resume_data(data):
+    """
+    Return the rendered fields in one canonical, structured form. Form
+    submissions carry delimited strings and API requests carry lists; both
+    normalize to the same value (and therefore the same cache key).
+    """
+    normalized = {}
+    for field in TEXT_FIELDS:
+        normalized[field] = _clean_text(data.get(field))
+    for field in LIST_FIELDS:
+        value = data.get(field)
+        if value is None or isinstance(value, str):
+            normalized[field] = split_list(value)
+        else:
+            normalized[field] = [_clean_text(item) for item in value if _clean_text(item)]
+    for field, (parser, keys) in SECTION_PARSERS.items():
+        normalized[field] = _normalize_entries(data.get(field), parser, keys)
+    return normalized
+
+
+# Block kinds, in the order a resume uses them
+TITLE = "title"
+SUBTITLE = "subtitle"
+CONTACT = "contact"
+RULE = "rule"
+HEADING = "heading"
+SUBHEADING = "subheading"
+META = "meta"
+PARAGRAPH = "paragraph"
+BULLET = "bullet"
+
+# Visual style of each block kind, shared by every renderer. Sizes are in
+# points, colours are RGB tuples and indents are in inches.
+STYLES = OrderedDict([
+    (TITLE, {"name": "ResumeName", "size": 24, "bold": True, "color": (0, 59, 113),
+             "space_after": 0, "align": "center"}),
+    (SUBTITLE, {"name": "ResumeJobTitle", "size": 14, "italic": True, "color": (68, 68, 68),
+                "space_after": 6, "align": "center"}),
+    (CONTACT, {"name": "ResumeContact", "size": 10, "color": (68, 68, 68),
+               "space_after": 12, "align": "center"}),
+    (HEADING, {"name": "ResumeHeading", "size": 14, "bold": True, "color": (0, 59, 113),
+               "space_before": 12, "space_after": 6}),
+    (SUBHEADING, {"name": "ResumeSubheading", "size": 12, "bold": True,
+                  "space_before": 6, "space_after": 0}),
+    (META, {"name": "ResumeDate", "size": 10, "italic": True, "color": (102, 102, 102),
+            "space_after": 3}),
+    (PARAGRAPH, {"name": "ResumeNormal", "size": 11, "space_after": 6}),
+    (BULLET, {"name": "ResumeBullet", "size": 11, "indent": 0.25, "space_after": 3}),
+])
+
+FONT = "Calibri"
+PAGE_MARGIN = 0.8
+FOOTER_TEXT = "Resume generated by Resume Kraft"
+
+# Number of layouts kept in memory for repeated renders of the same data
+LAYOUT_CACHE_SIZE = 256
+
+Block = namedtuple("Block", ["kind", "text"])
+
+class ResumeLayout:
+    """The resume as an ordered list of blocks, plus document metadata"""
+
+    def __init__(self, blocks, title="", footer=FOOTER_TEXT, fields=None):
+        self.blocks = blocks
+        self.title = title
+        self.footer = footer
+        # Plain-text value of each input field, for templates with placeholders
+        self.fields = fields or {}
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "footer": self.footer,
+            "fields": self.fields,
+            "blocks": [{"kind": block.kind, "text": block.text} for block in self.blocks],
+        }
+
+def _add_entry_details(blocks, description, highlights):
+    for bullet in highlights:
+        blocks.append(Block(BULLET, bullet))
+    if description:
+        blocks.append(Block(PARAGRAPH, description))
+
+def build_layout(data):
+    """
+    Lay out normalized resume data (see normalize_resume_data)
+
+    Returns:
+        ResumeLayout: Blocks in reading order
+    """
+    blocks = []
+    
+    # Name, field of work and experience level
+    blocks.append(Block(TITLE, data["full_name"]))
+    blocks.append(Block(SUBTITLE, f"{data['field_of_work']} - {data['experience_level']} ({data['years_of_experience']} years)"))
+    
+    # Contact information
+    contact_parts = [data[field] for field in ("email", "phone", "location") if data[field]]
+    if data["linkedin"]:
+        contact_parts.append(f"LinkedIn: {data['linkedin']}")
+    blocks.append(Block(CONTACT, ' | '.join(contact_parts)))
+    
+    # Other social media links if available
+    social_links = []
+    if data["github"]:
+        social_links.append(f"GitHub: {data['github']}")
+    if data["website"]:
+        social_links.append(f"Website: {data['website']}")
+    if data["twitter"]:
+        social_links.append(f"Twitter: {data['twitter']}")
+    if social_links:
+        blocks.append(Block(CONTACT, ' | '.join(social_links)))
+    
+    blocks.append(Block(RULE, ""))
+    
+    blocks.append(Block(HEADING, "PROFESSIONAL SUMMARY"))
+    blocks.append(Block(PARAGRAPH, data["summary"]))
+    
+    blocks.append(Block(HEADING, "SKILLS"))
+    blocks.extend(Block(BULLET, skill) for skill in data["skills"])
+    
+    blocks.append(Block(HEADING, "WORK EXPERIENCE"))
+    for exp in data["experience"]:
+        if exp["company"] or exp["title"]:
+            blocks.append(Block(SUBHEADING, exp["company"]))
+            blocks.append(Block(META, exp["title"]))
+        _add_entry_details(blocks, exp["description"], exp["highlights"])
+    
+    blocks.append(Block(HEADING, "EDUCATION"))
+    for edu in data["education"]:
+        if edu["institution"]:
+            blocks.append(Block(SUBHEADING, edu["institution"]))
+            blocks.append(Block(PARAGRAPH, edu["degree"]))
+            if edu["year"]:
+                blocks.append(Block(META, f"Graduation: {edu['year']}"))
+        elif edu["degree"]:
+            blocks.append(Block(PARAGRAPH, edu["degree"]))
+    
+    if data["projects"]:
+        blocks.append(Block(HEADING, "PROJECTS"))
+        for project in data["projects"]:
+            blocks.append(Block(SUBHEADING, project["name"]))
+            _add_entry_details(blocks, project["description"], project["highlights"])
+    
+    online_links = []
+    if data["website"]:
+        online_links.append(f"Personal Website: {data['website']}")
+    if data["blog"]:
+        online_links.append(f"Blog: {data['blog']}")
+    if data["youtube"]:
+        online_links.append(f"YouTube Channel: {data['youtube']}")
+    if data["github"]:
+        online_links.append(f"GitHub: {data['github']}")
+    if online_links:
+        blocks.append(Block(HEADING, "ONLINE PRESENCE"))
+        blocks.extend(Block(BULLET, link) for link in online_links)
+    
+    if data["certifications"]:
+        blocks.append(Block(HEADING, "CERTIFICATIONS"))
+        blocks.extend(Block(BULLET, cert) for cert in data["certifications"])
+    
+    if data["languages"]:
+        blocks.append(Block(HEADING, "LANGUAGES"))
+        blocks.extend(Block(BULLET, lang) for lang in data["languages"])
+    
+    fields = {field: data[field] for field in TEXT_FIELDS}
+    fields.update((field, ", ".join(data[field])) for field in LIST_FIELDS)
+    return ResumeLayout(blocks, title=data["full_name"], fields=fields)
+
+def layout_key(normalized):
+    """Hash identifying the layout of normalized data"""
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+_layout_cache = OrderedDict()
+_layout_lock = threading.Lock()
+
+def get_layout(data):
+    """
+    Normalize and lay out resume data, reusing the layout of identical data
+    from a bounded in-memory LRU cache. Layouts are treated as immutable.
+    """
+    normalized = normalize_resume_data(data)
+    key = layout_key(normalized)
+    with _layout_lock:
+        layout = _layout_cache.get(key)
+        if layout is not None:
+            _layout_cache.move_to_end(key)
+            return layout
+    layout = build_layout(normalized)
+    with _layout_lock:
+        _layout_cache[key] = layout
+        while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    return layout
@@ -1,113 +1,210 @@
 import os
 import re
-import docx
 import io
+import time
+import hashlib
+import importlib.util
+from utils.metrics import record_parse
+from utils.tracing import traced, current_span, span
 
-# Add PDF parsing capability
-try:
-    from pdfminer.high_level import extract_text as extract_text_from_pdf
-    PDF_SUPPORT = True
-except ImportError:
-    PDF_SUPPORT = False
-    print("PDF parsing not available. Install pdfminer.six for PDF support.")
+# PDF parsing capability is discovered on first use so that importing this
+# module does not pull in pdfminer.six
+_pdf_support = None
 
+def has_pdf_support():
+    """Check (once) whether pdfminer.six is installed"""
+    global _pdf_support
+    if _pdf_support is None:
+        _pdf_support = importlib.util.find_spec("pdfminer") is not None
+        if not _pdf_support:
+            print("PDF parsing not available. Install pdfminer.six for PDF support.")
+    return _pdf_support
 
-def parse_resume(file_path):
+@traced("extract_text.pdf")
+def extract_text_from_pdf(file_path):
+    """Extract text from a PDF file, importing pdfminer on first use"""
+    from pdfminer.high_level import extract_text
+    text = extract_text(file_path)
+    # pdfminer ends every page with a form feed
+    current_span().set_attributes(page_count=text.count("\f"), text_length=len(text))
+    return text
+
+
+@traced("extract_text.pdf_first_page")
+def extract_first_page_from_pdf(file_path):
+    """Extract the text of a PDF's first page, where contact details usually are"""
+    from pdfminer.high_level import extract_text
+    return extract_text(file_path, maxpages=1)
+
+# Fields of a parse result, in the order parse_resume returns them
+PARSED_FIELDS = (
+    "full_name", "email", "phone", "location", "linkedin", "summary", "skills",
+    "experience", "education", "projects", "website", "blog", "youtube",
+    "certifications", "languages", "field_of_work", "experience_level",
+    "years_of_experience",
+)
+
+# Cheap fields that can be read from the first page alone
+CONTACT_EXTRACTORS = (
+    ("full_name", lambda text: extract_name(text)),
+    ("email", lambda text: extract_email(text)),
+    ("phone", lambda text: extract_phone(text)),
+    ("linkedin", lambda text: extract_linkedin(text)),
+)
+
+# The remaining single-field extractors, cheapest first so results stream out
+# early; experience, the slowest, comes last. Extractors that only read one
+# section of the text go through the ParseCache, so they only run again when
+# that section changed
+SECTION_EXTRACTORS = (
+    ("location", lambda text, cache: extract_location(text)),
+    ("summary", lambda text, cache: extract_summary(text)),
+    ("website", lambda text, cache: extract_website(text)),
+    ("blog", lambda text, cache: extract_blog(text)),
+    ("youtube", lambda text, cache: extract_youtube(text)),
+    ("languages", lambda text, cache: cache.get("languages", languages_section(text), parse_languages_section)),
+    ("certifications", lambda text, cache: (
+        cache.get("certifications", certifications_section(text), parse_certifications_section)
+        or common_certification(text)
+    )),
+    ("education", lambda text, cache: cache.get("education", education_section(text), parse_education_section)),
+    ("projects", lambda text, cache: cache.get("projects", projects_section(text), parse_projects_section)),
+    ("experience", lambda text, cache: cache.get("experience", experience_section(text), parse_experience_section)),
+)
+
+def iter_parse_resume(file_path, on_parsed=None, cache=None):
+    """
+    Parse a resume progressively
+
+    Yields dicts of newly extracted fields as soon as each is known: for a
+    PDF the contact fields of the first page come first, before the rest of
+    the document has been read. A field may be yielded again with a better
+    value once the full text is available. On failure a single
+    {"error": message} is yielded instead.
+
+    Args:
+        file_path: Path to the resume file
+        on_parsed: Called as on_parsed(fields, text) after a successful parse
+        cache: ParseCache of a previous revision of the same resume, updated
+            to this one after a successful parse
+    """
+    start = time.perf_counter()
+    cache = ParseCache() if cache is None else cache
+    lower_path = file_path.lower()
+    if lower_path.endswith('.pdf') and not has_pdf_support():
+        yield {"error": "PDF parsing requires pdfminer.six library. Please install it or use DOCX format."}
+        return
+    if not lower_path.endswith(('.docx', '.pdf')):
+        yield {"error": "Unsupported file format. Please use DOCX or PDF."}
+        return
+    
+    contact = {}
+    if lower_path.endswith('.pdf'):
+        first_page = extract_first_page_from_pdf(file_path)
+        if first_page and first_page.strip():
+            contact = {field: extractor(first_page) for field, extractor in CONTACT_EXTRACTORS}
+            yield dict(contact)
+        text = extract_text_from_pdf(file_path)
+    else:
+        text = extract_text_from_docx(file_path)
+    
+    # Check if text extraction was successful
+    if not text or len(text.strip()) < 10:
+        yield {"error": "Could not extract text from the file. Please check the file format or content."}
+        return
+    
+    # Contact fields again from the whole text, sending only what changed
+    update = {}
+    for field, extractor in CONTACT_EXTRACTORS:
+        value = extractor(text)
+        if field not in contact or contact[field] != value:
+            update[field] = value
+    if update:
+        yield update
+    
+    parsed = dict(contact, **update)
+    
+    # Skills, field of work and experience level come from keyword matches
+    # counted per section; skills first as they help determine field of work
+    features = document_features(text, cache)
+    skills = ", ".join(features["skills"])
+    parsed.update(skills=skills, field_of_work=field_of_work(features["titles"], features["fields"], skills))
+    yield {"skills": skills, "field_of_work": parsed["field_of_work"]}
+    
+    years = years_of_experience(text)
+    parsed.update(
+        experience_level=experience_level(years, features["levels"]),
+        years_of_experience=str(years) if years is not None else "",
+    )
+    yield {"experience_level": parsed["experience_level"], "years_of_experience": parsed["years_of_experience"]}
+    
+    for field, extractor in SECTION_EXTRACTORS:
+        parsed[field] = extractor(text, cache)
+        yield {field: parsed[field]}
+    
+    cache.finish()
+    if on_parsed is not None:
+        on_parsed(parsed, text)
+    record_parse(file_path, time.perf_counter() - start, len(text))
+    parse_span = current_span()
+    if parse_span is not None:
+        parse_span.set_attributes(
+            file_type=os.path.splitext(file_path)[1].lstrip('.').lower(), text_length=len(text),
+            cache_hits=cache.hits, cache_misses=cache.misses,
+        )
+
+@traced()
+def parse_resume(file_path, on_parsed=None, cache=None):
     """
     Resume parser that extracts text from DOCX and PDF files
     
     Args:
         file_path: Path to the resume file
+        on_parsed: Called as on_parsed(fields, text) after a successful parse
+        cache: ParseCache of a previous revision of the same resume, updated
+            to this one after a successful parse
         
     Returns:
         dict: Extracted information from the resume
     """
     try:
-        # Extract text based on file type
-        if file_path.lower().endswith('.docx'):
-            text = extract_text_from_docx(file_path)
-        elif file_path.lower().endswith('.pdf') and PDF_SUPPORT:
-            text = extract_text_from_pdf(file_path)
-        elif file_path.lower().endswith('.pdf'):
-            # PDF support not available
-            return {"error": "PDF parsing requires pdfminer.six library. Please install it or use DOCX format."}
-        else:
-            # Unsupported format
-            return {"error": "Unsupported file format. Please use DOCX or PDF."}
-        
-        # Check if text extraction was successful
-        if not text or len(text.strip()) < 10:
-            return {"error": "Could not extract text from the file. Please check the file format or content."}
-        
-        # Extract basic information using regex patterns
-        email = extract_email(text)
-        phone = extract_phone(text)
-        
-        # Extract skills first as they help determine field of work
-        skills = extract_skills(text)
-        
-        # Try to guess field of work using both text and skills
-        field_of_work = extract_field_of_work(text, skills)
-        
-        # Extract experience information
-        experience_level, years_of_experience = extract_experience_info(text)
-        
-        # Extract work experience
-        experience = extract_experience(text)
-        
-        # Create a simple data structure
-        # Extract social media and website links
-        linkedin = extract_linkedin(text)
-        website = extract_website(text)
-        blog = extract_blog(text)
-        youtube = extract_youtube(text)
-        
-        data = {
-            "full_name": extract_name(text),
-            "email": email,
-            "phone": phone,
-            "location": extract_location(text),
-            "linkedin": linkedin,
-            "summary": extract_summary(text),
-            "skills": skills,
-            "experience": experience,
-            "education": extract_education(text),
-            "projects": extract_projects(text),
-            "website": website,
-            "blog": blog,
-            "youtube": youtube,
-            "certifications": extract_certifications(text),
-            "languages": extract_languages(text),
-            "field_of_work": field_of_work,
-            "experience_level": experience_level,
-            "years_of_experience": years_of_experience
-        }
-        
-        return data
+        data = {}
+        for update in iter_parse_resume(file_path, on_parsed, cache):
+            if "error" in update:
+                return update
+            data.update(update)
+        return {field: data[field] for field in PARSED_FIELDS}
     except Exception as e:
         print(f"Error parsing resume: {e}")
         return {}
 
+@traced("extract_text.docx")
 def extract_text_from_docx(file_path):
     """Extract text from a DOCX file"""
+    import docx
     doc = docx.Document(file_path)
     full_text = []
     for para in doc.paragraphs:
         full_text.append(para.text)
-    return '\n'.join(full_text)
+    text = '\n'.join(full_text)
+    current_span().set_attributes(paragraph_count=len(doc.paragraphs), text_length=len(text))
+    return text
 
+@traced()
 def extract_email(text):
     """Extract email using regex"""
     email_pattern = r'[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}'
     match = re.search(email_pattern, text)
     return match.group(0) if match else ""
 
+@traced()
 def extract_phone(text):
     """Extract phone number using regex"""
     phone_pattern = r'(\+\d{1,3}[- ]?)?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{4}'
     match = re.search(phone_pattern, text)
     return match.group(0) if match else ""
 
+@traced()
 def extract_summary(text):
     """Extract a potential summary (first paragraph with substantial text)"""
     paragraphs = text.split('\n')
@@ -116,6 +213,7 @@ def extract_summary(text):
             return para
     return ""
 
+@traced()
 def extract_name(text):
     """Extract a potential name from the resume"""
     # Look for patterns like "Name: John Doe" or just a name at the beginning
@@ -149,6 +247,7 @@ def extract_name(text):
             
     return ""
 
+@traced()
 def extract_location(text):
     """Extract location information"""
     # Look for common location patterns
@@ -182,26 +281,28 @@ def extract_location(text):
     
     return ""
 
+# Skills extract_skills looks for, matched as whole words
+COMMON_SKILLS = [
+    "Python", "JavaScript", "Java", "C++", "C#", "Ruby", "PHP", "Swift", 
+    "React", "Angular", "Vue", "Node.js", "Django", "Flask", "Spring", 
+    "SQL", "MongoDB", "AWS", "Azure", "Docker", "Kubernetes", "Git",
+    "HTML", "CSS", "TypeScript", "REST API", "GraphQL", "Redux", "Express",
+    "TensorFlow", "PyTorch", "Machine Learning", "Data Science", "Agile",
+    "Scrum", "DevOps", "CI/CD", "Testing", "Debugging", "Problem Solving"
+]
+
+@traced()
 def extract_skills(text):
     """Extract potential skills based on common tech keywords"""
-    common_skills = [
-        "Python", "JavaScript", "Java", "C++", "C#", "Ruby", "PHP", "Swift", 
-        "React", "Angular", "Vue", "Node.js", "Django", "Flask", "Spring", 
-        "SQL", "MongoDB", "AWS", "Azure", "Docker", "Kubernetes", "Git",
-        "HTML", "CSS", "TypeScript", "REST API", "GraphQL", "Redux", "Express",
-        "TensorFlow", "PyTorch", "Machine Learning", "Data Science", "Agile",
-        "Scrum", "DevOps", "CI/CD", "Testing", "Debugging", "Problem Solving"
-    ]
-    
-    found_skills = []
-    for skill in common_skills:
-        if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
-            found_skills.append(skill)
-    
-    return ", ".join(found_skills)
+    return ", ".join(skills_found(text))
 
+@traced()
 def extract_experience(text):
     """Extract work experience information"""
+    return parse_experience_section(experience_section(text))
+
+def experience_section(text):
+    """The part of the text extract_experience reads: the work experience section, or the whole text"""
     # Look for sections that might contain work experience
     exp_section_patterns = [
         r'(?:work\s*experience|employment|professional\s*experience).*?(?=education|skills|projects|$)',
@@ -218,7 +319,10 @@ def extract_experience(text):
     
     if not exp_text:  # If no section found, use the whole text
         exp_text = text
-    
+    return exp_text
+
+def parse_experience_section(exp_text):
+    """Extract work experience entries from experience_section()"""
     # Try to find company-position pairs
     # Look for patterns like "Company Name - Position" or "Position at Company Name"
     company_position_patterns = [
@@ -237,7 +341,7 @@ def extract_experience(text):
     ]
     
     # Extract bullet points or descriptions
-    description_pattern = r'(?:•|-|\*)\s*([^\n•-\*]+)'  # Bullet points
+    description_pattern = r'(?:•|-|\*)\s*([^\n•\-\*]+)'  # Bullet points
     descriptions = re.findall(description_pattern, exp_text)
     
     experiences = []
@@ -301,8 +405,13 @@ def extract_experience(text):
     
     return ""
 
+@traced()
 def extract_education(text):
     """Extract education information"""
+    return parse_education_section(education_section(text))
+
+def education_section(text):
+    """The part of the text extract_education reads: the education section, or the whole text"""
     # Look for sections that might contain education
     edu_section_patterns = [
         r'(?:education|academic|qualification).*?(?=experience|skills|projects|$)',
@@ -319,7 +428,10 @@ def extract_education(text):
     
     if not edu_text:  # If no section found, use the whole text
         edu_text = text
-    
+    return edu_text
+
+def parse_education_section(edu_text):
+    """Extract education entries from education_section()"""
     # Try to extract degree and institution with more comprehensive patterns
     degree_patterns = [
         r'(Bachelor|Master|PhD|Doctorate|B\.S\.|M\.S\.|B\.A\.|M\.A\.|B\.E\.|M\.E\.|B\.Tech|M\.Tech|B\.Sc|M\.Sc|B\.Com|M\.Com|B\.B\.A|M\.B\.A)[^\n]*',
@@ -409,8 +521,13 @@ def extract_education(text):
     
     return ""
 
+@traced()
 def extract_projects(text):
     """Extract project information"""
+    return parse_projects_section(projects_section(text))
+
+def projects_section(text):
+    """The part of the text extract_projects reads: the projects section, or "" if there is none"""
     # Look for sections that might contain projects
     proj_section_patterns = [
         r'(?:projects|personal\s*projects).*?(?=experience|education|skills|$)',
@@ -424,7 +541,10 @@ def extract_projects(text):
         if proj_section_match:
             proj_text = proj_section_match.group(0)
             break
-    
+    return proj_text
+
+def parse_projects_section(proj_text):
+    """Extract project entries from projects_section()"""
     if not proj_text:  # If no section found, return empty
         return ""
     
@@ -462,8 +582,13 @@ def extract_projects(text):
     
     return ""
 
+@traced()
 def extract_certifications(text):
     """Extract certification information"""
+    return parse_certifications_section(certifications_section(text)) or common_certification(text)
+
+def certifications_section(text):
+    """The part of the text extract_certifications reads: the certifications section, or the whole text"""
     # Look for sections that might contain certifications
     cert_section_patterns = [
         r'(?:certifications|certificates|qualifications).*?(?=experience|education|skills|projects|$)',
@@ -480,7 +605,10 @@ def extract_certifications(text):
     
     if not cert_text:  # If no section found, search the whole text
         cert_text = text
-    
+    return cert_text
+
+def parse_certifications_section(cert_text):
+    """Extract certification names from certifications_section()"""
     # Try to extract certification names with more comprehensive patterns
     cert_patterns = [
         r'([A-Za-z][A-Za-z0-9\s\-]+(?:Certification|Certificate|Certified))',  # Standard certification format
@@ -511,8 +639,10 @@ def extract_certifications(text):
     # If we found certifications, join them with commas
     if filtered_certs:
         return ", ".join(filtered_certs)
-    
-    # If no certifications found, look for common certification keywords
+    return ""
+
+def common_certification(text):
+    """Common certification whose issuer the text mentions, for resumes without certification names"""
     common_certs = [
         "AWS Certified Solutions Architect",
         "Microsoft Certified Professional",
@@ -532,8 +662,19 @@ def extract_certifications(text):
     
     return ""
 
+@traced()
 def extract_languages(text):
     """Extract language information"""
+    return parse_languages_section(languages_section(text))
+
+def languages_section(text):
+    """The part of the text extract_languages reads: the languages section, or the whole text"""
+    lang_section_pattern = r'(?:languages?|linguistic skills|communication skills).*?(?=skills|experience|education|$)'
+    lang_section_match = re.search(lang_section_pattern, text, re.IGNORECASE | re.DOTALL)
+    return lang_section_match.group(0) if lang_section_match else text
+
+def parse_languages_section(lang_text):
+    """Extract the languages named in languages_section()"""
     # Common languages with context patterns
     language_patterns = {
         "English": [r'(?:speak|know|fluent|native|proficient|advanced|intermediate|basic)\s+(?:in\s+)?English', r'English\s+(?:speaker|language|proficiency|skills?)', r'Languages?[^.]*?English'],
@@ -549,12 +690,6 @@ def extract_languages(text):
         "Hindi": [r'(?:speak|know|fluent|native|proficient|advanced|intermediate|basic)\s+(?:in\s+)?Hindi', r'Hindi\s+(?:speaker|language|proficiency|skills?)', r'Languages?[^.]*?Hindi']
     }
     
-    # Look for language section
-    lang_section_pattern = r'(?:languages?|linguistic skills|communication skills).*?(?=skills|experience|education|$)'
-    lang_section_match = re.search(lang_section_pattern, text, re.IGNORECASE | re.DOTALL)
-    
-    lang_text = lang_section_match.group(0) if lang_section_match else text
-    
     found_languages = []
     for lang, patterns in language_patterns.items():
         for pattern in patterns:
@@ -566,82 +701,96 @@ def extract_languages(text):
         return ", ".join(found_languages)
     return ""
 
+# Keyword patterns for each field of work, also the field vocabulary of
+# utils/resume_ranking.py
+FIELD_PATTERNS = {
+    "Frontend Developer": [r'front[\s\-]?end', r'UI', r'React', r'Angular', r'Vue', r'HTML', r'CSS', r'JavaScript', r'web\s*developer', r'front[\s\-]?end\s*developer', r'UI\s*developer', r'client[\s\-]?side', r'responsive', r'web\s*design'],
+    "Backend Developer": [r'back[\s\-]?end', r'server', r'API', r'database', r'Django', r'Flask', r'Express', r'Node\.js', r'back[\s\-]?end\s*developer', r'server[\s\-]?side', r'PHP', r'Ruby', r'Java\s*developer', r'Python\s*developer', r'SQL', r'NoSQL'],
+    "Full-Stack Developer": [r'full[\s\-]?stack', r'front[\s\-]?end.*back[\s\-]?end', r'back[\s\-]?end.*front[\s\-]?end', r'full[\s\-]?stack\s*developer', r'MERN', r'MEAN', r'end[\s\-]?to[\s\-]?end', r'client.*server', r'server.*client'],
+    "DevOps Engineer": [r'DevOps', r'CI/CD', r'Docker', r'Kubernetes', r'AWS', r'Azure', r'cloud', r'infrastructure', r'deployment', r'automation', r'Jenkins', r'GitLab\s*CI', r'GitHub\s*Actions', r'Terraform', r'Ansible', r'configuration\s*management'],
+    "Data Scientist": [r'data\s*scien', r'machine\s*learning', r'AI', r'analytics', r'statistics', r'Python', r'R', r'data\s*analysis', r'big\s*data', r'data\s*mining', r'data\s*visualization', r'predictive\s*modeling', r'statistical\s*analysis', r'pandas', r'numpy'],
+    "Machine Learning Engineer": [r'machine\s*learning', r'deep\s*learning', r'neural\s*network', r'TensorFlow', r'PyTorch', r'ML\s*engineer', r'AI\s*engineer', r'computer\s*vision', r'NLP', r'natural\s*language\s*processing', r'reinforcement\s*learning', r'supervised\s*learning', r'unsupervised\s*learning'],
+    "UI/UX Designer": [r'UI', r'UX', r'design', r'user\s*experience', r'user\s*interface', r'Figma', r'Sketch', r'Adobe\s*XD', r'wireframe', r'prototype', r'usability', r'interaction\s*design', r'visual\s*design', r'user\s*research', r'user\s*testing'],
+    "Product Manager": [r'product\s*manag', r'product\s*owner', r'scrum', r'agile', r'roadmap', r'stakeholder', r'product\s*development', r'product\s*strategy', r'user\s*stories', r'backlog', r'sprint', r'market\s*research', r'customer\s*feedback', r'product\s*requirements'],
+    "QA Engineer": [r'QA', r'quality\s*assurance', r'testing', r'test\s*automation', r'Selenium', r'QA\s*engineer', r'test\s*engineer', r'software\s*tester', r'manual\s*testing', r'automated\s*testing', r'test\s*cases', r'test\s*plans', r'regression\s*testing', r'functional\s*testing', r'performance\s*testing']
+}
+
+# Skill sets for each field
+FIELD_SKILLS = {
+    "Frontend Developer": ["HTML", "CSS", "JavaScript", "React", "Angular", "Vue", "TypeScript", "SASS", "LESS", "Bootstrap", "jQuery", "Responsive Design", "Web Design", "UI", "UX", "Webpack", "Babel"],
+    "Backend Developer": ["Python", "Java", "C#", "PHP", "Ruby", "Node.js", "Express", "Django", "Flask", "Spring", "Laravel", "SQL", "MySQL", "PostgreSQL", "MongoDB", "API", "REST", "GraphQL", "Microservices"],
+    "Full-Stack Developer": ["JavaScript", "TypeScript", "Python", "Java", "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask", "Spring", "SQL", "NoSQL", "REST API", "GraphQL", "MERN", "MEAN", "Full Stack"],
+    "DevOps Engineer": ["Docker", "Kubernetes", "AWS", "Azure", "GCP", "CI/CD", "Jenkins", "GitLab CI", "GitHub Actions", "Terraform", "Ansible", "Puppet", "Chef", "Linux", "Shell Scripting", "Monitoring", "Logging", "Cloud"],
+    "Data Scientist": ["Python", "R", "SQL", "Pandas", "NumPy", "SciPy", "Scikit-learn", "TensorFlow", "PyTorch", "Statistics", "Data Analysis", "Data Visualization", "Machine Learning", "Big Data", "Hadoop", "Spark", "Tableau", "Power BI"],
+    "Machine Learning Engineer": ["Python", "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "Deep Learning", "Neural Networks", "NLP", "Computer Vision", "Reinforcement Learning", "MLOps", "Feature Engineering", "Model Deployment", "AI"],
+    "UI/UX Designer": ["Figma", "Sketch", "Adobe XD", "Photoshop", "Illustrator", "InVision", "Wireframing", "Prototyping", "User Research", "Usability Testing", "Interaction Design", "Visual Design", "UI", "UX", "Design Systems"],
+    "Product Manager": ["Agile", "Scrum", "Kanban", "Jira", "Confluence", "Product Strategy", "Roadmapping", "User Stories", "Market Research", "Competitive Analysis", "Stakeholder Management", "Product Development", "Product Launch"],
+    "QA Engineer": ["Selenium", "Cypress", "Jest", "Mocha", "JUnit", "TestNG", "Manual Testing", "Automated Testing", "Test Plans", "Test Cases", "Bug Tracking", "JIRA", "QA", "Quality Assurance", "Regression Testing"]
+}
+
+# Explicit job titles for each field
+JOB_TITLE_PATTERNS = {
+    "Frontend Developer": [r'front[\s\-]?end\s*developer', r'UI\s*developer', r'JavaScript\s*developer', r'React\s*developer', r'Angular\s*developer', r'Vue\s*developer'],
+    "Backend Developer": [r'back[\s\-]?end\s*developer', r'server[\s\-]?side\s*developer', r'API\s*developer', r'Python\s*developer', r'Java\s*developer', r'PHP\s*developer', r'Ruby\s*developer', r'Node\.js\s*developer'],
+    "Full-Stack Developer": [r'full[\s\-]?stack\s*developer', r'full[\s\-]?stack\s*engineer', r'software\s*engineer', r'web\s*developer'],
+    "DevOps Engineer": [r'DevOps\s*engineer', r'cloud\s*engineer', r'infrastructure\s*engineer', r'site\s*reliability\s*engineer', r'SRE', r'platform\s*engineer'],
+    "Data Scientist": [r'data\s*scientist', r'data\s*analyst', r'analytics\s*specialist', r'business\s*intelligence', r'BI\s*developer', r'data\s*engineer'],
+    "Machine Learning Engineer": [r'machine\s*learning\s*engineer', r'ML\s*engineer', r'AI\s*engineer', r'deep\s*learning\s*specialist', r'NLP\s*engineer', r'computer\s*vision\s*engineer'],
+    "UI/UX Designer": [r'UI\s*designer', r'UX\s*designer', r'UI/UX\s*designer', r'product\s*designer', r'interaction\s*designer', r'visual\s*designer', r'web\s*designer'],
+    "Product Manager": [r'product\s*manager', r'product\s*owner', r'program\s*manager', r'project\s*manager', r'scrum\s*master', r'agile\s*coach'],
+    "QA Engineer": [r'QA\s*engineer', r'test\s*engineer', r'quality\s*assurance\s*engineer', r'software\s*tester', r'test\s*automation\s*engineer', r'SDET']
+}
+
+def skills_found(text):
+    """COMMON_SKILLS the text mentions, in COMMON_SKILLS order"""
+    return [skill for skill in COMMON_SKILLS if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE)]
+
+def job_title_fields(text):
+    """Fields whose JOB_TITLE_PATTERNS the text matches, in JOB_TITLE_PATTERNS order"""
+    return [field for field, patterns in JOB_TITLE_PATTERNS.items()
+            if any(re.search(pattern, text, re.IGNORECASE) for pattern in patterns)]
+
+def keyword_counts(text, patterns_by_key):
+    """Number of matches of each key's patterns in the text, leaving out keys without any"""
+    counts = {}
+    for key, patterns in patterns_by_key.items():
+        count = sum(len(re.findall(pattern, text, re.IGNORECASE)) for pattern in patterns)
+        if count:
+            counts[key] = count
+    return counts
+
+@traced()
 def extract_field_of_work(text, skills_text=""):
     """Try to determine the field of work using both resume text and extracted skills"""
-    # Define patterns for different fields with more comprehensive keywords
-    field_patterns = {
-        "Frontend Developer": [r'front[\s\-]?end', r'UI', r'React', r'Angular', r'Vue', r'HTML', r'CSS', r'JavaScript', r'web\s*developer', r'front[\s\-]?end\s*developer', r'UI\s*developer', r'client[\s\-]?side', r'responsive', r'web\s*design'],
-        "Backend Developer": [r'back[\s\-]?end', r'server', r'API', r'database', r'Django', r'Flask', r'Express', r'Node\.js', r'back[\s\-]?end\s*developer', r'server[\s\-]?side', r'PHP', r'Ruby', r'Java\s*developer', r'Python\s*developer', r'SQL', r'NoSQL'],
-        "Full-Stack Developer": [r'full[\s\-]?stack', r'front[\s\-]?end.*back[\s\-]?end', r'back[\s\-]?end.*front[\s\-]?end', r'full[\s\-]?stack\s*developer', r'MERN', r'MEAN', r'end[\s\-]?to[\s\-]?end', r'client.*server', r'server.*client'],
-        "DevOps Engineer": [r'DevOps', r'CI/CD', r'Docker', r'Kubernetes', r'AWS', r'Azure', r'cloud', r'infrastructure', r'deployment', r'automation', r'Jenkins', r'GitLab\s*CI', r'GitHub\s*Actions', r'Terraform', r'Ansible', r'configuration\s*management'],
-        "Data Scientist": [r'data\s*scien', r'machine\s*learning', r'AI', r'analytics', r'statistics', r'Python', r'R', r'data\s*analysis', r'big\s*data', r'data\s*mining', r'data\s*visualization', r'predictive\s*modeling', r'statistical\s*analysis', r'pandas', r'numpy'],
-        "Machine Learning Engineer": [r'machine\s*learning', r'deep\s*learning', r'neural\s*network', r'TensorFlow', r'PyTorch', r'ML\s*engineer', r'AI\s*engineer', r'computer\s*vision', r'NLP', r'natural\s*language\s*processing', r'reinforcement\s*learning', r'supervised\s*learning', r'unsupervised\s*learning'],
-        "UI/UX Designer": [r'UI', r'UX', r'design', r'user\s*experience', r'user\s*interface', r'Figma', r'Sketch', r'Adobe\s*XD', r'wireframe', r'prototype', r'usability', r'interaction\s*design', r'visual\s*design', r'user\s*research', r'user\s*testing'],
-        "Product Manager": [r'product\s*manag', r'product\s*owner', r'scrum', r'agile', r'roadmap', r'stakeholder', r'product\s*development', r'product\s*strategy', r'user\s*stories', r'backlog', r'sprint', r'market\s*research', r'customer\s*feedback', r'product\s*requirements'],
-        "QA Engineer": [r'QA', r'quality\s*assurance', r'testing', r'test\s*automation', r'Selenium', r'QA\s*engineer', r'test\s*engineer', r'software\s*tester', r'manual\s*testing', r'automated\s*testing', r'test\s*cases', r'test\s*plans', r'regression\s*testing', r'functional\s*testing', r'performance\s*testing']
-    }
-    
-    # Define skill sets for each field
-    field_skills = {
-        "Frontend Developer": ["HTML", "CSS", "JavaScript", "React", "Angular", "Vue", "TypeScript", "SASS", "LESS", "Bootstrap", "jQuery", "Responsive Design", "Web Design", "UI", "UX", "Webpack", "Babel"],
-        "Backend Developer": ["Python", "Java", "C#", "PHP", "Ruby", "Node.js", "Express", "Django", "Flask", "Spring", "Laravel", "SQL", "MySQL", "PostgreSQL", "MongoDB", "API", "REST", "GraphQL", "Microservices"],
-        "Full-Stack Developer": ["JavaScript", "TypeScript", "Python", "Java", "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask", "Spring", "SQL", "NoSQL", "REST API", "GraphQL", "MERN", "MEAN", "Full Stack"],
-        "DevOps Engineer": ["Docker", "Kubernetes", "AWS", "Azure", "GCP", "CI/CD", "Jenkins", "GitLab CI", "GitHub Actions", "Terraform", "Ansible", "Puppet", "Chef", "Linux", "Shell Scripting", "Monitoring", "Logging", "Cloud"],
-        "Data Scientist": ["Python", "R", "SQL", "Pandas", "NumPy", "SciPy", "Scikit-learn", "TensorFlow", "PyTorch", "Statistics", "Data Analysis", "Data Visualization", "Machine Learning", "Big Data", "Hadoop", "Spark", "Tableau", "Power BI"],
-        "Machine Learning Engineer": ["Python", "TensorFlow", "PyTorch", "Keras", "Scikit-learn", "Deep Learning", "Neural Networks", "NLP", "Computer Vision", "Reinforcement Learning", "MLOps", "Feature Engineering", "Model Deployment", "AI"],
-        "UI/UX Designer": ["Figma", "Sketch", "Adobe XD", "Photoshop", "Illustrator", "InVision", "Wireframing", "Prototyping", "User Research", "Usability Testing", "Interaction Design", "Visual Design", "UI", "UX", "Design Systems"],
-        "Product Manager": ["Agile", "Scrum", "Kanban", "Jira", "Confluence", "Product Strategy", "Roadmapping", "User Stories", "Market Research", "Competitive Analysis", "Stakeholder Management", "Product Development", "Product Launch"],
-        "QA Engineer": ["Selenium", "Cypress", "Jest", "Mocha", "JUnit", "TestNG", "Manual Testing", "Automated Testing", "Test Plans", "Test Cases", "Bug Tracking", "JIRA", "QA", "Quality Assurance", "Regression Testing"]
-    }
-    
-    # Look for explicit job titles first
-    job_title_patterns = {
-        "Frontend Developer": [r'front[\s\-]?end\s*developer', r'UI\s*developer', r'JavaScript\s*developer', r'React\s*developer', r'Angular\s*developer', r'Vue\s*developer'],
-        "Backend Developer": [r'back[\s\-]?end\s*developer', r'server[\s\-]?side\s*developer', r'API\s*developer', r'Python\s*developer', r'Java\s*developer', r'PHP\s*developer', r'Ruby\s*developer', r'Node\.js\s*developer'],
-        "Full-Stack Developer": [r'full[\s\-]?stack\s*developer', r'full[\s\-]?stack\s*engineer', r'software\s*engineer', r'web\s*developer'],
-        "DevOps Engineer": [r'DevOps\s*engineer', r'cloud\s*engineer', r'infrastructure\s*engineer', r'site\s*reliability\s*engineer', r'SRE', r'platform\s*engineer'],
-        "Data Scientist": [r'data\s*scientist', r'data\s*analyst', r'analytics\s*specialist', r'business\s*intelligence', r'BI\s*developer', r'data\s*engineer'],
-        "Machine Learning Engineer": [r'machine\s*learning\s*engineer', r'ML\s*engineer', r'AI\s*engineer', r'deep\s*learning\s*specialist', r'NLP\s*engineer', r'computer\s*vision\s*engineer'],
-        "UI/UX Designer": [r'UI\s*designer', r'UX\s*designer', r'UI/UX\s*designer', r'product\s*designer', r'interaction\s*designer', r'visual\s*designer', r'web\s*designer'],
-        "Product Manager": [r'product\s*manager', r'product\s*owner', r'program\s*manager', r'project\s*manager', r'scrum\s*master', r'agile\s*coach'],
-        "QA Engineer": [r'QA\s*engineer', r'test\s*engineer', r'quality\s*assurance\s*engineer', r'software\s*tester', r'test\s*automation\s*engineer', r'SDET']
-    }
-    
-    # First check for explicit job titles
-    for field, patterns in job_title_patterns.items():
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                return field
-    
-    # Initialize scores for each field
-    field_scores = {field: 0 for field in field_patterns}
+    titles = job_title_fields(text)
+    return field_of_work(titles, keyword_counts(text, FIELD_PATTERNS) if not titles else {}, skills_text)
+
+def field_of_work(title_fields, field_counts, skills_text=""):
+    """
+    Field of work from the matches extract_field_of_work() looks for
+
+    Args:
+        title_fields: job_title_fields() of the text
+        field_counts: keyword_counts() of the text for FIELD_PATTERNS
+        skills_text: Extracted skills, comma-separated
+    """
+    # First check for explicit job titles. A job title anywhere in the text
+    # decides, so titles in the experience section need no extra weight
+    if title_fields:
+        return title_fields[0]
     
     # Score based on keyword patterns in the text
-    for field, patterns in field_patterns.items():
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            field_scores[field] += len(matches)
+    field_scores = {field: field_counts.get(field, 0) for field in FIELD_PATTERNS}
     
     # Score based on skills mentioned in the resume
     if skills_text:
         skills_list = [skill.strip().lower() for skill in skills_text.split(',')]
         
-        for field, skill_set in field_skills.items():
+        for field, skill_set in FIELD_SKILLS.items():
             for skill in skill_set:
                 if any(s.lower() == skill.lower() or skill.lower() in s.lower() for s in skills_list):
                     field_scores[field] += 2  # Give more weight to skills matches
     
-    # Also analyze work experience for job titles
-    exp_section_pattern = r'(?:work\s*experience|employment|professional\s*experience).*?(?=education|skills|projects|$)'
-    exp_section_match = re.search(exp_section_pattern, text, re.IGNORECASE | re.DOTALL)
-    
-    if exp_section_match:
-        exp_text = exp_section_match.group(0)
-        for field, patterns in job_title_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, exp_text, re.IGNORECASE):
-                    field_scores[field] += 3  # Give even more weight to job titles in experience
-    
     # Find the field with the highest score
     max_score = 0
     best_field = ""
@@ -652,6 +801,7 @@ def extract_field_of_work(text, skills_text=""):
     
     return best_field
 
+@traced()
 def extract_linkedin(text):
     """Extract LinkedIn profile URL"""
     linkedin_patterns = [
@@ -672,6 +822,7 @@ def extract_linkedin(text):
             return match.group(1)
     return ""
 
+@traced()
 def extract_website(text):
     """Extract personal website URL"""
     website_patterns = [
@@ -687,6 +838,7 @@ def extract_website(text):
             return match.group(1)
     return ""
 
+@traced()
 def extract_blog(text):
     """Extract blog URL"""
     blog_patterns = [
@@ -702,6 +854,7 @@ def extract_blog(text):
             return match.group(1)
     return ""
 
+@traced()
 def extract_youtube(text):
     """Extract YouTube channel URL"""
     youtube_patterns = [
@@ -716,8 +869,27 @@ def extract_youtube(text):
             return match.group(1)
     return ""
 
+# Keywords indicating each experience level, for resumes that do not state
+# their years of experience
+LEVEL_PATTERNS = {
+    "Intern": [r'intern', r'internship', r'trainee', r'student', r'apprentice', r'co-op'],
+    "Entry Level": [r'entry[\s\-]?level', r'junior', r'graduate', r'recent\s*graduate', r'fresher', r'beginner', r'novice', r'0-1\s*years?'],
+    "Junior": [r'junior', r'jr\.', r'associate', r'1-3\s*years?'],
+    "Mid-Level": [r'mid[\s\-]?level', r'intermediate', r'experienced', r'3-5\s*years?', r'4-6\s*years?'],
+    "Senior": [r'senior', r'sr\.', r'experienced', r'advanced', r'expert', r'6\+\s*years?', r'7-9\s*years?'],
+    "Lead": [r'lead', r'principal', r'architect', r'team\s*lead', r'technical\s*lead', r'10\+\s*years?'],
+    "Manager": [r'manager', r'director', r'head\s*of', r'chief', r'vp', r'executive', r'12\+\s*years?']
+}
+
+@traced()
 def extract_experience_info(text):
     """Try to determine experience level and years"""
+    years = years_of_experience(text)
+    level_counts = keyword_counts(text, LEVEL_PATTERNS) if years is None else {}
+    return experience_level(years, level_counts), str(years) if years is not None else ""
+
+def years_of_experience(text):
+    """Years of experience the text states, or estimates them from its work experience section"""
     # Look for years of experience with more comprehensive patterns
     year_patterns = [
         r'(\d+)\+?\s*(?:years|yrs|year)\s*(?:of)?\s*(?:experience|exp)',
@@ -754,52 +926,191 @@ def extract_experience_info(text):
             if position_count > 0 or date_ranges > 0:
                 estimated_years = max(position_count, date_ranges) * 2  # Rough estimate: 2 years per position/date range
                 years = min(estimated_years, 15)  # Cap at 15 years to avoid overestimation
-    
+    return years
+
+def experience_level(years, level_counts):
+    """
+    Experience level from the years of experience, or failing that from the
+    level keywords
+
+    Args:
+        years: years_of_experience() of the text
+        level_counts: keyword_counts() of the text for LEVEL_PATTERNS
+    """
     # Determine experience level based on years or keywords
-    experience_level = ""
+    level = ""
     if years is not None:
         if years == 0:
-            experience_level = "Intern"
+            level = "Intern"
         elif years <= 1:
-            experience_level = "Entry Level"
+            level = "Entry Level"
         elif years <= 3:
-            experience_level = "Junior"
+            level = "Junior"
         elif years <= 6:
-            experience_level = "Mid-Level"
+            level = "Mid-Level"
         elif years <= 9:
-            experience_level = "Senior"
+            level = "Senior"
         elif years <= 12:
-            experience_level = "Lead"
+            level = "Lead"
         else:
-            experience_level = "Manager"
+            level = "Manager"
     else:
-        # Look for keywords indicating experience level with more comprehensive patterns
-        level_patterns = {
-            "Intern": [r'intern', r'internship', r'trainee', r'student', r'apprentice', r'co-op'],
-            "Entry Level": [r'entry[\s\-]?level', r'junior', r'graduate', r'recent\s*graduate', r'fresher', r'beginner', r'novice', r'0-1\s*years?'],
-            "Junior": [r'junior', r'jr\.', r'associate', r'1-3\s*years?'],
-            "Mid-Level": [r'mid[\s\-]?level', r'intermediate', r'experienced', r'3-5\s*years?', r'4-6\s*years?'],
-            "Senior": [r'senior', r'sr\.', r'experienced', r'advanced', r'expert', r'6\+\s*years?', r'7-9\s*years?'],
-            "Lead": [r'lead', r'principal', r'architect', r'team\s*lead', r'technical\s*lead', r'10\+\s*years?'],
-            "Manager": [r'manager', r'director', r'head\s*of', r'chief', r'vp', r'executive', r'12\+\s*years?']
-        }
-        
         # Count matches for each level
-        level_scores = {level: 0 for level in level_patterns}
-        for level, patterns in level_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                level_scores[level] += len(matches)
+        level_scores = {name: level_counts.get(name, 0) for name in LEVEL_PATTERNS}
         
         # Find the level with the highest score
         max_score = 0
-        for level, score in level_scores.items():
+        for candidate, score in level_scores.items():
             if score > max_score:
                 max_score = score
-                experience_level = level
+                level = candidate
     
-    return experience_level, str(years) if years is not None else ""
+    return level
+
 
+# Headings that start a new section of a resume, on a line of their own
+SECTION_HEADINGS = (
+    "summary", "professional summary", "profile", "objective", "about me",
+    "skills", "technical skills", "core competencies",
+    "experience", "work experience", "professional experience", "employment", "employment history", "work history",
+    "education", "academic background", "projects", "personal projects",
+    "certifications", "certification", "certificates", "licenses", "languages",
+    "awards", "achievements", "publications", "interests", "volunteering", "references",
+)
+HEADING_LINE = re.compile(
+    r'^[ \t]*(?:' + '|'.join(heading.replace(' ', r'[ \t]+') for heading in SECTION_HEADINGS) + r')[ \t]*:?[ \t\r]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Keyword patterns that can match across a line break, and so across the
+# start of a section
+LINE_SPANNING_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for patterns_by_key in (JOB_TITLE_PATTERNS, FIELD_PATTERNS, LEVEL_PATTERNS)
+    for patterns in patterns_by_key.values()
+    for pattern in patterns if r'\s' in pattern
+]
+
+# Part of every ParseCache key; bump it when an extractor changes so results
+# cached by the previous version are not reused
+PARSE_CACHE_VERSION = 1
+
+class ParseCache:
+    """
+    Extractor results of a previous parse, keyed by a hash of the section of
+    text each was computed from. Parsing a revised resume with the cache of
+    the previous revision only re-runs the extractors whose sections changed.
+    After a parse the cache holds just the entries that parse used, so it
+    does not grow across revisions. Entries are JSON serializable.
+    """
+
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+        self.hits = 0
+        self.misses = 0
+        self._used = {}
+
+    def get(self, name, section, compute):
+        """compute(section), or its cached result if the section is unchanged"""
+        digest = hashlib.sha1(section.encode("utf-8", "surrogatepass")).hexdigest()
+        key = f"{name}.{PARSE_CACHE_VERSION}:{digest}"
+        if key in self._used:
+            return self._used[key]
+        if key in self.entries:
+            self.hits += 1
+            value = self.entries[key]
+        else:
+            self.misses += 1
+            with span(f"extract_{name}", section_length=len(section)):
+                value = compute(section)
+        self._used[key] = value
+        return value
+
+    def finish(self):
+        """Keep only the entries used since the last finish()"""
+        self.entries, self._used = self._used, {}
+
+def split_sections(text):
+    """
+    Split the text at SECTION_HEADINGS lines
+
+    Returns:
+        list: Consecutive parts of the text, each but the first starting
+            with a heading line; joined, they are the text
+    """
+    starts = [0] + [match.start() for match in HEADING_LINE.finditer(text) if match.start() > 0]
+    return [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+
+def _matches_across(text, boundary):
+    """Whether a keyword pattern matches across the line break before boundary"""
+    # Such a match takes in the line break, so starts on one of the last
+    # lines before it and ends on one of the first lines after it. Keyword
+    # patterns are a few words at most, so two lines with words on each side
+    # are enough
+    start, lines = boundary, 0
+    while start > 0 and lines < 2:
+        line_start = text.rfind("\n", 0, start - 1) + 1
+        if text[line_start:start].strip():
+            lines += 1
+        start = line_start
+    end, lines = boundary, 0
+    while end < len(text) and lines < 2:
+        line_end = text.find("\n", end)
+        line_end = len(text) if line_end == -1 else line_end + 1
+        if text[end:line_end].strip():
+            lines += 1
+        end = line_end
+    for regex in LINE_SPANNING_PATTERNS:
+        for match in regex.finditer(text, start, end):
+            if match.start() < boundary < match.end():
+                return True
+    return False
+
+def text_features(text):
+    """
+    Keyword matches of a text that skills, field of work and experience
+    level are derived from
+
+    Returns:
+        dict: skills (skills_found()), titles (job_title_fields()), fields
+            and levels (keyword_counts() for FIELD_PATTERNS and LEVEL_PATTERNS)
+    """
+    return {
+        "skills": skills_found(text),
+        "titles": job_title_fields(text),
+        "fields": keyword_counts(text, FIELD_PATTERNS),
+        "levels": keyword_counts(text, LEVEL_PATTERNS),
+    }
+
+def document_features(text, cache):
+    """
+    text_features() of the whole text, computed per section and summed, so
+    only changed sections are searched again. Falls back to searching the
+    whole text when a keyword match runs across the start of a section.
+    """
+    sections = split_sections(text)
+    boundary = 0
+    for section in sections[:-1]:
+        boundary += len(section)
+        if _matches_across(text, boundary):
+            sections = [text]
+            break
+    parts = [cache.get("features", section, text_features) for section in sections]
+
+    skills = {skill for part in parts for skill in part["skills"]}
+    titles = {field for part in parts for field in part["titles"]}
+    fields, levels = {}, {}
+    for part in parts:
+        for field, count in part["fields"].items():
+            fields[field] = fields.get(field, 0) + count
+        for level, count in part["levels"].items():
+            levels[level] = levels.get(level, 0) + count
+    return {
+        "skills": [skill for skill in COMMON_SKILLS if skill in skills],
+        "titles": [field for field in JOB_TITLE_PATTERNS if field in titles],
+        "fields": fields,
+        "levels": levels,
+    }
 
 # Test function to verify parsing functionality
 def test_parser():
@@ -0,0 +1,85 @@
+# utils/resume_preview.py - Live HTML preview of the resume form
+#
+# The preview is the same layout the generator renders, split into sections
+# at each heading. Every section's HTML is cached under a hash of its blocks,
+# so while someone types only the section they are editing is re-rendered,
+# and the client is only sent fragments it does not already have.
+
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.resume_layout import HEADING, normalize_resume_data, build_layout
+from utils.resume_renderers import render_html_blocks
+
+# Number of section fragments kept in memory
+FRAGMENT_CACHE_SIZE = 2048
+
+_fragment_cache = OrderedDict()
+_fragment_lock = threading.Lock()
+
+def split_sections(layout):
+    """
+    Group a layout's blocks into sections, each starting at a heading
+
+    Returns:
+        list: (section id, blocks) pairs in reading order; the blocks before
+            the first heading form the "header" section
+    """
+    sections = []
+    section_id, blocks = "header", []
+    for block in layout.blocks:
+        if block.kind == HEADING:
+            if blocks:
+                sections.append((section_id, blocks))
+            section_id = re.sub(r"[^a-z0-9]+", "-", block.text.lower()).strip("-")
+            blocks = []
+        blocks.append(block)
+    if blocks:
+        sections.append((section_id, blocks))
+    return sections
+
+def fragment_key(blocks):
+    digest = hashlib.sha1()
+    for block in blocks:
+        digest.update(f"{block.kind}\0{block.text}\0".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+def render_fragment(key, blocks):
+    with _fragment_lock:
+        fragment = _fragment_cache.get(key)
+        if fragment is not None:
+            _fragment_cache.move_to_end(key)
+            return fragment
+    fragment = render_html_blocks(blocks)
+    with _fragment_lock:
+        _fragment_cache[key] = fragment
+        while len(_fragment_cache) > FRAGMENT_CACHE_SIZE:
+            _fragment_cache.popitem(last=False)
+    return fragment
+
+def render_preview(data, known_keys=()):
+    """
+    Render resume data as HTML fragments, one per section
+
+    Args:
+        data: Form fields describing the resume
+        known_keys: Fragment keys the client already has; their HTML is omitted
+
+    Returns:
+        list: {"id", "key", "html"} per section, in reading order. "html" is
+            None for sections whose key is in known_keys.
+    """
+    known_keys = set(known_keys)
+    # Build the layout directly rather than through get_layout: every
+    # keystroke is new data and would only churn the layout cache
+    layout = build_layout(normalize_resume_data(data))
+    sections = []
+    for section_id, blocks in split_sections(layout):
+        key = fragment_key(blocks)
+        sections.append({
+            "id": section_id,
+            "key": key,
+            "html": None if key in known_keys else render_fragment(key, blocks),
+        })
+    return sections
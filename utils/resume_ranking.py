@@ -0,0 +1,321 @@
+# utils/resume_ranking.py - Rank stored resumes against a job description
+#
+# Resumes and job descriptions are described in the parser's own vocabulary:
+# the skill names of COMMON_SKILLS and FIELD_SKILLS and the keyword patterns
+# of FIELD_PATTERNS. Each resume is a sparse row of sublinear term
+# frequencies; a job description is scored against every resume at once as
+# TF-IDF cosine similarity, with one sparse matrix-vector product.
+#
+# Rows are appended as resumes are added, so the matrix is never rebuilt; a
+# resume re-indexed with a different vector has its old row blanked and a
+# new one appended.
+# With NumPy/SciPy installed the matrix is held as CSR blocks; without them
+# an inverted index in pure Python gives the same scores, more slowly.
+
+import re
+import sys
+import math
+import heapq
+import threading
+from collections import OrderedDict
+from utils.resume_parser import COMMON_SKILLS, FIELD_SKILLS, FIELD_PATTERNS
+
+# Import NumPy/SciPy conditionally; without them the pure Python scorer is used
+try:
+    import numpy as np
+    import scipy.sparse as sparse
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Rows read from the resume index per query while catching up
+SYNC_BATCH_SIZE = 1000
+
+def _term_pattern(pattern):
+    # Keyword patterns match at a word start; plain words also at a word end,
+    # so short ones like "AI" or "R" do not match inside other words
+    return r'\b(?:' + pattern + r')' + (r'\b' if re.fullmatch(r'\w+', pattern) else '')
+
+def build_vocabulary():
+    """
+    Terms of the ranking vocabulary
+
+    Returns:
+        OrderedDict: term label -> regex source, for lowercased text
+    """
+    patterns = OrderedDict()
+    skills = list(COMMON_SKILLS) + [skill for field_skills in FIELD_SKILLS.values() for skill in field_skills]
+    for skill in skills:
+        patterns.setdefault(skill.lower(), r'\b' + re.escape(skill) + r'\b')
+    for field_patterns in FIELD_PATTERNS.values():
+        for pattern in field_patterns:
+            # Patterns spanning the document (front-end.*back-end) say little
+            # about a single term
+            if '.*' in pattern:
+                continue
+            literal = re.fullmatch(r'(?:[\w ]|\\\.)+', pattern)
+            label = pattern.replace('\\', '').lower() if literal else pattern.lower()
+            patterns.setdefault(label, _term_pattern(pattern))
+    # Lowercasing the patterns is safe as they only use lowercase escapes
+    # (\s, \b); matching lowercased text is faster than IGNORECASE
+    return OrderedDict((label, pattern.lower()) for label, pattern in patterns.items())
+
+VOCABULARY = build_vocabulary()
+TERMS = list(VOCABULARY)
+
+WORD = re.compile(r'\w+')
+
+def _term_index():
+    # Every term starts with a word character right after \b, so a match can
+    # only begin where a word begins. Terms are grouped by the first one or
+    # two characters of their leading word, and only the group of each word
+    # of a text is tried there
+    index = {}
+    for column, pattern in enumerate(VOCABULARY.values()):
+        leading = re.match(r'\\b(?:\(\?:)?(\w+)', pattern).group(1)
+        index.setdefault(leading[:2], []).append((column, re.compile(pattern)))
+    return index
+
+TERM_INDEX = _term_index()
+
+def term_vector(text):
+    """Sparse sublinear term frequencies of a text: {term index: 1 + log(count)}"""
+    lowered = text.lower()
+    counts = {}
+    for word in WORD.finditer(lowered):
+        start = word.start()
+        token = word.group()
+        candidates = TERM_INDEX.get(token[:2], ())
+        if len(token) > 1 and token[:1] in TERM_INDEX:
+            candidates = list(candidates) + TERM_INDEX[token[:1]]
+        for column, regex in candidates:
+            if regex.match(lowered, start):
+                counts[column] = counts.get(column, 0) + 1
+    return {column: 1.0 + math.log(count) for column, count in counts.items()}
+
+class RankingEngine:
+    """
+    TF-IDF matrix over resumes, one row per resume id. add() appends a row,
+    or replaces the resume's earlier one; rank() scores a job description
+    against every row.
+
+    New rows are appended as small CSR blocks, merged once there are more
+    than MAX_BLOCKS. IDF weights, and with them every row norm, are only
+    recomputed once the number of resumes has grown by IDF_REFRESH_RATIO, so
+    adding a resume does not cost a pass over the whole matrix; rows added
+    in between are weighted with the IDF in effect.
+    """
+
+    MAX_BLOCKS = 16
+    IDF_REFRESH_RATIO = 0.01
+
+    def __init__(self, use_numpy=None):
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else use_numpy
+        self.ids = []
+        self.last_synced_revision = 0
+        self.document_frequency = [0] * len(TERMS)
+        # Resume id -> its current row; replaced rows stay in place, blank
+        self._rows = {}
+        self._lock = threading.Lock()
+        self._idf_weights = None
+        self._idf_documents = 0
+        if self.use_numpy:
+            self._pending = []
+            self._blocks = []
+            self._norms = np.zeros(0, dtype=np.float32)
+        else:
+            self._vectors = []
+            self._postings = [[] for _ in TERMS]
+            self._norms = []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, resume_id, text):
+        """Add a resume's row, replacing its earlier row if its terms changed"""
+        vector = term_vector(text)
+        with self._lock:
+            row = self._rows.get(resume_id)
+            if row is not None:
+                old = self._vector(row)
+                if old.keys() == vector.keys() and all(abs(old[c] - vector[c]) < 1e-6 for c in vector):
+                    return
+                self._blank(row, old)
+            row = len(self.ids)
+            self._rows[resume_id] = row
+            self.ids.append(resume_id)
+            for column in vector:
+                self.document_frequency[column] += 1
+            if self.use_numpy:
+                self._pending.append(vector)
+            else:
+                self._vectors.append(vector)
+                for column, weight in vector.items():
+                    self._postings[column].append((row, weight))
+
+    def _block_of(self, row):
+        """(block, row within it) holding a row, or (None, index in _pending) (lock held)"""
+        for block in self._blocks:
+            if row < block.shape[0]:
+                return block, row
+            row -= block.shape[0]
+        return None, row
+
+    def _vector(self, row):
+        """A row's {term index: weight} (lock held)"""
+        if not self.use_numpy:
+            return self._vectors[row]
+        block, row = self._block_of(row)
+        if block is None:
+            return self._pending[row]
+        start, end = block.indptr[row], block.indptr[row + 1]
+        return {int(c): float(w) for c, w in zip(block.indices[start:end], block.data[start:end]) if w}
+
+    def _blank(self, row, vector):
+        """Take a replaced row out of the scores and document frequencies (lock held)"""
+        for column in vector:
+            self.document_frequency[column] -= 1
+        if not self.use_numpy:
+            self._vectors[row] = {}
+            for column in vector:
+                self._postings[column] = [posting for posting in self._postings[column] if posting[0] != row]
+            if row < len(self._norms):
+                self._norms[row] = math.inf
+            return
+        block, index = self._block_of(row)
+        if block is None:
+            self._pending[index] = {}
+            return
+        # Zeroed weights score 0, and an infinite norm keeps it 0
+        block.data[block.indptr[index]:block.indptr[index + 1]] = 0
+        self._norms[row] = np.inf
+
+    def sync(self, resume_index):
+        """Take in the resumes the index added or re-indexed since the last sync"""
+        while True:
+            rows = resume_index.texts_changed_since(self.last_synced_revision, SYNC_BATCH_SIZE)
+            for _, resume_id, text in rows:
+                self.add(resume_id, text)
+            if rows:
+                self.last_synced_revision = rows[-1][0]
+            if len(rows) < SYNC_BATCH_SIZE:
+                return
+
+    def _block_norms(self, block):
+        norms = np.sqrt(block.multiply(block) @ (self._idf_weights ** 2))
+        # Rows without any vocabulary term score 0 instead of dividing by 0
+        norms[norms == 0] = np.inf
+        return norms
+
+    def _refresh(self):
+        """Take in rows added since the last query (lock held)"""
+        documents = len(self._rows)
+        reweigh = self._idf_weights is None or documents > self._idf_documents * (1 + self.IDF_REFRESH_RATIO)
+        if reweigh:
+            idf = [math.log((1 + documents) / (1 + df)) + 1 for df in self.document_frequency]
+            self._idf_weights = np.array(idf, dtype=np.float32) if self.use_numpy else idf
+            self._idf_documents = documents
+
+        if not self.use_numpy:
+            idf = self._idf_weights
+            start = 0 if reweigh else len(self._norms)
+            self._norms[start:] = [
+                math.sqrt(sum((weight * idf[column]) ** 2 for column, weight in vector.items())) or math.inf
+                for vector in self._vectors[start:]
+            ]
+            return
+
+        if self._pending:
+            indptr, indices, data = [0], [], []
+            for vector in self._pending:
+                # Columns in order, so resumes with the same terms sum their
+                # float32 products alike and tie exactly
+                for column in sorted(vector):
+                    indices.append(column)
+                    data.append(vector[column])
+                indptr.append(len(indices))
+            block = sparse.csr_matrix(
+                (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+                shape=(len(self._pending), len(TERMS))
+            )
+            self._pending = []
+            self._blocks.append(block)
+            if not reweigh:
+                self._norms = np.concatenate([self._norms, self._block_norms(block)])
+        if len(self._blocks) > self.MAX_BLOCKS:
+            self._blocks = [sparse.vstack(self._blocks, format="csr")]
+        if reweigh:
+            self._norms = np.concatenate([self._block_norms(block) for block in self._blocks] or [self._norms])
+
+    def rank(self, job_description, limit=20):
+        """
+        Score every resume against a job description
+
+        Returns:
+            list: (resume id, score) pairs, best first, for resumes sharing at
+                least one term with the description. Scores are cosine
+                similarities between 0 and 1.
+        """
+        query = term_vector(job_description)
+        with self._lock:
+            self._refresh()
+            if not query or not self.ids:
+                return []
+            idf = self._idf_weights
+            weights = {column: weight * idf[column] for column, weight in query.items()}
+            query_norm = math.sqrt(sum(w * w for w in weights.values()))
+            if self.use_numpy:
+                q = np.zeros(len(TERMS), dtype=np.float32)
+                for column, weight in weights.items():
+                    q[column] = weight * idf[column] / query_norm
+                scores = np.concatenate([block @ q for block in self._blocks]) / self._norms
+                count = min(limit, int(np.count_nonzero(scores)))
+                if count == 0:
+                    return []
+                # Every row scoring at least the count-th best, so that ties
+                # at the cutoff go to the earliest rows, as in the Python scorer
+                cutoff = -np.partition(-scores, count - 1)[count - 1]
+                candidates = np.flatnonzero(scores >= cutoff)
+                top = candidates[np.lexsort((candidates, -scores[candidates]))[:count]]
+                return [(self.ids[row], float(scores[row])) for row in top]
+
+            accumulated = {}
+            for column, weight in weights.items():
+                factor = weight * idf[column] / query_norm
+                for row, value in self._postings[column]:
+                    accumulated[row] = accumulated.get(row, 0.0) + value * factor
+            best = heapq.nlargest(limit, accumulated.items(), key=lambda item: (item[1] / self._norms[item[0]], -item[0]))
+            return [(self.ids[row], score / self._norms[row]) for row, score in best]
+
+    def memory_bytes(self):
+        """Size of the matrix, or of the postings and row vectors, in bytes"""
+        with self._lock:
+            self._refresh()
+            if self.use_numpy:
+                size = self._norms.nbytes
+                for block in self._blocks:
+                    size += block.data.nbytes + block.indices.nbytes + block.indptr.nbytes
+                return size
+            size = sys.getsizeof(self._postings) + sys.getsizeof(self._vectors) + sys.getsizeof(self._norms)
+            for postings in self._postings:
+                size += sys.getsizeof(postings) + sum(sys.getsizeof(posting) for posting in postings)
+            for vector in self._vectors:
+                # Each weight float is shared by the vector and its posting
+                size += sys.getsizeof(vector) + sum(sys.getsizeof(weight) for weight in vector.values())
+            return size
+
+def rank_indexed_resumes(engine, resume_index, job_description, limit=20):
+    """
+    Rank the resumes in a ResumeIndex against a job description
+
+    Returns:
+        list: The index's search result dicts, best first, each with a "score"
+    """
+    engine.sync(resume_index)
+    ranked = engine.rank(job_description, limit)
+    rows = {row["id"]: row for row in resume_index.get([resume_id for resume_id, _ in ranked])}
+    results = []
+    for resume_id, score in ranked:
+        if resume_id in rows:
+            results.append(dict(rows[resume_id], score=round(score, 4)))
+    return results
@@ -0,0 +1,271 @@
+# utils/resume_renderers.py - Render a ResumeLayout to DOCX, PDF or HTML
+#
+# Each renderer takes a ResumeLayout and a Theme (utils/themes.py) and returns
+# the document as bytes, and must produce identical bytes for identical input
+# so generated artifacts stay content-addressable. Register additional formats with register_renderer().
+
+import io
+import html
+import zipfile
+import datetime
+import importlib.util
+from utils.resume_layout import TITLE, SUBTITLE, CONTACT, RULE, HEADING, SUBHEADING, META, PARAGRAPH, BULLET
+from utils.themes import (
+    DocxTemplate, PLACEHOLDER, get_theme, compiled_theme, template_paragraphs, is_content_anchor,
+)
+from utils.tracing import start_span, traced, current_span
+
+# Fixed timestamps stamped into every generated document so identical input
+# produces byte-identical output
+DOCUMENT_TIMESTAMP = datetime.datetime(2000, 1, 1)
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+CONTENT_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+    "html": "text/html; charset=utf-8",
+}
+
+def pdf_rendering_available():
+    """Check whether reportlab is installed without importing it"""
+    return importlib.util.find_spec("reportlab") is not None
+
+def deterministic_package(package_bytes):
+    """Repack a saved DOCX with stable member order and timestamps"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(package_bytes)) as source, \
+            zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as target:
+        # [Content_Types].xml conventionally comes first; the rest sorted by name
+        names = sorted(source.namelist(), key=lambda name: (name != "[Content_Types].xml", name))
+        for name in names:
+            info = zipfile.ZipInfo(name, date_time=ZIP_TIMESTAMP)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            target.writestr(info, source.read(name))
+    return buffer.getvalue()
+
+# Block kinds whose DOCX paragraph always gets a run, even for empty text
+DOCX_RUN_KINDS = (SUBTITLE, CONTACT, META, SUBHEADING, BULLET)
+
+@traced("docx.build")
+def docx_document(layout, theme=None):
+    """Build the styled python-docx Document for a layout"""
+    from docx import Document
+    from docx.shared import Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+    theme = theme or get_theme()
+    # Open the theme's compiled package, which already holds styles and margins
+    styles_span = start_span("docx.styles", theme=theme.name)
+    compiled = compiled_theme(theme)
+    doc = Document(io.BytesIO(compiled.package))
+    styles_span.end()
+
+    content_span = start_span("docx.content")
+    template = isinstance(theme, DocxTemplate)
+    if template:
+        # Fill in the template's placeholders and insert the blocks at {{ content }}
+        anchor = None
+        for paragraph in template_paragraphs(doc):
+            # Body paragraphs come first, and the body holds the one valid anchor
+            if anchor is None and is_content_anchor(paragraph):
+                anchor = paragraph
+                continue
+            for run in paragraph.runs:
+                if "{{" in run.text:
+                    run.text = PLACEHOLDER.sub(lambda m: layout.fields.get(m.group(1), ""), run.text)
+        add_paragraph = anchor.insert_paragraph_before
+    else:
+        add_paragraph = doc.add_paragraph
+
+    for block in layout.blocks:
+        if block.kind == RULE:
+            add_paragraph().add_run('_' * 80)
+            continue
+        spec = theme.styles[block.kind]
+        if block.kind in DOCX_RUN_KINDS:
+            paragraph = add_paragraph()
+            run = paragraph.add_run(f"• {block.text}" if block.kind == BULLET else block.text)
+            if block.kind == SUBHEADING:
+                run.bold = True
+        else:
+            paragraph = add_paragraph(block.text)
+        # Set the style id directly; assigning a style name makes python-docx
+        # scan every style in the document for each paragraph
+        paragraph._p.style = compiled.style_ids[spec["name"]]
+        if spec.get("align") == "center":
+            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    if template:
+        anchor._p.getparent().remove(anchor._p)
+    else:
+        footer_para = doc.sections[0].footer.paragraphs[0]
+        footer_para.alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        footer_run = footer_para.add_run(layout.footer)
+        footer_run.font.size = Pt(9)
+        footer_run.font.name = theme.font
+
+    # Pin document metadata so the output depends only on the input
+    core_properties = doc.core_properties
+    core_properties.created = DOCUMENT_TIMESTAMP
+    core_properties.modified = DOCUMENT_TIMESTAMP
+    core_properties.last_printed = DOCUMENT_TIMESTAMP
+    core_properties.revision = 1
+
+    content_span.set_attribute("paragraph_count", len(doc.paragraphs))
+    content_span.end()
+    return doc
+
+def render_docx(layout, theme=None):
+    package = io.BytesIO()
+    docx_document(layout, theme).save(package)
+    return deterministic_package(package.getvalue())
+
+# reportlab's built-in fonts stand in for the theme fonts: Times for serif
+# faces, Helvetica for everything else
+PDF_SERIF_FONTS = ("Times New Roman", "Georgia", "Cambria", "Garamond")
+PDF_FONTS = {
+    "Helvetica": {
+        (False, False): "Helvetica",
+        (True, False): "Helvetica-Bold",
+        (False, True): "Helvetica-Oblique",
+        (True, True): "Helvetica-BoldOblique",
+    },
+    "Times": {
+        (False, False): "Times-Roman",
+        (True, False): "Times-Bold",
+        (False, True): "Times-Italic",
+        (True, True): "Times-BoldItalic",
+    },
+}
+
+def render_pdf(layout, theme=None):
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, HRFlowable
+
+    theme = theme or get_theme()
+    fonts = PDF_FONTS["Times" if theme.font in PDF_SERIF_FONTS else "Helvetica"]
+    styles = {}
+    for kind, spec in theme.styles.items():
+        styles[kind] = ParagraphStyle(
+            spec["name"],
+            fontName=fonts[(bool(spec.get("bold")), bool(spec.get("italic")))],
+            fontSize=spec["size"],
+            leading=spec["size"] * 1.2,
+            textColor=colors.Color(*(c / 255 for c in spec.get("color", (0, 0, 0)))),
+            alignment=TA_CENTER if spec.get("align") == "center" else TA_LEFT,
+            leftIndent=spec.get("indent", 0) * inch,
+            spaceBefore=spec.get("space_before", 0),
+            spaceAfter=spec["space_after"],
+        )
+
+    story = []
+    for block in layout.blocks:
+        if block.kind == RULE:
+            story.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey, spaceBefore=4, spaceAfter=8))
+        elif block.kind == BULLET:
+            story.append(Paragraph(html.escape(block.text), styles[BULLET], bulletText="•"))
+        elif block.text:
+            story.append(Paragraph(html.escape(block.text), styles[block.kind]))
+
+    def draw_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont(fonts[(False, False)], 9)
+        canvas.drawRightString(doc.pagesize[0] - doc.rightMargin, 0.5 * inch, layout.footer)
+        canvas.restoreState()
+
+    buffer = io.BytesIO()
+    margin = theme.page_margin * inch
+    document = SimpleDocTemplate(
+        buffer, pagesize=letter,
+        leftMargin=margin, rightMargin=margin, topMargin=margin, bottomMargin=margin,
+        title=layout.title, creator="Resume Kraft",
+        # Fixed creation date and document id, so identical layouts give identical bytes
+        invariant=1,
+    )
+    document.build(story, onFirstPage=draw_footer, onLaterPages=draw_footer)
+    if current_span() is not None:
+        current_span().set_attribute("page_count", document.page)
+    return buffer.getvalue()
+
+HTML_TAGS = {TITLE: "h1", SUBTITLE: "p", CONTACT: "p", HEADING: "h2", SUBHEADING: "h3", META: "p", PARAGRAPH: "p"}
+
+def _css(selector, spec):
+    rules = [f"font-size:{spec['size']}pt", f"margin:{spec.get('space_before', 0)}pt 0 {spec['space_after']}pt"]
+    rules.append(f"font-weight:{'bold' if spec.get('bold') else 'normal'}")
+    if spec.get("italic"):
+        rules.append("font-style:italic")
+    if "color" in spec:
+        rules.append("color:rgb({},{},{})".format(*spec["color"]))
+    if spec.get("align") == "center":
+        rules.append("text-align:center")
+    if "indent" in spec:
+        rules.append(f"margin-left:{spec['indent']}in")
+    return f"{selector}{{{';'.join(rules)}}}"
+
+def html_stylesheet(scope=None, theme=None):
+    """
+    CSS for rendered HTML. With a scope selector (e.g. ".resume-preview")
+    every rule only applies inside that element, for embedding in a page.
+    """
+    theme = theme or get_theme()
+    root = scope or "body"
+    prefix = f"{scope} " if scope else ""
+    css = [f"{root}{{font-family:{theme.font},Arial,sans-serif;max-width:8.5in;margin:0 auto;padding:{theme.page_margin}in}}"]
+    css.extend(_css(f"{prefix}.{kind}", spec) for kind, spec in theme.styles.items())
+    css.append(f"{prefix}ul.bullet{{list-style:disc;padding-left:1.2em}}")
+    css.append(f"{prefix}footer{{text-align:right;font-size:9pt;color:#666}}")
+    return "".join(css)
+
+def render_html_blocks(blocks):
+    """HTML markup for a sequence of layout blocks, without the page around it"""
+    parts = []
+    in_list = False
+    for block in blocks:
+        if block.kind == BULLET:
+            if not in_list:
+                parts.append('<ul class="bullet">')
+                in_list = True
+            parts.append(f"<li>{html.escape(block.text)}</li>")
+            continue
+        if in_list:
+            parts.append("</ul>")
+            in_list = False
+        if block.kind == RULE:
+            parts.append("<hr>")
+        elif block.text or block.kind in (TITLE, PARAGRAPH):
+            tag = HTML_TAGS[block.kind]
+            parts.append(f'<{tag} class="{block.kind}">{html.escape(block.text)}</{tag}>')
+    if in_list:
+        parts.append("</ul>")
+    return "".join(parts)
+
+def render_html(layout, theme=None):
+    """Render a standalone HTML page with inline styles"""
+    page = (
+        "<!DOCTYPE html>\n"
+        f'<html lang="en"><head><meta charset="utf-8"><title>{html.escape(layout.title)}</title>'
+        f"<style>{html_stylesheet(theme=theme)}</style></head>"
+        f"<body>{render_html_blocks(layout.blocks)}<footer>{html.escape(layout.footer)}</footer></body></html>\n"
+    )
+    return page.encode("utf-8")
+
+RENDERERS = {
+    "docx": render_docx,
+    "pdf": render_pdf,
+    "html": render_html,
+}
+
+def register_renderer(output_format, renderer, content_type):
+    """Add an output format: `renderer(layout, theme)` must return the document bytes"""
+    RENDERERS[output_format] = renderer
+    CONTENT_TYPES[output_format] = content_type
+
+def renderer_available(output_format):
+    if output_format == "pdf":
+        return pdf_rendering_available()
+    return output_format in RENDERERS
@@ -0,0 +1,72 @@
+# utils/schemas.py - Request and response models of the JSON API
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+try:
+    from typing import Literal
+except ImportError:  # Python < 3.8
+    from typing_extensions import Literal
+
+class ExperienceEntry(BaseModel):
+    company: str = ""
+    title: str = ""
+    description: str = ""
+    highlights: List[str] = Field(default_factory=list)
+
+class EducationEntry(BaseModel):
+    degree: str = ""
+    institution: str = ""
+    year: str = ""
+
+class ProjectEntry(BaseModel):
+    name: str
+    description: str = ""
+    highlights: List[str] = Field(default_factory=list)
+
+class ResumeRequest(BaseModel):
+    full_name: str
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+    summary: str = ""
+    field_of_work: str = ""
+    experience_level: str = ""
+    years_of_experience: str = ""
+    linkedin: str = ""
+    github: str = ""
+    twitter: str = ""
+    website: str = ""
+    blog: str = ""
+    youtube: str = ""
+    skills: List[str] = Field(default_factory=list)
+    certifications: List[str] = Field(default_factory=list)
+    languages: List[str] = Field(default_factory=list)
+    experience: List[ExperienceEntry] = Field(default_factory=list)
+    education: List[EducationEntry] = Field(default_factory=list)
+    projects: List[ProjectEntry] = Field(default_factory=list)
+    output_format: Literal["docx", "pdf", "html"] = "docx"
+    # Render several formats from one request (delivery=url only); overrides output_format
+    output_formats: Optional[List[Literal["docx", "pdf", "html"]]] = None
+    # Name of a registered theme (GET /api/v1/themes), or the id of a template
+    # uploaded to POST /api/v1/templates (DOCX output only)
+    theme: Optional[str] = None
+    template_id: Optional[str] = None
+
+class ResumeDocument(BaseModel):
+    id: str
+    output_format: str
+    content_type: str
+    size: Optional[int] = None
+    download_url: str
+
+class TemplateCreated(BaseModel):
+    id: str
+    placeholders: List[str]
+
+class ResumeCreated(ResumeDocument):
+    # Every generated format; the top-level fields describe the first one
+    documents: List[ResumeDocument] = Field(default_factory=list)
+
+class RankRequest(BaseModel):
+    job_description: str = Field(..., min_length=1)
+    limit: int = Field(20, ge=1, le=100)
@@ -0,0 +1,764 @@
+# utils/skill_bitmap.py - Boolean skill filters over the resume index
+#
+# Every skill of the parser's COMMON_SKILLS vocabulary gets an integer id and
+# a compressed bitmap of the resumes listing it. A query such as
+# "Python AND (AWS OR Azure) AND NOT PHP" is answered by bitmap algebra,
+# without looking at any skills text.
+#
+# Bitmaps are split into chunks of 65536 resume ids, as in Roaring bitmaps:
+# a chunk with few ids is stored as a sorted array of their low 16 bits, a
+# fuller one as a fixed 8 KB bitmap. The chunks of all skills are written to
+# one file that workers memory-map; with NumPy installed queries run directly
+# on the mapped pages, so every worker shares the page cache's single copy.
+# Without NumPy each worker decodes the bitmaps into Python integers.
+#
+# The file is a snapshot of the index at some revision. Resumes indexed or
+# re-indexed after it are kept in a small in-memory delta, which overrides
+# the file for their ids, and the file is rebuilt in the background once the
+# delta reaches SKILL_BITMAP_REBUILD_ROWS. The app builds a missing file when
+# it starts; build it ahead of time with:
+#
+#     python -m utils.skill_bitmap
+
+import os
+import re
+import sys
+import json
+import mmap
+import array
+import struct
+import tempfile
+import threading
+from utils.resume_parser import COMMON_SKILLS
+
+# Import NumPy conditionally; without it bitmaps are decoded into Python ints
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Cross-process lock so only one worker rebuilds the file at a time
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SKILLS = list(COMMON_SKILLS)
+SKILL_IDS = {skill.lower(): skill_id for skill_id, skill in enumerate(SKILLS)}
+
+MAGIC = b"SKBM"
+VERSION = 2
+# magic, version, resume index revision covered, term count, label bytes
+HEADER = struct.Struct("<4sIQII")
+# Per term: offset of its container table, container count, cardinality
+TERM = struct.Struct("<QII")
+# Per container: chunk key (resume id >> 16), kind, cardinality, data offset
+CONTAINER = struct.Struct("<IIIxxxxQ")
+ARRAY, BITMAP = 0, 1
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+BITMAP_BYTES = CHUNK_SIZE // 8
+# Chunks with more ids than this are stored as bitmaps. Roaring switches at
+# 4096, where a bitmap becomes smaller; switching at a quarter of that keeps
+# the file small while most of the work stays on bitmaps, where an AND or OR
+# of a chunk is a single vectorised pass instead of a search per id
+ARRAY_MAX = 1024
+
+# Term 0 holds every resume in the snapshot, for NOT; skills follow it
+ALL = 0
+
+# Rows read from the resume index per query while catching up, and per read
+# while building the file
+SYNC_BATCH_SIZE = 1000
+BUILD_BATCH_SIZE = 10000
+
+TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+OPERATORS = {"and", "or", "not"}
+
+class SkillQueryError(ValueError):
+    """A boolean skill query is malformed or names an unknown skill"""
+
+def _pad(data):
+    data.extend(b"\0" * (-len(data) % 8))
+
+def skill_terms(skills):
+    """Term ids of a parse result's comma-separated skills field"""
+    terms = set()
+    for skill in (skills or "").split(","):
+        term = SKILL_IDS.get(skill.strip().lower())
+        if term is not None:
+            terms.add(term + 1)
+    return terms
+
+def parse_query(query):
+    """
+    Parse a boolean skill query. AND binds tighter than OR, NOT applies to
+    the term or parenthesised group after it, and operators are case
+    insensitive. Skills are matched case insensitively; words between
+    operators form one skill name ("Machine Learning"), and a name can be
+    quoted.
+
+    Returns:
+        tuple: Query tree of ("skill", term), ("not", node), ("and", left,
+            right) and ("or", left, right) nodes
+
+    Raises:
+        SkillQueryError: On syntax errors and unknown skills
+    """
+    tokens = []
+    position = 0
+    query = query or ""
+    while position < len(query):
+        match = TOKEN.match(query, position)
+        if not match:
+            break
+        position = match.end()
+        opening, closing, quoted, word = match.groups()
+        if opening or closing:
+            tokens.append(opening or closing)
+        elif quoted is not None:
+            tokens.append(("name", quoted))
+        elif word.lower() in OPERATORS:
+            tokens.append(word.lower())
+        elif tokens and isinstance(tokens[-1], tuple) and tokens[-1][0] == "word":
+            tokens[-1] = ("word", tokens[-1][1] + " " + word)
+        else:
+            tokens.append(("word", word))
+    if not tokens:
+        raise SkillQueryError("The query is empty")
+
+    def skill(name):
+        term = SKILL_IDS.get(name.strip().lower())
+        if term is None:
+            raise SkillQueryError(f"Unknown skill: {name.strip()}")
+        return ("skill", term + 1)
+
+    def parse_or(index):
+        node, index = parse_and(index)
+        while index < len(tokens) and tokens[index] == "or":
+            right, index = parse_and(index + 1)
+            node = ("or", node, right)
+        return node, index
+
+    def parse_and(index):
+        node, index = parse_not(index)
+        while index < len(tokens) and tokens[index] == "and":
+            right, index = parse_not(index + 1)
+            node = ("and", node, right)
+        return node, index
+
+    def parse_not(index):
+        if index >= len(tokens):
+            raise SkillQueryError("The query ends unexpectedly")
+        token = tokens[index]
+        if token == "not":
+            node, index = parse_not(index + 1)
+            return ("not", node), index
+        if token == "(":
+            node, index = parse_or(index + 1)
+            if index >= len(tokens) or tokens[index] != ")":
+                raise SkillQueryError("Missing closing parenthesis")
+            return node, index + 1
+        if isinstance(token, tuple):
+            return skill(token[1]), index + 1
+        raise SkillQueryError(f"Unexpected '{token.upper() if token in OPERATORS else token}'")
+
+    node, index = parse_or(0)
+    if index < len(tokens):
+        token = tokens[index]
+        raise SkillQueryError(f"Unexpected '{token[1] if isinstance(token, tuple) else token.upper()}'")
+    return node
+
+def write_skill_bitmaps(path, rows, revision=0):
+    """
+    Write the bitmap file for (resume id, skills field) rows in ascending id
+    order. The file is written next to path and moved into place, so readers
+    never see a partial file.
+
+    Args:
+        path: Where to write the file
+        rows: (resume id, skills) tuples
+        revision: The resume index revision the rows are a snapshot of
+
+    Returns:
+        int: The highest resume id written
+    """
+    ids = [array.array("Q") for _ in range(len(SKILLS) + 1)]
+    last_id = 0
+    for resume_id, skills in rows:
+        ids[ALL].append(resume_id)
+        for term in skill_terms(skills):
+            ids[term].append(resume_id)
+        last_id = resume_id
+
+    labels = json.dumps([""] + SKILLS).encode("utf-8")
+    data_start = HEADER.size + len(labels)
+    data_start += -data_start % 8 + TERM.size * len(ids)
+    terms, body = bytearray(), bytearray()
+    for term_ids in ids:
+        chunks = []
+        start = 0
+        while start < len(term_ids):
+            key = term_ids[start] >> CHUNK_BITS
+            end = start
+            while end < len(term_ids) and term_ids[end] >> CHUNK_BITS == key:
+                end += 1
+            chunks.append((key, [resume_id & CHUNK_MASK for resume_id in term_ids[start:end]]))
+            start = end
+        table_offset = data_start + len(body)
+        terms.extend(TERM.pack(table_offset, len(chunks), len(term_ids)))
+        data_offset = table_offset + CONTAINER.size * len(chunks)
+        containers = bytearray()
+        for key, lows in chunks:
+            if len(lows) <= ARRAY_MAX:
+                kind = ARRAY
+                values = array.array("H", lows)
+                if sys.byteorder == "big":
+                    values.byteswap()
+                data = values.tobytes()
+            else:
+                kind = BITMAP
+                bitmap = bytearray(BITMAP_BYTES)
+                for low in lows:
+                    bitmap[low >> 3] |= 1 << (low & 7)
+                data = bytes(bitmap)
+            body.extend(CONTAINER.pack(key, kind, len(lows), data_offset + len(containers)))
+            containers.extend(data)
+            _pad(containers)
+        body.extend(containers)
+
+    header = bytearray(HEADER.pack(MAGIC, VERSION, revision, len(ids), len(labels)))
+    header.extend(labels)
+    _pad(header)
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".skill_bitmap")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(terms)
+            f.write(body)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return last_id
+
+def _index_rows(resume_index):
+    after_id = 0
+    while True:
+        rows = resume_index.skills_since(after_id, BUILD_BATCH_SIZE)
+        yield from rows
+        if len(rows) < BUILD_BATCH_SIZE:
+            return
+        after_id = rows[-1][0]
+
+def build_skill_bitmaps(resume_index, path):
+    """Write the bitmap file for every resume in a ResumeIndex"""
+    # Read the revision first: rows changed while the file is written have
+    # later revisions, so the delta picks them up again
+    revision = resume_index.last_revision()
+    return write_skill_bitmaps(path, _index_rows(resume_index), revision)
+
+def _usable_file(path):
+    """Whether path holds a bitmap file this version can read"""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return False
+    return len(header) == HEADER.size and HEADER.unpack(header)[:2] == (MAGIC, VERSION)
+
+# Chunk containers as NumPy arrays: uint16 arrays of sorted low bits, or
+# 1024 uint64 words of bitmap
+
+def _is_bitmap(container):
+    return container.dtype.itemsize == 8
+
+def _contains(bitmap, values):
+    return (bitmap.view(np.uint8)[values >> 3] >> (values & 7).astype(np.uint8)) & 1 != 0
+
+def _to_bitmap(container):
+    if _is_bitmap(container):
+        return container
+    bits = np.zeros(CHUNK_SIZE, dtype=bool)
+    bits[container] = True
+    return np.packbits(bits, bitorder="little").view("<u8")
+
+def _and(a, b):
+    if _is_bitmap(a) and _is_bitmap(b):
+        return a & b
+    if _is_bitmap(a):
+        a, b = b, a
+    if _is_bitmap(b):
+        return a[_contains(b, a)]
+    return np.intersect1d(a, b, assume_unique=True)
+
+def _or(a, b):
+    if not _is_bitmap(a) and not _is_bitmap(b) and len(a) + len(b) <= ARRAY_MAX:
+        merged = np.sort(np.concatenate([a, b]))
+        return merged[np.concatenate([[True], merged[1:] != merged[:-1]])]
+    return _to_bitmap(a) | _to_bitmap(b)
+
+def _and_not(a, b):
+    if _is_bitmap(a):
+        return a & ~_to_bitmap(b)
+    # An array minus an array looks its ids up in a bitmap of the second,
+    # which is cheaper than a sorted set difference
+    return a[~_contains(_to_bitmap(b), a)]
+
+def _popcounts(words):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    return np.unpackbits(words.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+def _cardinality(container):
+    if not _is_bitmap(container):
+        return len(container)
+    return int(_popcounts(container).sum())
+
+def _ids_descending(container, key, offset, limit):
+    base = key << CHUNK_BITS
+    if not _is_bitmap(container):
+        return (container[::-1][offset:offset + limit].astype(np.int64) + base).tolist()
+    # Whole words before the offset are skipped by their bit counts; the
+    # rest are read bit by bit from the top until the page is full
+    words = np.flatnonzero(container)[::-1]
+    skipped = np.cumsum(_popcounts(container[words]))
+    start = int(np.searchsorted(skipped, offset, side="right"))
+    if start:
+        offset -= int(skipped[start - 1])
+    ids = []
+    for index in words[start:].tolist():
+        word = int(container[index])
+        while word:
+            bit = word.bit_length() - 1
+            word ^= 1 << bit
+            if offset:
+                offset -= 1
+                continue
+            ids.append(base + index * 64 + bit)
+            if len(ids) == limit:
+                return ids
+    return ids
+
+def _ids(container, key):
+    if _is_bitmap(container):
+        low = np.flatnonzero(np.unpackbits(container.view(np.uint8), bitorder="little"))
+    else:
+        low = container.astype(np.int64)
+    return low + (key << CHUNK_BITS)
+
+# Without NumPy: one Python int per term, bit n set for resume id n
+
+BIT_POSITIONS = [[bit for bit in range(8) if byte >> bit & 1] for byte in range(256)]
+BIT_COUNTS = [len(bits) for bits in BIT_POSITIONS]
+NONZERO = re.compile(rb"[^\x00]")
+
+def _int_ids(bits):
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    return [offset * 8 + bit for offset, byte in enumerate(data) if byte for bit in BIT_POSITIONS[byte]]
+
+def _int_ids_descending(bits, offset, limit):
+    # Reads the int from the top in windows that double in size, so a first
+    # page converts only the highest few thousand bits to bytes
+    ids = []
+    top = bits.bit_length()
+    width = CHUNK_SIZE
+    while top > 0 and len(ids) < limit:
+        low = max(top - width, 0)
+        window = (bits >> low) & ((1 << (top - low)) - 1)
+        count = window.bit_count()
+        if offset >= count:
+            offset -= count
+        else:
+            data = window.to_bytes((top - low + 7) // 8, "little")[::-1]
+            last = len(data) - 1
+            for match in NONZERO.finditer(data):
+                byte = data[match.start()]
+                if offset >= BIT_COUNTS[byte]:
+                    offset -= BIT_COUNTS[byte]
+                    continue
+                base = low + (last - match.start()) * 8
+                for bit in reversed(BIT_POSITIONS[byte]):
+                    if offset:
+                        offset -= 1
+                    elif len(ids) < limit:
+                        ids.append(base + bit)
+                if len(ids) == limit:
+                    break
+        top = low
+        width *= 2
+    return ids
+
+class SkillBitmapFile:
+    """A memory-mapped bitmap file, read-only; evaluate() runs a parsed query on it"""
+
+    def __init__(self, path, use_numpy=None):
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else use_numpy
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.revision, term_count, label_size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a skill bitmap file")
+        self.labels = json.loads(self._map[HEADER.size:HEADER.size + label_size])
+        if self.labels[1:] != SKILLS:
+            # Written with another vocabulary; resolve terms through the labels
+            self._term_map = {term: self.labels.index(skill) if skill in self.labels else None
+                              for term, skill in enumerate(SKILLS, 1)}
+        else:
+            self._term_map = None
+        offset = HEADER.size + label_size
+        offset += -offset % 8
+
+        # Only container tables are read up front; container data stays in the map
+        self._terms = []
+        for term in range(term_count):
+            table_offset, count, _ = TERM.unpack_from(self._map, offset + term * TERM.size)
+            containers = {}
+            for index in range(count):
+                key, kind, cardinality, data_offset = CONTAINER.unpack_from(
+                    self._map, table_offset + index * CONTAINER.size
+                )
+                if not self.use_numpy:
+                    containers[key] = (kind, cardinality, data_offset)
+                elif kind == BITMAP:
+                    containers[key] = np.frombuffer(self._map, "<u8", BITMAP_BYTES // 8, data_offset)
+                else:
+                    containers[key] = np.frombuffer(self._map, "<u2", cardinality, data_offset)
+            self._terms.append(containers if self.use_numpy else self._decode(containers))
+
+    def _decode(self, containers):
+        if not containers:
+            return 0
+        data = bytearray(BITMAP_BYTES * (max(containers) + 1))
+        for key, (kind, cardinality, offset) in containers.items():
+            base = key * BITMAP_BYTES
+            if kind == BITMAP:
+                data[base:base + BITMAP_BYTES] = self._map[offset:offset + BITMAP_BYTES]
+                continue
+            values = array.array("H", self._map[offset:offset + 2 * cardinality])
+            if sys.byteorder == "big":
+                values.byteswap()
+            for low in values:
+                data[base + (low >> 3)] |= 1 << (low & 7)
+        return int.from_bytes(data, "little")
+
+    def _term(self, term):
+        if self._term_map is not None:
+            term = self._term_map[term]
+            if term is None:
+                return {} if self.use_numpy else 0
+        return self._terms[term]
+
+    def evaluate(self, node):
+        """The bitmap of a parse_query() tree, for count(), page() and ids()"""
+        return self._evaluate(node) if self.use_numpy else self._evaluate_int(node)
+
+    def count(self, result):
+        if self.use_numpy:
+            return sum(_cardinality(container) for container in result.values())
+        return result.bit_count()
+
+    def page(self, result, offset, limit):
+        """Up to `limit` resume ids of a result, newest first, after skipping `offset`"""
+        if not self.use_numpy:
+            return _int_ids_descending(result, offset, limit)
+        ids = []
+        for key in sorted(result, reverse=True):
+            container = result[key]
+            cardinality = _cardinality(container)
+            if offset >= cardinality:
+                # Whole chunks before the page are skipped by their size
+                offset -= cardinality
+                continue
+            ids.extend(_ids_descending(container, key, offset, limit - len(ids)))
+            offset = 0
+            if len(ids) >= limit:
+                break
+        return ids
+
+    def count_above(self, result, resume_id):
+        """Number of ids in a result greater than resume_id"""
+        if not self.use_numpy:
+            return (result >> (resume_id + 1)).bit_count()
+        key, low = resume_id >> CHUNK_BITS, resume_id & CHUNK_MASK
+        count = 0
+        for chunk_key, container in result.items():
+            if chunk_key > key:
+                count += _cardinality(container)
+            elif chunk_key == key and _is_bitmap(container):
+                bits = np.unpackbits(container.view(np.uint8), bitorder="little")
+                count += int(bits[low + 1:].sum())
+            elif chunk_key == key:
+                count += len(container) - int(np.searchsorted(container, low, side="right"))
+        return count
+
+    def bitmap(self, ids):
+        """A result holding these ascending resume ids"""
+        if not self.use_numpy:
+            if not ids:
+                return 0
+            data = bytearray(ids[-1] // 8 + 1)
+            for resume_id in ids:
+                data[resume_id >> 3] |= 1 << (resume_id & 7)
+            return int.from_bytes(data, "little")
+        result = {}
+        ids = np.array(ids, dtype=np.int64)
+        keys = ids >> CHUNK_BITS
+        for key in np.unique(keys).tolist():
+            lows = (ids[keys == key] & CHUNK_MASK).astype(np.uint16)
+            result[key] = lows if len(lows) <= ARRAY_MAX else _to_bitmap(lows)
+        return result
+
+    def exclude(self, result, other):
+        """The ids of result that are not in other"""
+        if not self.use_numpy:
+            return result & ~other
+        return self._combine(result, other, _and_not)
+
+    def ids(self, result):
+        """All resume ids of a result, ascending"""
+        if not self.use_numpy:
+            return _int_ids(result)
+        if not result:
+            return []
+        return np.concatenate([_ids(result[key], key) for key in sorted(result)]).tolist()
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == "skill":
+            return self._term(node[1])
+        if kind == "not":
+            return self._combine(self._terms[ALL], self._evaluate(node[1]), _and_not)
+        left = self._evaluate(node[1])
+        if kind == "and" and node[2][0] == "not":
+            # a AND NOT b: no need to complement b against every resume
+            return self._combine(left, self._evaluate(node[2][1]), _and_not)
+        return self._combine(left, self._evaluate(node[2]), _and if kind == "and" else _or)
+
+    @staticmethod
+    def _combine(a, b, operation):
+        result = {}
+        if operation is _or:
+            result.update(a)
+            for key, container in b.items():
+                result[key] = _or(result[key], container) if key in result else container
+            return result
+        for key, container in a.items():
+            if key in b:
+                container = operation(container, b[key])
+            elif operation is _and:
+                continue
+            if len(container):
+                result[key] = container
+        return result
+
+    def _evaluate_int(self, node):
+        kind = node[0]
+        if kind == "skill":
+            return self._term(node[1])
+        if kind == "not":
+            return self._terms[ALL] & ~self._evaluate_int(node[1])
+        left, right = self._evaluate_int(node[1]), self._evaluate_int(node[2])
+        return left & right if kind == "and" else left | right
+
+class SkillBitmapIndex:
+    """
+    Skill bitmaps over a ResumeIndex: the mapped file plus a delta of the
+    resumes indexed or re-indexed since it was written. The delta holds each
+    of those resumes' current skills and overrides the file for their ids.
+    """
+
+    def __init__(self, resume_index, path, rebuild_rows=10000, use_numpy=None):
+        self.resume_index = resume_index
+        self.path = path
+        self.rebuild_rows = rebuild_rows
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else use_numpy
+        self._file = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self._delta_revision = 0
+        # term -> resume ids, and resume id -> (revision, terms)
+        self._delta = {}
+        self._delta_rows = {}
+        # The delta's ids as a result of the mapped file, built when needed
+        self._shadow = None
+
+    @property
+    def ready(self):
+        """Whether the file is mapped, so queries do not have to build it"""
+        return self._file is not None
+
+    def prepare(self):
+        """Build the file if it is missing or outdated, and map it; run at startup"""
+        with self._lock:
+            self._open()
+
+    def _open(self):
+        """Map the file, or map it again when it has been rebuilt (lock held)"""
+        if self._file is None and not _usable_file(self.path):
+            self.rebuild()
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._file is None:
+                raise
+            # Keep answering from the current map until the file is back
+            return
+        if self._file is not None and self._file.identity == (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+            return
+        # The old map is closed once queries still using it let it go
+        self._file = SkillBitmapFile(self.path, self.use_numpy)
+        revision = self._file.revision
+        # Changes the new file already holds leave the delta
+        for resume_id, (row_revision, terms) in list(self._delta_rows.items()):
+            if row_revision <= revision:
+                del self._delta_rows[resume_id]
+                for term in terms:
+                    self._delta[term].discard(resume_id)
+        self._delta_revision = max(self._delta_revision, revision)
+        self._shadow = None
+
+    def _sync(self):
+        while True:
+            rows = self.resume_index.skills_changed_since(self._delta_revision, SYNC_BATCH_SIZE)
+            for revision, resume_id, skills in rows:
+                previous = self._delta_rows.get(resume_id)
+                if previous is None:
+                    self._shadow = None
+                else:
+                    for term in previous[1]:
+                        self._delta[term].discard(resume_id)
+                terms = skill_terms(skills)
+                self._delta_rows[resume_id] = (revision, terms)
+                for term in terms:
+                    self._delta.setdefault(term, set()).add(resume_id)
+            if rows:
+                self._delta_revision = rows[-1][0]
+            if len(rows) < SYNC_BATCH_SIZE:
+                break
+        if len(self._delta_rows) >= self.rebuild_rows and not self._rebuilding:
+            self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_background, name="skill-bitmap-rebuild", daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            print(f"Could not rebuild skill bitmaps: {e}")
+        finally:
+            self._rebuilding = False
+
+    def rebuild(self):
+        """Rewrite the file from the resume index, unless another process is already at it"""
+        lock_file = open(self.path + ".lock", "a") if fcntl is not None else None
+        try:
+            if lock_file is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    # Queries go on with the current file; without one, wait
+                    # for the other process to write it
+                    if _usable_file(self.path):
+                        return
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    if _usable_file(self.path):
+                        return
+            build_skill_bitmaps(self.resume_index, self.path)
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+    def _delta_query(self, node):
+        kind = node[0]
+        if kind == "skill":
+            return self._delta.get(node[1], set())
+        if kind == "not":
+            return self._delta_rows.keys() - self._delta_query(node[1])
+        left, right = self._delta_query(node[1]), self._delta_query(node[2])
+        return left & right if kind == "and" else left | right
+
+    def _evaluate(self, query):
+        node = parse_query(query)
+        with self._lock:
+            self._open()
+            self._sync()
+            bitmap_file = self._file
+            if self._shadow is None:
+                self._shadow = bitmap_file.bitmap(sorted(self._delta_rows))
+            shadow = self._shadow
+            recent = sorted(self._delta_query(node), reverse=True)
+        result = bitmap_file.evaluate(node)
+        if shadow:
+            # The file's entries for resumes in the delta may be outdated
+            result = bitmap_file.exclude(result, shadow)
+        return bitmap_file, result, recent
+
+    def query(self, query):
+        """
+        Resume ids matching a boolean skill query
+
+        Returns:
+            list: Matching resume ids, ascending
+
+        Raises:
+            SkillQueryError: When the query cannot be parsed
+        """
+        bitmap_file, result, recent = self._evaluate(query)
+        return sorted(bitmap_file.ids(result) + recent)
+
+    def search(self, query, page=1, per_page=20):
+        """
+        Resumes matching a boolean skill query, newest first. Only the ids
+        of the requested page are read out of the bitmaps.
+
+        Returns:
+            dict: {"total", "page", "per_page", "results"} with the resume
+                index's RESULT_FIELDS for each result
+
+        Raises:
+            SkillQueryError: When the query cannot be parsed
+        """
+        bitmap_file, result, recent = self._evaluate(query)
+        start = (page - 1) * per_page
+        # The delta's match at recent[j] comes at j + (file matches above it)
+        # in the merged order; count the ones that come before the page
+        before, high = 0, len(recent)
+        while before < high:
+            middle = (before + high) // 2
+            if middle + bitmap_file.count_above(result, recent[middle]) < start:
+                before = middle + 1
+            else:
+                high = middle
+        candidates = recent[before:before + per_page] + bitmap_file.page(result, start - before, per_page)
+        page_ids = sorted(candidates, reverse=True)[:per_page]
+        rows = {row["id"]: row for row in self.resume_index.get(page_ids)}
+        return {
+            "total": len(recent) + bitmap_file.count(result), "page": page, "per_page": per_page,
+            "results": [rows[resume_id] for resume_id in page_ids if resume_id in rows],
+        }
+
+_index = None
+
+def get_skill_bitmap_index(resume_index):
+    """The configured SkillBitmapIndex over resume_index"""
+    global _index
+    import config
+    if _index is None:
+        _index = SkillBitmapIndex(resume_index, config.SKILL_BITMAP_PATH, config.SKILL_BITMAP_REBUILD_ROWS)
+    return _index
+
+if __name__ == "__main__":
+    import config
+    from utils.resume_index import ResumeIndex
+    last_id = build_skill_bitmaps(ResumeIndex(config.RESUME_INDEX_PATH), config.SKILL_BITMAP_PATH)
+    print(f"Wrote skill bitmaps up to resume {last_id} to {config.SKILL_BITMAP_PATH}")
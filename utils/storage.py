@@ -0,0 +1,298 @@
+# utils/storage.py
+import os
+import io
+import time
+import shutil
+import tempfile
+import importlib.util
+from collections import namedtuple
+from urllib.parse import quote
+from utils.storage_manager import shard_path, ensure_parent_dir, scan_files
+
+# boto3 is only imported when the S3 backend is constructed
+S3_AVAILABLE = importlib.util.find_spec("boto3") is not None
+
+# Namespaces used as the first component of every storage key
+RESUMES = "resumes"
+UPLOADS = "uploads"
+TEMPLATES = "templates"
+
+ObjectInfo = namedtuple("ObjectInfo", ["key", "size", "last_used", "modified"])
+
+def storage_key(namespace, name):
+    """Build a storage key such as 'resumes/resume_<hash>.docx'"""
+    return f"{namespace}/{name}"
+
+class ArtifactStorage:
+    """Interface shared by every backend that holds uploads and generated resumes"""
+
+    def put(self, key, fileobj, content_type=None):
+        """Stream a file-like object into storage under `key`"""
+        raise NotImplementedError
+
+    def put_bytes(self, key, data, content_type=None):
+        self.put(key, io.BytesIO(data), content_type=content_type)
+
+    def put_file(self, key, path, content_type=None):
+        """Store a local file under `key` and remove the original"""
+        with open(path, "rb") as f:
+            self.put(key, f, content_type=content_type)
+        os.remove(path)
+
+    def open(self, key):
+        """Return a readable binary stream for `key`"""
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def stat(self, key):
+        """Return an ObjectInfo for `key`, or None if it does not exist"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove `key`; returns False if it was already gone"""
+        raise NotImplementedError
+
+    def list(self, namespace):
+        """Yield an ObjectInfo for every object in a namespace"""
+        raise NotImplementedError
+
+    def touch(self, key):
+        """Record that `key` was just used (for LRU eviction)"""
+
+    def local_path(self, key):
+        """Path on this node's disk, or None when objects are remote"""
+        return None
+
+    def download_url(self, key, filename=None, content_type=None, expires_in=3600):
+        """URL a browser can fetch the object from"""
+        raise NotImplementedError
+
+    def cleanup_incomplete(self, max_age):
+        """Discard partial writes abandoned for longer than `max_age` seconds"""
+
+class LocalStorage(ArtifactStorage):
+    """Objects stored as files in hash-sharded folders on this node"""
+
+    STAGING_DIR = ".staging"
+
+    def __init__(self, folders, download_base="/download"):
+        """
+        Args:
+            folders: dict mapping namespace to folder, e.g. {"resumes": "resumes"}
+            download_base: App route that serves the resumes namespace
+        """
+        self.folders = folders
+        self.download_base = download_base
+
+    def _path(self, key):
+        namespace, _, name = key.partition("/")
+        if namespace not in self.folders or not name or os.path.basename(name) != name or name.startswith('.'):
+            raise KeyError(key)
+        return shard_path(self.folders[namespace], name)
+
+    def put(self, key, fileobj, content_type=None):
+        path = self._path(key)
+        ensure_parent_dir(path)
+        staging = os.path.join(self.folders[key.partition("/")[0]], self.STAGING_DIR)
+        os.makedirs(staging, exist_ok=True)
+
+        # Write to a staging file first so a concurrent reader never sees a
+        # half-written object
+        fd, temp_path = tempfile.mkstemp(dir=staging)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(fileobj, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def put_file(self, key, path, content_type=None):
+        path_in_storage = self._path(key)
+        ensure_parent_dir(path_in_storage)
+        try:
+            # A rename avoids copying when the file is already on this disk
+            os.replace(path, path_in_storage)
+        except OSError:
+            super().put_file(key, path, content_type=content_type)
+
+    def open(self, key):
+        try:
+            return open(self._path(key), "rb")
+        except KeyError:
+            raise FileNotFoundError(key)
+
+    def exists(self, key):
+        try:
+            return os.path.isfile(self._path(key))
+        except KeyError:
+            return False
+
+    def stat(self, key):
+        try:
+            stat = os.stat(self._path(key))
+        except (KeyError, FileNotFoundError):
+            return None
+        return ObjectInfo(key, stat.st_size, max(stat.st_atime, stat.st_mtime), stat.st_mtime)
+
+    def delete(self, key):
+        try:
+            path = self._path(key)
+            os.remove(path)
+        except (KeyError, FileNotFoundError):
+            return False
+
+        # Drop shard directories left empty
+        parent = os.path.dirname(path)
+        root = os.path.abspath(self.folders[key.partition("/")[0]])
+        while os.path.abspath(parent) != root:
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
+        return True
+
+    def list(self, namespace):
+        folder = self.folders[namespace]
+        staging = os.path.join(folder, self.STAGING_DIR)
+        for path, size, last_used, mtime in scan_files(folder):
+            if os.path.dirname(path) == staging:
+                continue
+            yield ObjectInfo(storage_key(namespace, os.path.basename(path)), size, last_used, mtime)
+
+    def touch(self, key):
+        try:
+            path = self._path(key)
+            os.utime(path, (time.time(), os.stat(path).st_mtime))
+        except (KeyError, FileNotFoundError):
+            pass
+
+    def local_path(self, key):
+        return self._path(key)
+
+    def download_url(self, key, filename=None, content_type=None, expires_in=3600):
+        # Served by the app itself, which adds its own validators and caching
+        return f"{self.download_base}/{quote(key.partition('/')[2])}"
+
+    def cleanup_incomplete(self, max_age):
+        now = time.time()
+        for folder in self.folders.values():
+            staging = os.path.join(folder, self.STAGING_DIR)
+            for path, size, last_used, mtime in scan_files(staging):
+                if now - mtime > max_age:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+
+class S3Storage(ArtifactStorage):
+    """Objects stored in an S3-compatible bucket shared by every app node"""
+
+    def __init__(self, bucket, prefix="", endpoint_url=None, region=None,
+                 access_key_id=None, secret_access_key=None):
+        if not S3_AVAILABLE:
+            raise RuntimeError("The S3 storage backend requires boto3. Install it with: pip install boto3")
+        import boto3
+        from botocore.exceptions import ClientError
+        self._client_error = ClientError
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+        )
+
+    def _object_key(self, key):
+        return self.prefix + key
+
+    def put(self, key, fileobj, content_type=None):
+        extra_args = {"ContentType": content_type} if content_type else None
+        # upload_fileobj streams in parts, so large files never sit in memory
+        self.client.upload_fileobj(fileobj, self.bucket, self._object_key(key), ExtraArgs=extra_args)
+
+    def open(self, key):
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))["Body"]
+        except self._client_error as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                raise FileNotFoundError(key)
+            raise
+
+    def exists(self, key):
+        return self.stat(key) is not None
+
+    def stat(self, key):
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except self._client_error as e:
+            if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+                return None
+            raise
+        modified = head["LastModified"].timestamp()
+        return ObjectInfo(key, head["ContentLength"], modified, modified)
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+        return True
+
+    def list(self, namespace):
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._object_key(namespace + "/")):
+            for item in page.get("Contents", []):
+                key = item["Key"][len(self.prefix):]
+                modified = item["LastModified"].timestamp()
+                # S3 has no access time; LRU falls back to the upload time
+                yield ObjectInfo(key, item["Size"], modified, modified)
+
+    def download_url(self, key, filename=None, content_type=None, expires_in=3600):
+        params = {"Bucket": self.bucket, "Key": self._object_key(key)}
+        if filename:
+            params["ResponseContentDisposition"] = f"attachment; filename*=utf-8''{quote(filename)}"
+        if content_type:
+            params["ResponseContentType"] = content_type
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+
+    def cleanup_incomplete(self, max_age):
+        now = time.time()
+        paginator = self.client.get_paginator("list_multipart_uploads")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for upload in page.get("Uploads", []):
+                if now - upload["Initiated"].timestamp() > max_age:
+                    self.client.abort_multipart_upload(
+                        Bucket=self.bucket, Key=upload["Key"], UploadId=upload["UploadId"]
+                    )
+
+_storage = None
+
+def get_storage():
+    """Return the process-wide storage backend selected by config.STORAGE_BACKEND"""
+    global _storage
+    if _storage is None:
+        import config
+        if config.STORAGE_BACKEND == "s3":
+            _storage = S3Storage(
+                config.S3_BUCKET,
+                prefix=config.S3_PREFIX,
+                endpoint_url=config.S3_ENDPOINT_URL,
+                region=config.S3_REGION,
+                access_key_id=config.S3_ACCESS_KEY_ID,
+                secret_access_key=config.S3_SECRET_ACCESS_KEY,
+            )
+        elif config.STORAGE_BACKEND == "local":
+            _storage = LocalStorage({
+                RESUMES: config.RESUME_FOLDER,
+                UPLOADS: config.UPLOAD_FOLDER,
+                TEMPLATES: config.TEMPLATE_FOLDER,
+            })
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {config.STORAGE_BACKEND}")
+    return _storage
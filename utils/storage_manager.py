@@ -0,0 +1,135 @@
+# utils/storage_manager.py
+import os
+import time
+import asyncio
+import hashlib
+from starlette.concurrency import run_in_threadpool
+
+# Cross-process lock so only one worker runs the lifecycle sweeps
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Two levels of 256 shards keep every directory small even with millions of files
+SHARD_DEPTH = 2
+
+# Leave in-flight partial writes alone for a while before treating them as orphans
+TEMP_FILE_GRACE_SECONDS = 3600
+
+def shard_path(folder, filename):
+    """Return the hash-sharded location of a file, e.g. folder/3f/a2/filename"""
+    digest = hashlib.sha256(filename.encode("utf-8")).hexdigest()
+    shards = [digest[i * 2:i * 2 + 2] for i in range(SHARD_DEPTH)]
+    return os.path.join(folder, *shards, filename)
+
+def ensure_parent_dir(path):
+    """Create the shard directories for a path if needed"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+def scan_files(folder):
+    """Walk a storage folder and return (path, size, last_used, mtime) for every file"""
+    files = []
+    stack = [folder]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    last_used = max(stat.st_atime, stat.st_mtime)
+                    files.append((entry.path, stat.st_size, last_used, stat.st_mtime))
+            except FileNotFoundError:
+                continue
+    return files
+
+def enforce_retention(storage, retention, quota_bytes):
+    """
+    Apply the age limit of each namespace, then evict least recently used
+    objects across all namespaces until their combined size fits in the quota
+
+    Args:
+        storage: ArtifactStorage backend holding the objects
+        retention: dict mapping namespace to max age in seconds
+        quota_bytes: total size allowed across all namespaces (0 disables the quota)
+
+    Returns:
+        dict: Number of objects and bytes removed, and bytes remaining
+    """
+    now = time.time()
+    stats = {"expired": 0, "evicted": 0, "bytes_removed": 0, "bytes_remaining": 0}
+    survivors = []
+
+    storage.cleanup_incomplete(TEMP_FILE_GRACE_SECONDS)
+
+    for namespace, max_age in retention.items():
+        for info in storage.list(namespace):
+            if max_age and now - info.last_used > max_age:
+                if storage.delete(info.key):
+                    stats["expired"] += 1
+                    stats["bytes_removed"] += info.size
+            else:
+                survivors.append((info.last_used, info.size, info.key))
+
+    total = sum(size for _, size, _ in survivors)
+    if quota_bytes and total > quota_bytes:
+        survivors.sort()
+        for last_used, size, key in survivors:
+            if total <= quota_bytes:
+                break
+            if storage.delete(key):
+                stats["evicted"] += 1
+                stats["bytes_removed"] += size
+            total -= size
+
+    stats["bytes_remaining"] = total
+    return stats
+
+def try_lock(path):
+    """
+    Take an exclusive lock on a file without waiting.
+
+    Returns:
+        The open lock file, held until it is closed, or None if another
+        process holds the lock
+    """
+    ensure_parent_dir(path)
+    lock_file = open(path, "a")
+    if fcntl is None:
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+async def run_storage_lifecycle(storage, retention, quota_bytes, interval, lock_path=None):
+    """
+    Background task that enforces retention every `interval` seconds.
+    With `lock_path`, only the process holding that lock sweeps; the others
+    try to take it over each interval, e.g. after its worker is restarted.
+    """
+    lock = None
+    try:
+        while True:
+            if lock is None and lock_path:
+                lock = try_lock(lock_path)
+            if lock is not None or not lock_path:
+                try:
+                    stats = await run_in_threadpool(enforce_retention, storage, retention, quota_bytes)
+                    if stats["expired"] or stats["evicted"]:
+                        print(f"Storage cleanup: {stats['expired']} expired, {stats['evicted']} evicted, "
+                              f"{stats['bytes_removed']} bytes freed, {stats['bytes_remaining']} bytes in use")
+                except Exception as e:
+                    print(f"Storage cleanup failed: {e}")
+            await asyncio.sleep(interval)
+    finally:
+        if lock is not None:
+            lock.close()
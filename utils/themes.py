@@ -0,0 +1,254 @@
+# utils/themes.py - Named resume themes and uploaded DOCX templates
+#
+# A theme sets the font, page margin and block styles every renderer uses.
+# For DOCX output each theme, and each uploaded template, is compiled once
+# into a base package that already holds its styles and page setup; a render
+# opens that package and only adds the content. Compiled packages are kept in
+# a bounded LRU keyed by the theme's hash (the SHA-256 for templates).
+
+import io
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from utils.resume_layout import STYLES, FONT, PAGE_MARGIN, TEXT_FIELDS, LIST_FIELDS
+from utils.storage import storage_key, TEMPLATES
+
+DEFAULT_THEME = "classic"
+
+# Number of compiled base packages kept in memory
+COMPILED_CACHE_SIZE = 32
+
+# {{ field }} placeholders an uploaded template may use. {{ content }} must
+# sit alone in a body paragraph and marks where the resume sections go.
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_]+)\s*\}\}")
+CONTENT_PLACEHOLDER = "content"
+TEMPLATE_FIELDS = TEXT_FIELDS + LIST_FIELDS + (CONTENT_PLACEHOLDER,)
+
+TEMPLATE_ID = re.compile(r"^[0-9a-f]{64}$")
+
+# A theme's base package and the style id of each style name in it, so
+# renders can set paragraph styles without python-docx's name lookups
+CompiledTheme = namedtuple("CompiledTheme", ["package", "style_ids"])
+
+class TemplateError(ValueError):
+    """An uploaded template is not a usable DOCX template"""
+
+class Theme:
+    """Font, page margin and per-block style overrides on top of STYLES"""
+
+    def __init__(self, name, label=None, font=FONT, page_margin=PAGE_MARGIN, styles=None):
+        self.name = name
+        self.label = label or name.title()
+        self.font = font
+        self.page_margin = page_margin
+        overrides = styles or {}
+        self.styles = OrderedDict((kind, dict(spec, **overrides.get(kind, {}))) for kind, spec in STYLES.items())
+        definition = {"font": font, "page_margin": page_margin, "styles": self.styles}
+        self.key = hashlib.sha256(json.dumps(definition, sort_keys=True).encode("utf-8")).hexdigest()
+
+class DocxTemplate(Theme):
+    """
+    An uploaded .docx: its {{ field }} placeholders are filled in and the
+    resume's sections are inserted at {{ content }}. Styles named like the
+    built-in ones (ResumeHeading, ResumeBullet, ...) restyle those blocks;
+    missing ones fall back to the default theme.
+    """
+
+    def __init__(self, template_id, storage):
+        super().__init__(f"template:{template_id}", label="Uploaded template")
+        self.template_id = template_id
+        self.storage = storage
+        self.key = template_id
+
+THEMES = OrderedDict()
+
+def register_theme(theme):
+    THEMES[theme.name] = theme
+    return theme
+
+register_theme(Theme(DEFAULT_THEME))
+register_theme(Theme(
+    "modern", font="Arial",
+    styles={
+        "title": {"size": 26, "color": (33, 37, 41)},
+        "subtitle": {"color": (0, 121, 107)},
+        "heading": {"size": 13, "color": (0, 121, 107), "space_before": 14},
+        "subheading": {"size": 11.5},
+    },
+))
+register_theme(Theme(
+    "compact", page_margin=0.5,
+    styles={
+        "title": {"size": 20},
+        "subtitle": {"size": 12, "space_after": 3},
+        "contact": {"size": 9, "space_after": 6},
+        "heading": {"size": 12, "space_before": 8, "space_after": 3},
+        "subheading": {"size": 11, "space_before": 4},
+        "meta": {"size": 9, "space_after": 2},
+        "paragraph": {"size": 10, "space_after": 3},
+        "bullet": {"size": 10, "indent": 0.2, "space_after": 1},
+    },
+))
+
+def template_key(template_id):
+    return storage_key(TEMPLATES, f"template_{template_id}.docx")
+
+def get_theme(name=None, template_id=None, storage=None):
+    """
+    Resolve the theme for a request
+
+    Raises:
+        TemplateError: If the theme name or template id is unknown
+    """
+    if template_id:
+        if not TEMPLATE_ID.match(template_id) or storage is None or not storage.exists(template_key(template_id)):
+            raise TemplateError(f"Unknown template: {template_id}")
+        return DocxTemplate(template_id, storage)
+    theme = THEMES.get(name or DEFAULT_THEME)
+    if theme is None:
+        raise TemplateError(f"Unknown theme: {name}")
+    return theme
+
+def add_styles(doc, theme, skip_existing=False):
+    """Add the theme's paragraph styles to a python-docx Document"""
+    from docx.shared import Pt, Inches, RGBColor
+    from docx.enum.style import WD_STYLE_TYPE
+
+    existing = {style.name for style in doc.styles}
+    for spec in theme.styles.values():
+        if skip_existing and spec["name"] in existing:
+            continue
+        style = doc.styles.add_style(spec["name"], WD_STYLE_TYPE.PARAGRAPH)
+        style.font.name = theme.font
+        style.font.size = Pt(spec["size"])
+        if spec.get("bold"):
+            style.font.bold = True
+        if spec.get("italic"):
+            style.font.italic = True
+        if "color" in spec:
+            style.font.color.rgb = RGBColor(*spec["color"])
+        if "indent" in spec:
+            style.paragraph_format.left_indent = Inches(spec["indent"])
+        if "space_before" in spec:
+            style.paragraph_format.space_before = Pt(spec["space_before"])
+        style.paragraph_format.space_after = Pt(spec["space_after"])
+
+def template_paragraphs(doc):
+    """Every paragraph placeholders may appear in: body, table cells, headers and footers"""
+    yield from doc.paragraphs
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                yield from cell.paragraphs
+    for section in doc.sections:
+        # Reading a linked header or footer would add a new one to the document
+        for part in (section.header, section.footer, section.first_page_header, section.first_page_footer):
+            if not part.is_linked_to_previous:
+                yield from part.paragraphs
+
+def is_content_anchor(paragraph):
+    match = PLACEHOLDER.fullmatch(paragraph.text.strip())
+    return match is not None and match.group(1) == CONTENT_PLACEHOLDER
+
+def _compile_theme(theme):
+    from docx import Document
+    from docx.shared import Inches
+
+    doc = Document()
+    for section in doc.sections:
+        section.top_margin = Inches(theme.page_margin)
+        section.bottom_margin = Inches(theme.page_margin)
+        section.left_margin = Inches(theme.page_margin)
+        section.right_margin = Inches(theme.page_margin)
+    add_styles(doc, theme)
+    return doc
+
+def compile_template(package):
+    """
+    Validate an uploaded template and compile it into a base package
+
+    Placeholders split across runs are merged into one run so rendering only
+    has to substitute text, and missing block styles are added.
+
+    Returns:
+        tuple: (python-docx Document, sorted placeholder names)
+
+    Raises:
+        TemplateError: If the file is not a DOCX or its placeholders are invalid
+    """
+    from docx import Document
+    try:
+        doc = Document(io.BytesIO(package))
+    except Exception as e:
+        raise TemplateError(f"Not a valid DOCX file: {e}")
+
+    placeholders = set()
+    for paragraph in template_paragraphs(doc):
+        found = PLACEHOLDER.findall(paragraph.text)
+        if not found:
+            continue
+        placeholders.update(found)
+        # Merge the runs so no placeholder is split; the first run's formatting is kept
+        text = paragraph.text
+        for run in paragraph.runs[1:]:
+            run._r.getparent().remove(run._r)
+        if paragraph.runs:
+            paragraph.runs[0].text = text
+
+    unknown = sorted(placeholders - set(TEMPLATE_FIELDS))
+    if unknown:
+        raise TemplateError(f"Unknown placeholders: {', '.join(unknown)}")
+    if len([p for p in doc.paragraphs if is_content_anchor(p)]) != 1:
+        raise TemplateError("The template needs exactly one paragraph containing only {{ content }}")
+
+    add_styles(doc, THEMES[DEFAULT_THEME], skip_existing=True)
+    return doc, sorted(placeholders)
+
+def _compile(theme):
+    if isinstance(theme, DocxTemplate):
+        with theme.storage.open(template_key(theme.template_id)) as f:
+            doc, _ = compile_template(f.read())
+    else:
+        doc = _compile_theme(theme)
+    package = io.BytesIO()
+    doc.save(package)
+    return CompiledTheme(package.getvalue(), {style.name: style.style_id for style in doc.styles})
+
+_compiled = OrderedDict()
+_compiled_lock = threading.Lock()
+
+def compiled_theme(theme):
+    """The theme's CompiledTheme, compiled on first use"""
+    with _compiled_lock:
+        compiled = _compiled.get(theme.key)
+        if compiled is not None:
+            _compiled.move_to_end(theme.key)
+            return compiled
+    compiled = _compile(theme)
+    with _compiled_lock:
+        _compiled[theme.key] = compiled
+        while len(_compiled) > COMPILED_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return compiled
+
+def save_template(storage, package):
+    """
+    Validate an uploaded template and store it under its SHA-256
+
+    Returns:
+        tuple: (template id, placeholder names)
+
+    Raises:
+        TemplateError: If the template is invalid
+    """
+    _, placeholders = compile_template(package)
+    template_id = hashlib.sha256(package).hexdigest()
+    key = template_key(template_id)
+    if not storage.exists(key):
+        storage.put_bytes(
+            key, package,
+            content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        )
+    return template_id, placeholders
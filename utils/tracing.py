@@ -0,0 +1,437 @@
+# utils/tracing.py - Lightweight request tracing
+#
+# Spans are timed with context managers and nest through a context variable,
+# so work handed to the threadpool stays attached to the request's trace.
+# Finished spans go to the configured exporter: a JSON-lines file, or an
+# OTLP/HTTP collector (JSON encoding, e.g. an OpenTelemetry Collector or
+# Jaeger on port 4318). Trace ids follow W3C Trace Context, so an incoming
+# `traceparent` header is continued and every response carries one.
+
+import os
+import json
+import time
+import queue
+import logging
+import threading
+import contextvars
+import urllib.request
+from contextlib import contextmanager
+from functools import wraps
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+
+class Span:
+    """A timed operation with attributes, belonging to a trace"""
+
+    def __init__(self, name, trace_id=None, parent_id=None, kind=SPAN_KIND_INTERNAL, attributes=None, start_ns=None):
+        self.name = name
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.last_child_end_ns = None
+        self.error = None
+        self._parent = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def record_error(self, exception):
+        self.error = f"{type(exception).__name__}: {exception}"
+
+    def end(self, end_ns=None):
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        if self._parent is not None:
+            self._parent.last_child_end_ns = self.end_ns
+        export_span(self)
+
+    @property
+    def duration_ms(self):
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    @property
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+def current_span():
+    """
+    The innermost active span of this request, or None. Without an exporter
+    traced functions open no span of their own, so attributes they set go to
+    a no-op span instead of whatever span encloses them.
+    """
+    if _exporter is None:
+        return _NOOP_SPAN
+    return _current_span.get()
+
+def current_trace_id():
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+class _NoopSpan:
+    """Stands in for child spans while no exporter is configured"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def record_error(self, exception):
+        pass
+
+    def end(self, end_ns=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+def start_span(name, **attributes):
+    """
+    Start a child of the current span without making it current. Call
+    end() on the result; useful for timing a stretch of straight-line code.
+    """
+    if _exporter is None:
+        return _NOOP_SPAN
+    parent = _current_span.get()
+    span = Span(
+        name,
+        trace_id=parent.trace_id if parent else None,
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes,
+    )
+    span._parent = parent
+    return span
+
+def span(name, **attributes):
+    """Time the enclosed block as a child of the current span"""
+    # Without an exporter the span would be thrown away, so skip creating it
+    if _exporter is None:
+        return _NOOP_SPAN
+    return _child_span(name, attributes)
+
+@contextmanager
+def _child_span(name, attributes):
+    child = start_span(name, **attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+def traced(name=None):
+    """Decorator running a function inside a span named after it"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _exporter is None:
+                return func(*args, **kwargs)
+            with _child_span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_span_since_last(name, **attributes):
+    """
+    Record a span covering the time since the current span's previous child
+    ended (or since it started). Used for work that happens before our code
+    runs, such as the framework receiving a multipart body.
+    """
+    parent = _current_span.get()
+    if parent is None or _exporter is None:
+        return None
+    child = start_span(name, **attributes)
+    child.start_ns = parent.last_child_end_ns or parent.start_ns
+    child.end()
+    return child
+
+def parse_traceparent(header):
+    """Return (trace_id, parent_span_id) from a W3C traceparent header, or (None, None)"""
+    parts = (header or "").strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None, None
+    trace_id, parent_id = parts[1].lower(), parts[2].lower()
+    try:
+        int(trace_id, 16)
+        int(parent_id, 16)
+    except ValueError:
+        return None, None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None, None
+    return trace_id, parent_id
+
+class BackgroundExporter:
+    """
+    Base for exporters that hand spans to _send() in batches on a background
+    thread, so requests never wait on the export; spans are dropped if the
+    queue is full.
+    """
+
+    MAX_QUEUE = 10000
+    BATCH_SIZE = 256
+    FLUSH_INTERVAL = 2.0
+    THREAD_NAME = "span-exporter"
+
+    def __init__(self):
+        self.queue = queue.Queue(self.MAX_QUEUE)
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        # Start the sender lazily, and again after a fork
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self.queue = queue.Queue(self.MAX_QUEUE)
+                    self._thread = threading.Thread(target=self._run, name=self.THREAD_NAME, daemon=True)
+                    self._thread.start()
+                    self._pid = os.getpid()
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._send(batch)
+            except Exception as e:
+                print(f"Could not export {len(batch)} spans: {e}")
+
+    def _send(self, spans):
+        raise NotImplementedError
+
+class JsonFileExporter(BackgroundExporter):
+    """Appends each finished span as one JSON line"""
+
+    FLUSH_INTERVAL = 0.5
+    THREAD_NAME = "span-file-exporter"
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._file = None
+        self._file_pid = None
+
+    def _send(self, spans):
+        # Reopen after a fork so each worker has its own handle
+        if self._file is None or self._file_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a")
+            self._file_pid = os.getpid()
+        self._file.write("".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans))
+        self._file.flush()
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+class OtlpHttpExporter(BackgroundExporter):
+    """
+    Sends spans in batches to an OTLP/HTTP endpoint using the JSON encoding.
+    Spans are dropped while the collector is unreachable.
+    """
+
+    THREAD_NAME = "otlp-exporter"
+
+    def __init__(self, endpoint, service_name, timeout=5):
+        super().__init__()
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self._failing = False
+
+    def _payload(self, spans):
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "utils.tracing"}, "spans": otlp_spans}],
+            }]
+        }
+
+    def _send(self, spans):
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self._payload(spans)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+            self._failing = False
+        except Exception as e:
+            # Report once per outage rather than for every batch
+            if not self._failing:
+                print(f"Could not export {len(spans)} spans to {self.endpoint}: {e}")
+            self._failing = True
+
+_exporter = None
+
+def configure_tracing(exporter):
+    """Set the exporter that receives finished spans (None disables export)"""
+    global _exporter
+    _exporter = exporter
+
+def exporter_from_config():
+    """Build the exporter selected by config.TRACING_EXPORTER"""
+    import config
+    if config.TRACING_EXPORTER == "file":
+        return JsonFileExporter(config.TRACING_FILE)
+    if config.TRACING_EXPORTER == "otlp":
+        return OtlpHttpExporter(config.OTLP_ENDPOINT, config.TRACING_SERVICE_NAME)
+    if config.TRACING_EXPORTER in ("", "none"):
+        return None
+    raise ValueError(f"Unknown TRACING_EXPORTER: {config.TRACING_EXPORTER}")
+
+def export_span(span):
+    if _exporter is not None:
+        try:
+            _exporter.export(span)
+        except Exception as e:
+            print(f"Could not export span {span.name}: {e}")
+
+class TraceContextFilter(logging.Filter):
+    """Adds trace_id and span_id to log records and prefixes the message with the trace id"""
+
+    def filter(self, record):
+        span = _current_span.get()
+        record.trace_id = span.trace_id if span else "-"
+        record.span_id = span.span_id if span else "-"
+        if span is not None and not getattr(record, "_trace_prefixed", False):
+            record.msg = f"[trace_id={span.trace_id}] {record.msg}"
+            record._trace_prefixed = True
+        return True
+
+def install_log_filter(logger_names=("uvicorn.access", "uvicorn.error")):
+    """Attach the trace context to records emitted by the given loggers"""
+    log_filter = TraceContextFilter()
+    for name in logger_names:
+        logging.getLogger(name).addFilter(log_filter)
+
+def log(message):
+    """print() with the current trace id, for the app's own diagnostic output"""
+    trace_id = current_trace_id()
+    print(f"[trace_id={trace_id}] {message}" if trace_id else message)
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a server span per HTTP request, continuing an
+    incoming traceparent and returning the trace id in response headers
+    """
+
+    def __init__(self, app, route_of=None):
+        """
+        Args:
+            app: ASGI application
+            route_of: Optional callable mapping an ASGI scope to its route template
+        """
+        self.app = app
+        self.route_of = route_of
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope["headers"]:
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+        trace_id, parent_id = parse_traceparent(traceparent)
+        route = self.route_of(scope) if self.route_of else scope["path"]
+
+        root = Span(
+            f"{scope['method']} {route}",
+            trace_id=trace_id,
+            parent_id=parent_id,
+            kind=SPAN_KIND_SERVER,
+            attributes={"http.method": scope["method"], "http.route": route, "http.target": scope["path"]},
+        )
+        token = _current_span.set(root)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                headers = list(message.get("headers", []))
+                headers.append((b"traceparent", root.traceparent.encode()))
+                headers.append((b"x-trace-id", root.trace_id.encode()))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            root.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            root.end()
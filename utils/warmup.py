@@ -0,0 +1,153 @@
+# utils/warmup.py
+import io
+import os
+import time
+import importlib
+import threading
+from utils.tracing import span
+
+# Heavy modules imported before workers fork so every worker shares them
+PRELOAD_MODULES = [
+    "docx",
+    "lxml.etree",
+    "pdfminer.high_level",
+    "utils.resume_parser",
+    "utils.resume_generator",
+]
+
+# Templates compiled before workers fork
+PRELOAD_TEMPLATES = ["form.html", "success.html"]
+
+SAMPLE_RESUME_DATA = {
+    "full_name": "Jane Doe",
+    "email": "jane.doe@example.com",
+    "phone": "+1 (555) 123-4567",
+    "location": "San Francisco, CA",
+    "linkedin": "https://www.linkedin.com/in/janedoe",
+    "summary": "Software engineer with 5 years of experience building web applications.",
+    "field_of_work": "Full-Stack Developer",
+    "experience_level": "Mid-Level",
+    "years_of_experience": "5",
+    "skills": "Python, JavaScript, React, SQL",
+    "experience": "Acme Corp, Software Engineer, Built APIs; Led migrations | Globex, Developer, Maintained services",
+    "education": "Bachelor of Science in Computer Science, University of California, 2018",
+    "projects": "Portfolio, Personal website built with React",
+    "website": "https://janedoe.dev",
+    "certifications": "AWS Certified Developer",
+    "languages": "English, Spanish",
+}
+
+SAMPLE_RESUME_TEXT = """
+Jane Doe
+Software Engineer
+jane.doe@example.com | +1 (555) 123-4567 | San Francisco, CA
+linkedin.com/in/janedoe | https://janedoe.dev
+
+SUMMARY
+Software engineer with 5 years of experience building web applications in Python and React.
+
+SKILLS
+Python, JavaScript, React, SQL, Docker, AWS
+
+WORK EXPERIENCE
+Acme Corp - Senior Software Engineer
+2020 to Present
+- Built REST APIs with Flask
+- Led a migration to Kubernetes
+
+EDUCATION
+Bachelor of Science in Computer Science
+University of California, Berkeley - 2018
+
+PROJECTS
+Portfolio: Personal website built with React
+
+CERTIFICATIONS
+AWS Certified Developer
+
+LANGUAGES
+Fluent in English and Spanish
+"""
+
+_ready = threading.Event()
+_lock = threading.Lock()
+
+# Duration of each warmup step in seconds, for the readiness endpoint
+warmup_timings = {}
+
+def is_ready():
+    """True once warmup has completed in this process (or its parent before fork)"""
+    return _ready.is_set()
+
+def _timed(name, func, *args):
+    start = time.perf_counter()
+    try:
+        with span(f"warmup.{name}"):
+            func(*args)
+    except Exception as e:
+        print(f"Warmup step '{name}' failed: {e}")
+    warmup_timings[name] = round(time.perf_counter() - start, 4)
+
+def preload_modules():
+    """Import the parser, generator and their heavy dependencies"""
+    for module in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f"Warmup could not preload {module}: {e}")
+
+def preload_templates(templates):
+    """Compile the Jinja templates into the environment's cache"""
+    for name in PRELOAD_TEMPLATES:
+        templates.get_template(name)
+
+def compile_patterns():
+    """Run every extractor once so the regular expressions are compiled and cached"""
+    from utils import resume_parser
+    text = SAMPLE_RESUME_TEXT
+    skills = resume_parser.extract_skills(text)
+    resume_parser.extract_field_of_work(text, skills)
+    for extractor in (
+        resume_parser.extract_name, resume_parser.extract_email, resume_parser.extract_phone,
+        resume_parser.extract_location, resume_parser.extract_summary, resume_parser.extract_experience,
+        resume_parser.extract_education, resume_parser.extract_projects, resume_parser.extract_certifications,
+        resume_parser.extract_languages, resume_parser.extract_linkedin, resume_parser.extract_website,
+        resume_parser.extract_blog, resume_parser.extract_youtube, resume_parser.extract_experience_info,
+    ):
+        extractor(text)
+
+def build_base_document():
+    """Render a full resume in memory to load the docx template and lxml code paths"""
+    from utils.resume_generator import build_resume_document, normalize_resume_data
+    doc = build_resume_document(normalize_resume_data(SAMPLE_RESUME_DATA))
+    doc.save(io.BytesIO())
+
+def parse_sample(sample_path):
+    """Parse the bundled sample resume end to end"""
+    from utils.resume_parser import parse_resume
+    if sample_path and os.path.exists(sample_path):
+        parse_resume(sample_path)
+
+def run_warmup(templates=None, sample_path=None, page_cache=None, pages=()):
+    """
+    Preload modules and templates and exercise the parse and generate paths
+    so the first real request does not pay cold-start costs. Safe to call
+    more than once; only the first call does any work.
+    """
+    with _lock:
+        if _ready.is_set():
+            return warmup_timings
+        start = time.perf_counter()
+        with span("warmup"):
+            _timed("preload_modules", preload_modules)
+            if templates is not None:
+                _timed("preload_templates", preload_templates, templates)
+            if page_cache is not None:
+                _timed("prerender_pages", page_cache.prerender, pages)
+            _timed("compile_patterns", compile_patterns)
+            _timed("build_base_document", build_base_document)
+            _timed("parse_sample", parse_sample, sample_path)
+        warmup_timings["total"] = round(time.perf_counter() - start, 4)
+        _ready.set()
+        print(f"Warmup complete in {warmup_timings['total']}s")
+    return warmup_timings